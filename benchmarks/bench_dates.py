@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Datumsnormalisierung: strptime-Kaskade (bisher) vs. Tokenizer mit Memo.
+
+Erzeugt Kontoauszug- und Fahrplan-Texte mit Hunderten datumsähnlicher
+Tokens und misst ``extract_date``-artige Läufe über alle Treffer.
+
+Aufruf: ``python benchmarks/bench_dates.py [--tokens 200 800] [--repeat 20]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+# Muster, das jeden Kandidaten liefert (wie ein weit gefasstes date_pattern)
+DATE_TOKEN = re.compile(r"(\d{1,2}\.\d{1,2}\.\d{2,4}|\d{4}-\d{2}-\d{2}|\d{8})")
+
+FORMATS = (
+    "%d.%m.%Y", "%d.%m.%y", "%Y-%m-%d", "%d-%m-%Y", "%d-%m-%y", "%Y/%m/%d",
+    "%d/%m/%Y", "%d/%m/%y", "%Y.%m.%d", "%Y%m%d", "%d%m%Y",
+)
+
+
+def legacy_normalize(candidate: str):
+    candidate = re.sub(r"\s+", "", candidate.strip().replace("\\", "."))
+    if not candidate:
+        return None
+    for fmt in FORMATS:
+        try:
+            dt = datetime.strptime(candidate, fmt)
+        except ValueError:
+            continue
+        if 1900 <= dt.year <= 2100:
+            return dt.strftime("%Y-%m-%d")
+    parts = re.sub(r"[./]", "-", candidate).split("-")
+    if len(parts) == 3:
+        a, b, c = parts
+        try:
+            dt = datetime(int(a), int(b), int(c)) if len(a) == 4 else datetime(int(c), int(b), int(a))
+        except ValueError:
+            return None
+        if 1900 <= dt.year <= 2100:
+            return dt.strftime("%Y-%m-%d")
+    return None
+
+
+def bank_statement(tokens: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(tokens // 2):
+        day, month = rng.randint(1, 28), rng.randint(1, 12)
+        lines.append(
+            f"{day:02d}.{month:02d}.2024 {day:02d}.{month:02d}.24 Lastschrift Ref {rng.randint(10**7, 10**8 - 1)}"
+            f" {rng.randint(1, 999)},{rng.randint(0, 99):02d}"
+        )
+    return "\n".join(lines)
+
+
+def itinerary(tokens: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(tokens // 2):
+        day, month = rng.randint(1, 28), rng.randint(1, 12)
+        lines.append(
+            f"ab 2024-{month:02d}-{day:02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d} ICE {rng.randint(100, 999)}"
+            f" Gültig bis {day:02d}{month:02d}2024"
+        )
+    return "\n".join(lines)
+
+
+def _run(normalize, text: str) -> int:
+    found = 0
+    for match in DATE_TOKEN.finditer(text):
+        if normalize(match.group(1)):
+            found += 1
+    return found
+
+
+def _per_text_ms(normalize, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        _run(normalize, text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tokens", type=int, nargs="+", default=[200, 800])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = random.Random(42)
+    fast = sorter._normalize_date_candidate
+    print(f"{'Text':<12} {'Tokens':>7} {'strptime ms':>12} {'neu ms':>8} {'neu+Memo ms':>12}")
+    for tokens in args.tokens:
+        for label, text in (("Kontoauszug", bank_statement(tokens, rng)), ("Fahrplan", itinerary(tokens, rng))):
+            assert _run(legacy_normalize, text) == _run(fast.__wrapped__, text)
+            legacy = _per_text_ms(legacy_normalize, text, args.repeat)
+            plain = _per_text_ms(fast.__wrapped__, text, args.repeat)
+            fast.cache_clear()
+            memo = _per_text_ms(fast, text, args.repeat)
+            print(f"{label:<12} {tokens:>7} {legacy:>12.2f} {plain:>8.2f} {memo:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
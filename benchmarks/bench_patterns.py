@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Regex-Overhead pro Dokument: Rohmuster, CompiledPatterns und Feld-Engine.
+
+Aufruf: ``python benchmarks/bench_patterns.py [patterns.yaml] [--docs N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+SAMPLE_TEXT = (
+    "Telekom Deutschland GmbH\nLandgrabenweg 151\n53227 Bonn\n\n"
+    "Rechnungsdatum: 03.02.2024\nRechnungsnummer: 4711-0815-23\n"
+    "Kundennummer: 123456789\n\n"
+    + "Verbindung 0228 1234567 01:23 Min 0,00 EUR\n" * 60
+    + "Nettobetrag 41,17 EUR\nMwSt 19% 7,82 EUR\nGesamtbetrag 48,99 EUR\n"
+)
+
+
+def _time_per_doc(fn, docs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(docs):
+        fn()
+    return (time.perf_counter() - start) / docs * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("patterns", nargs="?", default=str(ROOT / "patterns" / "patterns.yaml"))
+    ap.add_argument("--docs", type=int, default=2000)
+    args = ap.parse_args()
+
+    raw = sorter._read_yaml(args.patterns)
+
+    def before() -> None:
+        # bisheriger Weg: Mapping je Dokument mischen, Regexe je Aufruf kompilieren
+        pats = sorter.load_patterns(raw)
+        sorter.extract_invoice_no(SAMPLE_TEXT, pats.get("invoice_number_patterns", []) or [])
+        sorter.extract_date(SAMPLE_TEXT, pats.get("date_patterns", []) or [])
+
+    compiled = sorter.compile_patterns(raw)
+
+    def after() -> None:
+        pats = sorter.compile_patterns(compiled)
+        sorter.extract_invoice_no(SAMPLE_TEXT, pats.invoice_number)
+        sorter.extract_date(SAMPLE_TEXT, pats.date)
+
+    def all_fields_single() -> None:
+        # alle fünf Felder einzeln, je Musterliste ein eigener Scan
+        sorter.extract_invoice_no(SAMPLE_TEXT, compiled.invoice_number)
+        sorter.extract_date(SAMPLE_TEXT, compiled.date)
+        for regexes in (compiled.total_gross, compiled.total_net, compiled.tax_amount):
+            sorter.extract_invoice_no(SAMPLE_TEXT, regexes)
+
+    def all_fields_engine() -> None:
+        compiled.fields.extract(SAMPLE_TEXT)
+
+    before()
+    after()
+    t_before = _time_per_doc(before, args.docs)
+    t_after = _time_per_doc(after, args.docs)
+    t_single = _time_per_doc(all_fields_single, args.docs)
+    t_engine = _time_per_doc(all_fields_engine, args.docs)
+    print(f"Muster: {args.patterns} ({compiled!r})")
+    print(f"vorher : {t_before:8.1f} µs/Dokument")
+    print(f"nachher: {t_after:8.1f} µs/Dokument  ({t_before / max(t_after, 1e-9):.2f}x)")
+    print(f"5 Felder einzeln: {t_single:8.1f} µs/Dokument")
+    print(f"5 Felder Engine : {t_engine:8.1f} µs/Dokument  ({t_single / max(t_engine, 1e-9):.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Lieferantenerkennung: Schlüsselwort-Schleife (bisher) vs. SupplierMatcher.
+
+Aufruf: ``python benchmarks/bench_suppliers.py [--suppliers 19 200 2000 5000]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+WORDS = (
+    "rechnung gmbh kg ag service energie bau profi handel logistik technik "
+    "stadtwerke versand telekom medien holz metall garten auto elektro"
+).split()
+
+
+def _synthetic_hints(count: int, rng: random.Random):
+    hints = {}
+    for idx in range(count):
+        base = f"{rng.choice(WORDS)}{idx}"
+        hints[f"Lieferant {idx}"] = [base, f"{base} {rng.choice(WORDS)}", f"{base}.de"]
+    return hints
+
+
+def _synthetic_text(hints, rng: random.Random, size: int = 6000) -> str:
+    names = list(hints)
+    chosen = hints[rng.choice(names)]
+    filler = " ".join(rng.choice(WORDS) for _ in range(size // 8))
+    return f"{chosen[1].title()}\n{filler}\nKontakt: info@{chosen[2]}"
+
+
+def _per_call_ms(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--suppliers", type=int, nargs="+", default=[19, 200, 2000, 5000])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'Lieferanten':>11} {'bisher ms':>10} {'Matcher ms':>11} {'Aufbau ms':>10}  Automat")
+    for count in args.suppliers:
+        hints = _synthetic_hints(count, rng)
+        text = _synthetic_text(hints, rng)
+        start = time.perf_counter()
+        matcher = sorter.SupplierMatcher(hints)
+        build_ms = (time.perf_counter() - start) * 1000
+        assert matcher.detect(text) == sorter.detect_supplier(text, hints)
+        legacy = _per_call_ms(lambda t: sorter.detect_supplier(t, hints), text, args.repeat)
+        fast = _per_call_ms(matcher.detect, text, args.repeat)
+        print(f"{count:>11} {legacy:>10.3f} {fast:>11.3f} {build_ms:>10.1f}  {matcher._use_automaton}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Synthetische deutsche Rechnungs-PDFs für Benchmarks und Tests.
+
+Erzeugt PDFs ohne Fremdbibliotheken: Seiten mit Textebene (Helvetica,
+WinAnsi) oder reine Bildseiten (Graustufen-Scan mit eingebauter
+5×7-Pixelschrift, Flate-komprimiert), jeweils mit Lieferant,
+Rechnungsnummer, Datum, Positionen und Beträgen. Die erwarteten Felder
+landen in ``manifest.json`` neben den PDFs.
+
+Aufruf: ``python benchmarks/invoice_corpus.py OUT --count 20 --pages 1 3 --image-ratio 0.3``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import unicodedata
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PAGE_WIDTH = 595  # A4 in pt
+PAGE_HEIGHT = 842
+IMAGE_DPI = 150
+
+SUPPLIERS = (
+    ("Telekom", "Telekom Deutschland GmbH", "Landgrabenweg 151, 53227 Bonn"),
+    ("Vodafone", "Vodafone GmbH", "Ferdinand-Braun-Platz 1, 40549 Düsseldorf"),
+    ("CT-Bauprofi", "CT-Bauprofi GmbH", "Ochsenburger Str. 4, 74336 Brackenheim"),
+    ("Vattenfall", "Vattenfall Europe Sales GmbH", "Überseering 12, 22297 Hamburg"),
+    ("IKEA", "IKEA Deutschland GmbH & Co. KG", "Am Wandersmann 2-4, 65719 Hofheim"),
+    ("Deutsche Bahn", "DB Fernverkehr AG", "Stephensonstraße 1, 60326 Frankfurt"),
+)
+
+ITEMS = (
+    "Montagematerial", "Kabelkanal 2m", "Servicepauschale", "Grundgebühr",
+    "Arbeitsstunde Monteur", "Schrauben Sortiment", "Datenvolumen", "Lieferung",
+    "Stromverbrauch", "Fahrkarte 2. Klasse", "Regal weiß", "Anfahrt",
+)
+
+# 5×7-Pixelschrift (Zeilen von oben, Bit 4 = linke Spalte)
+_GLYPHS: Dict[str, Tuple[int, ...]] = {
+    "A": (0x0E, 0x11, 0x11, 0x1F, 0x11, 0x11, 0x11),
+    "B": (0x1E, 0x11, 0x11, 0x1E, 0x11, 0x11, 0x1E),
+    "C": (0x0E, 0x11, 0x10, 0x10, 0x10, 0x11, 0x0E),
+    "D": (0x1E, 0x11, 0x11, 0x11, 0x11, 0x11, 0x1E),
+    "E": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x1F),
+    "F": (0x1F, 0x10, 0x10, 0x1E, 0x10, 0x10, 0x10),
+    "G": (0x0E, 0x11, 0x10, 0x17, 0x11, 0x11, 0x0F),
+    "H": (0x11, 0x11, 0x11, 0x1F, 0x11, 0x11, 0x11),
+    "I": (0x0E, 0x04, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "J": (0x07, 0x02, 0x02, 0x02, 0x02, 0x12, 0x0C),
+    "K": (0x11, 0x12, 0x14, 0x18, 0x14, 0x12, 0x11),
+    "L": (0x10, 0x10, 0x10, 0x10, 0x10, 0x10, 0x1F),
+    "M": (0x11, 0x1B, 0x15, 0x15, 0x11, 0x11, 0x11),
+    "N": (0x11, 0x11, 0x19, 0x15, 0x13, 0x11, 0x11),
+    "O": (0x0E, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E),
+    "P": (0x1E, 0x11, 0x11, 0x1E, 0x10, 0x10, 0x10),
+    "Q": (0x0E, 0x11, 0x11, 0x11, 0x15, 0x12, 0x0D),
+    "R": (0x1E, 0x11, 0x11, 0x1E, 0x14, 0x12, 0x11),
+    "S": (0x0F, 0x10, 0x10, 0x0E, 0x01, 0x01, 0x1E),
+    "T": (0x1F, 0x04, 0x04, 0x04, 0x04, 0x04, 0x04),
+    "U": (0x11, 0x11, 0x11, 0x11, 0x11, 0x11, 0x0E),
+    "V": (0x11, 0x11, 0x11, 0x11, 0x11, 0x0A, 0x04),
+    "W": (0x11, 0x11, 0x11, 0x15, 0x15, 0x15, 0x0A),
+    "X": (0x11, 0x11, 0x0A, 0x04, 0x0A, 0x11, 0x11),
+    "Y": (0x11, 0x11, 0x11, 0x0A, 0x04, 0x04, 0x04),
+    "Z": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x10, 0x1F),
+    "0": (0x0E, 0x11, 0x13, 0x15, 0x19, 0x11, 0x0E),
+    "1": (0x04, 0x0C, 0x04, 0x04, 0x04, 0x04, 0x0E),
+    "2": (0x0E, 0x11, 0x01, 0x02, 0x04, 0x08, 0x1F),
+    "3": (0x1F, 0x02, 0x04, 0x02, 0x01, 0x11, 0x0E),
+    "4": (0x02, 0x06, 0x0A, 0x12, 0x1F, 0x02, 0x02),
+    "5": (0x1F, 0x10, 0x1E, 0x01, 0x01, 0x11, 0x0E),
+    "6": (0x06, 0x08, 0x10, 0x1E, 0x11, 0x11, 0x0E),
+    "7": (0x1F, 0x01, 0x02, 0x04, 0x08, 0x08, 0x08),
+    "8": (0x0E, 0x11, 0x11, 0x0E, 0x11, 0x11, 0x0E),
+    "9": (0x0E, 0x11, 0x11, 0x0F, 0x01, 0x02, 0x0C),
+    ".": (0x00, 0x00, 0x00, 0x00, 0x00, 0x0C, 0x0C),
+    ",": (0x00, 0x00, 0x00, 0x00, 0x0C, 0x04, 0x08),
+    ":": (0x00, 0x0C, 0x0C, 0x00, 0x0C, 0x0C, 0x00),
+    "-": (0x00, 0x00, 0x00, 0x1F, 0x00, 0x00, 0x00),
+    "/": (0x00, 0x01, 0x02, 0x04, 0x08, 0x10, 0x00),
+    "%": (0x18, 0x19, 0x02, 0x04, 0x08, 0x13, 0x03),
+    "&": (0x0C, 0x12, 0x14, 0x08, 0x15, 0x12, 0x0D),
+}
+_UMLAUTS = str.maketrans({"Ä": "AE", "Ö": "OE", "Ü": "UE", "ä": "AE", "ö": "OE", "ü": "UE", "ß": "SS", "€": "EUR"})
+
+
+@dataclass
+class InvoiceSpec:
+    """Erwartete Felder einer erzeugten Rechnung (für Manifest und Prüfungen)."""
+
+    filename: str
+    supplier: str
+    invoice_no: str
+    invoice_date: str
+    total_net: str
+    tax_amount: str
+    total_gross: str
+    pages: int
+    image_only: bool
+
+
+def _money(value: float) -> str:
+    text = f"{value:,.2f}"
+    return text.replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def invoice_lines(rng: random.Random, pages: int) -> Tuple[Dict[str, str], List[List[str]]]:
+    """Liefert Felder und den Text je Seite für eine zufällige Rechnung."""
+
+    key, name, address = rng.choice(SUPPLIERS)
+    year, month, day = rng.randint(2019, 2025), rng.randint(1, 12), rng.randint(1, 28)
+    invoice_no = f"RE-{year}-{rng.randint(10000, 99999)}"
+    positions: List[Tuple[str, float]] = []
+    page_texts: List[List[str]] = []
+    for page in range(pages):
+        lines = [name, address, ""]
+        if page == 0:
+            lines += [
+                "Rechnung",
+                f"Rechnungsnummer: {invoice_no}",
+                f"Rechnungsdatum: {day:02d}.{month:02d}.{year}",
+                f"Kundennummer: {rng.randint(100000, 999999)}",
+                "",
+            ]
+        lines.append(f"Pos.  Bezeichnung                      Betrag   (Seite {page + 1}/{pages})")
+        for idx in range(rng.randint(6, 14)):
+            item, price = rng.choice(ITEMS), rng.randint(100, 50000) / 100
+            positions.append((item, price))
+            lines.append(f"{len(positions):>3}   {item:<32} {_money(price):>10} EUR")
+        page_texts.append(lines)
+    net = round(sum(price for _item, price in positions), 2)
+    tax = round(net * 0.19, 2)
+    gross = round(net + tax, 2)
+    page_texts[-1] += [
+        "",
+        f"Netto: {_money(net)} EUR",
+        f"MwSt 19%: {_money(tax)} EUR",
+        f"Gesamtbetrag: {_money(gross)} EUR",
+        "",
+        "Zahlbar innerhalb von 14 Tagen ohne Abzug.",
+        f"IBAN DE{rng.randint(10, 99)} {rng.randint(1000, 9999)} {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}",
+    ]
+    fields = {
+        "supplier": key,
+        "invoice_no": invoice_no,
+        "invoice_date": f"{year:04d}-{month:02d}-{day:02d}",
+        "total_net": f"{net:.2f}",
+        "tax_amount": f"{tax:.2f}",
+        "total_gross": f"{gross:.2f}",
+    }
+    return fields, page_texts
+
+
+def _pdf_string(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _text_content(lines: Sequence[str]) -> bytes:
+    out = [b"BT /F1 10 Tf 14 TL 56 790 Td"]
+    for line in lines:
+        out.append(_pdf_string(line) + b" '")
+    out.append(b"ET")
+    return b"\n".join(out)
+
+
+def render_bitmap(lines: Sequence[str], dpi: int = IMAGE_DPI) -> Tuple[int, int, bytes]:
+    """Rendert ``lines`` als Graustufenbild (schwarz auf weiß) in Seitengröße."""
+
+    width, height = PAGE_WIDTH * dpi // 72, PAGE_HEIGHT * dpi // 72
+    scale = max(1, round(10 * dpi / 72 / 7))  # ~10 pt Zeichenhöhe
+    pixels = bytearray(b"\xff" * (width * height))
+    ink = b"\x00" * scale
+    x0 = y = 56 * dpi // 72
+    advance, line_height = 6 * scale, 10 * scale
+    for line in lines:
+        text = unicodedata.normalize("NFC", line).translate(_UMLAUTS).upper()
+        for col, char in enumerate(text):
+            glyph = _GLYPHS.get(char)
+            x = x0 + col * advance
+            if glyph is None or x + 5 * scale > width:
+                continue
+            for row, bits in enumerate(glyph):
+                for bit in range(5):
+                    if bits & (0x10 >> bit):
+                        px = x + bit * scale
+                        for dy in range(scale):
+                            start = (y + row * scale + dy) * width + px
+                            pixels[start : start + scale] = ink
+        y += line_height
+        if y + line_height > height:
+            break
+    return width, height, bytes(pixels)
+
+
+def write_pdf(path: Path, page_texts: Sequence[Sequence[str]], *, image_only: bool = False) -> None:
+    """Schreibt eine PDF mit Textebene oder (``image_only``) gescannten Bildseiten."""
+
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def stream(header: bytes, data: bytes) -> bytes:
+        return header[:-2] + b" /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = len(objects) + 1 + len(page_texts) * 3  # Seitenbaum kommt zuletzt
+    kids: List[int] = []
+    for lines in page_texts:
+        if image_only:
+            width, height, pixels = render_bitmap(lines)
+            image = add(stream(
+                b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray"
+                b" /BitsPerComponent 8 /Filter /FlateDecode >>" % (width, height),
+                zlib.compress(pixels, 6),
+            ))
+            content = add(stream(b"<< >>", b"q %d 0 0 %d 0 0 cm /Im1 Do Q" % (PAGE_WIDTH, PAGE_HEIGHT)))
+            resources = b"<< /XObject << /Im1 %d 0 R >> >>" % image
+        else:
+            add(b"null")  # Platzhalter, damit jede Seite drei Objekte belegt
+            content = add(stream(b"<< >>", _text_content(lines)))
+            resources = b"<< /Font << /F1 %d 0 R >> >>" % font
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+            % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, resources, content)
+        ))
+    assert add(
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+    ) == pages_id
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(out))
+
+
+def generate(
+    out_dir: Path,
+    count: int,
+    *,
+    pages: Tuple[int, int] = (1, 3),
+    image_ratio: float = 0.3,
+    seed: int = 42,
+) -> List[InvoiceSpec]:
+    """Erzeugt ``count`` Rechnungen in ``out_dir`` und schreibt ``manifest.json``."""
+
+    rng = random.Random(seed)
+    specs: List[InvoiceSpec] = []
+    for idx in range(count):
+        page_count = rng.randint(pages[0], pages[1])
+        image_only = rng.random() < image_ratio
+        fields, page_texts = invoice_lines(rng, page_count)
+        filename = f"rechnung_{idx:04d}{'_scan' if image_only else ''}.pdf"
+        write_pdf(out_dir / filename, page_texts, image_only=image_only)
+        specs.append(InvoiceSpec(filename=filename, pages=page_count, image_only=image_only, **fields))
+    (out_dir / "manifest.json").write_text(
+        json.dumps([asdict(spec) for spec in specs], ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return specs
+
+
+def load_manifest(out_dir: Path) -> List[InvoiceSpec]:
+    data = json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))
+    return [InvoiceSpec(**item) for item in data]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("out", type=Path, help="Zielordner")
+    ap.add_argument("--count", type=int, default=20)
+    ap.add_argument("--pages", type=int, nargs=2, default=[1, 3], metavar=("MIN", "MAX"))
+    ap.add_argument("--image-ratio", type=float, default=0.3, help="Anteil reiner Bild-PDFs (0..1)")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args(argv)
+    specs = generate(args.out, args.count, pages=tuple(args.pages), image_ratio=args.image_ratio, seed=args.seed)
+    scans = sum(spec.image_only for spec in specs)
+    print(f"{len(specs)} Rechnung(en) in {args.out} ({scans} Bild-PDFs)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
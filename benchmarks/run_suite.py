@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Benchmark-Suite je Verarbeitungsstufe auf einem synthetischen Rechnungskorpus.
+
+Misst ``_extract_with_pymupdf``, ``_extract_with_pypdf2`` (Text-PDFs),
+``_extract_with_ocr`` (Bild-PDFs; ``ocr`` per pytesseract, ``ocr_tesserocr``
+mit der im Prozess geladenen Engine), Feldextraktion und Lieferantenerkennung
+sowie den Durchsatz von ``process_all`` und schreibt das Ergebnis als JSON
+(Standard: ``benchmarks/results/<commit>.json``). Stufen, deren Bibliothek
+fehlt, werden als ``skipped`` vermerkt. Mit ``--compare ALT.json`` werden die
+Mediane gegen einen früheren Lauf gestellt.
+
+Aufruf: ``python benchmarks/run_suite.py [--count 20] [--repeat 3] [--stages fields supplier]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import ocr_engine
+import sorter
+from invoice_corpus import generate, invoice_lines
+
+STAGES = ("pymupdf", "pypdf2", "ocr", "ocr_tesserocr", "fields", "supplier", "process_all")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _stats(samples: Sequence[float], unit: str = "ms") -> Dict[str, object]:
+    ordered = sorted(samples)
+    return {
+        "unit": unit,
+        "n": len(ordered),
+        "min": round(ordered[0], 4),
+        "median": round(statistics.median(ordered), 4),
+        "mean": round(statistics.fmean(ordered), 4),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+    }
+
+
+def _time_each(fn: Callable[[object], object], items: Sequence[object], repeat: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _extractor_stage(name: str, extract: Callable[[Path], object], pdfs: Sequence[Path], repeat: int):
+    if not pdfs:
+        return {"skipped": "keine passenden PDFs im Korpus"}
+    probe = extract(pdfs[0])
+    if getattr(probe, "method", "") == "unavailable":
+        return {"skipped": f"{name}: Bibliothek nicht installiert"}
+    return _stats(_time_each(extract, pdfs, repeat))
+
+
+def run(
+    corpus: Path,
+    *,
+    stages: Sequence[str],
+    repeat: int,
+    cfg: Dict[str, object],
+    patterns_path: Path,
+) -> Dict[str, object]:
+    manifest = json.loads((corpus / "manifest.json").read_text(encoding="utf-8"))
+    text_pdfs = [corpus / item["filename"] for item in manifest if not item["image_only"]]
+    image_pdfs = [corpus / item["filename"] for item in manifest if item["image_only"]]
+    pats = sorter.compile_patterns(patterns_path)
+    results: Dict[str, object] = {}
+
+    if "pymupdf" in stages:
+        results["pymupdf"] = _extractor_stage("PyMuPDF", sorter._extract_with_pymupdf, text_pdfs, repeat)
+    if "pypdf2" in stages:
+        results["pypdf2"] = _extractor_stage("PyPDF2", sorter._extract_with_pypdf2, text_pdfs, repeat)
+    for stage, backend in (("ocr", "pytesseract"), ("ocr_tesserocr", "tesserocr")):
+        if stage not in stages:
+            continue
+        if backend == "tesserocr" and not ocr_engine.tesserocr_available():
+            results[stage] = {"skipped": "tesserocr: Bibliothek nicht installiert"}
+            continue
+        ocr_engine.use(dict(cfg, ocr_backend=backend))
+        results[stage] = _extractor_stage(
+            f"OCR ({backend})",
+            lambda pdf: sorter._extract_with_ocr(
+                pdf,
+                str(cfg.get("poppler_path") or "") or None,
+                str(cfg.get("tesseract_cmd") or "") or None,
+                str(cfg.get("tesseract_lang") or "deu+eng"),
+            ),
+            image_pdfs,
+            repeat,
+        )
+    ocr_engine.use(cfg)
+
+    # Feldstufen auf Rechnungstext wie im Korpus – unabhängig von PDF-Bibliotheken
+    rng = random.Random(7)
+    texts = []
+    for page_count in (1, 2, 3) * 20:
+        _fields, page_texts = invoice_lines(rng, page_count)
+        texts.append("\n\n".join("\n".join(lines) for lines in page_texts))
+    if "fields" in stages:
+        results["fields"] = _stats(_time_each(pats.fields.extract, texts, repeat * 10), "ms")
+    if "supplier" in stages:
+        results["supplier"] = _stats(
+            _time_each(lambda text: sorter.detect_supplier(text, pats.supplier_matcher), texts, repeat * 10)
+        )
+
+    if "process_all" in stages:
+        runs: List[float] = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+                inbox = Path(tmp) / "inbox"
+                inbox.mkdir()
+                for item in manifest:
+                    shutil.copy2(corpus / item["filename"], inbox / item["filename"])
+                run_cfg = dict(cfg, input_dir=str(inbox), output_dir=str(Path(tmp) / "out"), dry_run=False)
+                start = time.perf_counter()
+                sorter.process_all(config=run_cfg, patterns=pats)
+                runs.append(time.perf_counter() - start)
+        docs = len(manifest)
+        results["process_all"] = {
+            "unit": "docs/s",
+            "n": docs,
+            "jobs": cfg.get("jobs", 1),
+            "use_ocr": bool(cfg.get("use_ocr", True)),
+            "best": round(docs / min(runs), 2),
+            "median": round(docs / statistics.median(runs), 2),
+        }
+    return results
+
+
+def compare(current: Dict[str, object], previous: Dict[str, object]) -> List[str]:
+    """Stellt die Mediane zweier Läufe gegenüber (eine Zeile je Stufe)."""
+
+    lines = [f"{'Stufe':<12} {'vorher':>10} {'jetzt':>10} {'Änderung':>9}  Einheit"]
+    old_stages = previous.get("stages", {})
+    for name, new in current.get("stages", {}).items():  # type: ignore[union-attr]
+        old = old_stages.get(name, {})  # type: ignore[union-attr]
+        if "median" not in new or "median" not in old:
+            continue
+        delta = (new["median"] - old["median"]) / old["median"] * 100 if old["median"] else 0.0
+        lines.append(f"{name:<12} {old['median']:>10.3f} {new['median']:>10.3f} {delta:>+8.1f}%  {new['unit']}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--count", type=int, default=20, help="Rechnungen im Korpus")
+    ap.add_argument("--pages", type=int, nargs=2, default=[1, 3], metavar=("MIN", "MAX"))
+    ap.add_argument("--image-ratio", type=float, default=0.3)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--corpus", type=Path, help="vorhandenen Korpus nutzen statt neu zu erzeugen")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    ap.add_argument("--config", type=Path, help="config.yaml für OCR-Pfade/Sprache")
+    ap.add_argument("--patterns", type=Path, default=ROOT / "patterns" / "patterns.yaml")
+    ap.add_argument("--jobs", type=int, default=1, help="jobs für process_all")
+    ap.add_argument("--no-ocr", action="store_true", help="process_all ohne OCR")
+    ap.add_argument("--out", type=Path, help="JSON-Ziel (Standard benchmarks/results/<commit>.json)")
+    ap.add_argument("--compare", type=Path, help="früheres JSON zum Vergleich")
+    args = ap.parse_args(argv)
+
+    cfg = sorter.load_config(args.config)
+    cfg["jobs"] = args.jobs
+    cfg["use_ocr"] = bool(cfg.get("use_ocr", True)) and not args.no_ocr
+    cfg["text_cache_path"] = ""  # Cache-Treffer würden die Extraktion überspringen
+    cfg["result_db_path"] = ""
+    cfg["csv_log_path"] = ""
+
+    commit = _git_commit()
+    with tempfile.TemporaryDirectory(prefix="bench_corpus_") as tmp:
+        corpus = args.corpus or Path(tmp)
+        if args.corpus is None:
+            generate(corpus, args.count, pages=tuple(args.pages), image_ratio=args.image_ratio, seed=args.seed)
+        stages = run(corpus, stages=args.stages, repeat=args.repeat, cfg=cfg, patterns_path=args.patterns)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "count": args.count,
+            "pages": args.pages,
+            "image_ratio": args.image_ratio,
+            "repeat": args.repeat,
+        },
+        "stages": stages,
+    }
+    out = args.out or ROOT / "benchmarks" / "results" / f"{commit or 'lokal'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    for name, data in stages.items():
+        if "skipped" in data:
+            print(f"{name:<12} übersprungen ({data['skipped']})")
+        else:
+            print(f"{name:<12} Median {data['median']:>10.3f} {data['unit']}")
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        print("\n".join(compare(report, previous)))
+    print(f"Ergebnis: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
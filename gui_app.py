@@ -1,17 +1,34 @@
 # -------- Abhängigkeits-Check (freundliche Meldung) --------
+# Nur nachsehen, ob die Pakete installiert sind (find_spec/Metadaten) – die
+# schweren Bibliotheken lädt sorter.py erst bei der ersten Verwendung.
+# Beschleuniger ohne Pflicht: fehlen sie, läuft alles über den Standardweg
+# (nur im Systemcheck angezeigt, nie Grund zum Abbruch)
+ACCELERATOR_MODULES = [("tesserocr", "tesserocr")]
+OPTIONAL_MODULES = [("fitz", "pymupdf"), ("PyPDF2", "PyPDF2"), ("pytesseract", "pytesseract"), ("pdf2image", "pdf2image"), ("PIL", "pillow")]
+
+
+def _module_available(mod):
+    from importlib.util import find_spec
+    try:
+        return find_spec(mod) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _dist_version(pipname):
+    from importlib import metadata
+    try:
+        return metadata.version(pipname)
+    except metadata.PackageNotFoundError:
+        return None
+
+
 def _ensure_dependencies_or_die():
     missing = []
-    try:
-        import yaml  # PyYAML
-    except Exception:
+    if not _module_available("yaml"):  # PyYAML
         missing.append("pyyaml")
     # Die folgenden sind optional für OCR/Preview; wir prüfen sie und geben Tipps aus
-    opt_missing = []
-    for mod, pipname in [("fitz", "pymupdf"), ("PyPDF2", "PyPDF2"), ("pytesseract", "pytesseract"), ("pdf2image", "pdf2image"), ("PIL", "pillow")]:
-        try:
-            __import__(mod)
-        except Exception:
-            opt_missing.append(pipname)
+    opt_missing = [pipname for mod, pipname in OPTIONAL_MODULES if not _module_available(mod)]
     if missing or opt_missing:
         msg = ["Es fehlen Python-Pakete:", ""]
         if missing:
@@ -41,7 +58,6 @@ _ensure_dependencies_or_die()
 import os
 import sys
 import io
-import csv
 import re
 import shutil
 import threading
@@ -54,6 +70,7 @@ from types import SimpleNamespace
 from tkinter import filedialog, messagebox, ttk
 import yaml
 
+from log_sink import CsvLogSink
 from roles_utils import normalize_roles
 # Importiere die vorhandene Logik aus sorter.py (erweiterte Version mit Callbacks)
 try:
@@ -86,6 +103,30 @@ def _normalize_analysis(data) -> dict:
         return {"result": data}
 
 
+def _text_cache_for(cfg_like):
+    """Text-Cache aus sorter (falls konfiguriert) – Fehler deaktivieren ihn nur."""
+    if not (sorter and hasattr(sorter, "get_text_cache")):
+        return None
+    try:
+        return sorter.get_text_cache(cfg_like or {})
+    except Exception as exc:  # pragma: no cover - GUI fallback logging
+        print(f"[Cache] Text-Cache nicht verfügbar: {exc}", file=sys.stderr)
+        return None
+
+
+def _extraction_kwargs(cfg_like):
+    """Extraktions-Einstellungen wie im Sorter (auch ocr_pages/ocr_dpi) – gleicher Cache-Eintrag."""
+    cfg_like = cfg_like or {}
+    if sorter and hasattr(sorter, "extraction_options"):
+        return sorter.extraction_options(cfg_like)
+    return {
+        "use_ocr": bool(cfg_like.get("use_ocr", True)),
+        "poppler_path": cfg_like.get("poppler_path") or None,
+        "tesseract_cmd": cfg_like.get("tesseract_cmd") or None,
+        "tesseract_lang": cfg_like.get("tesseract_lang") or "deu+eng",
+    }
+
+
 def _fallback_process_all(cfg_like, patterns_path, stop_fn=None, progress_fn=None, log_csv_path=None):
     cfg_like = cfg_like or {}
     input_dir = Path(cfg_like.get("input_dir") or "inbox")
@@ -114,29 +155,27 @@ def _fallback_process_all(cfg_like, patterns_path, stop_fn=None, progress_fn=Non
         return patterns_dict
 
     patterns_dict = _load_patterns_once(patterns_path)
-    invoice_patterns = list(patterns_dict.get("invoice_number_patterns") or [])
-    date_patterns = list(patterns_dict.get("date_patterns") or [])
+    if sorter and hasattr(sorter, "compile_patterns"):
+        try:
+            patterns_dict = sorter.compile_patterns(patterns_dict)
+        except Exception as exc:  # pragma: no cover - GUI fallback logging
+            print(f"[Fallback] Muster konnten nicht kompiliert werden: {exc}", file=sys.stderr)
+    invoice_patterns = list(getattr(patterns_dict, "invoice_number", None) or patterns_dict.get("invoice_number_patterns") or [])
+    date_patterns = list(getattr(patterns_dict, "date", None) or patterns_dict.get("date_patterns") or [])
     supplier_hints = patterns_dict.get("supplier_hints") or {}
 
-    use_ocr = bool(cfg_like.get("use_ocr", True))
-    poppler_path = cfg_like.get("poppler_path") or ""
-    tesseract_cmd = cfg_like.get("tesseract_cmd") or ""
-    tesseract_lang = cfg_like.get("tesseract_lang") or "deu+eng"
+    text_cache = _text_cache_for(cfg_like)
 
     input_dir.mkdir(parents=True, exist_ok=True)
     output_dir.mkdir(parents=True, exist_ok=True)
     (output_dir / unknown_dir_name).mkdir(parents=True, exist_ok=True)
 
-    csv_file = None
-    csv_writer = None
+    csv_sink = None
     if log_csv_path:
-        csv_path = Path(log_csv_path)
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-        existing = csv_path.exists() and csv_path.stat().st_size > 0
-        csv_file = csv_path.open("a", encoding="utf-8", newline="")
-        csv_writer = csv.writer(csv_file, delimiter=";")
-        if not existing:
-            csv_writer.writerow([
+        if sorter and hasattr(sorter, "open_csv_log"):
+            csv_sink = sorter.open_csv_log(log_csv_path, cfg_like)
+        else:
+            csv_sink = CsvLogSink(log_csv_path, [
                 "timestamp",
                 "source",
                 "destination",
@@ -144,8 +183,10 @@ def _fallback_process_all(cfg_like, patterns_path, stop_fn=None, progress_fn=Non
                 "supplier",
                 "invoice_date",
                 "status",
+                "total_gross",
+                "total_net",
+                "tax_amount",
             ])
-            csv_file.flush()
 
     files = sorted(
         p for p in input_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pdf"
@@ -160,11 +201,7 @@ def _fallback_process_all(cfg_like, patterns_path, stop_fn=None, progress_fn=Non
         if sorter and hasattr(sorter, "extract_text_from_pdf"):
             try:
                 text, method = sorter.extract_text_from_pdf(
-                    str(pdf_path),
-                    use_ocr=use_ocr,
-                    poppler_path=poppler_path or None,
-                    tesseract_cmd=tesseract_cmd or None,
-                    tesseract_lang=tesseract_lang or "deu+eng",
+                    str(pdf_path), cache=text_cache, **_extraction_kwargs(cfg_like)
                 )
             except Exception as exc:  # pragma: no cover - GUI fallback logging
                 method = "error"
@@ -300,8 +337,8 @@ def _fallback_process_all(cfg_like, patterns_path, stop_fn=None, progress_fn=Non
                 except Exception as exc:
                     print(f"[Fallback] progress_fn-Fehler: {exc}", file=sys.stderr)
 
-            if csv_writer:
-                csv_writer.writerow(
+            if csv_sink:
+                csv_sink.write(
                     [
                         datetime.now().isoformat(timespec="seconds"),
                         str(pdf),
@@ -310,12 +347,14 @@ def _fallback_process_all(cfg_like, patterns_path, stop_fn=None, progress_fn=Non
                         supplier_value,
                         analysis_dict.get("invoice_date"),
                         status,
+                        analysis_dict.get("total_gross"),
+                        analysis_dict.get("total_net"),
+                        analysis_dict.get("tax_amount"),
                     ]
                 )
-                csv_file.flush()
     finally:
-        if csv_file:
-            csv_file.close()
+        if csv_sink:
+            csv_sink.close()
 class TextQueueWriter(io.TextIOBase):
     """Leitet stdout/stderr-Text in eine Queue, damit das GUI Logs anzeigen kann."""
     def __init__(self, q: queue.Queue, tag: str = "INFO"):
@@ -886,7 +925,10 @@ class App(tk.Tk):
             self.var_filename_pattern.set(fmt)
         self._update_filename_example()
     def _vars_to_cfg(self):
-        cfg = {
+        # Schlüssel ohne GUI-Feld (z. B. jobs, text_cache_path) beim Speichern erhalten
+        cfg = dict(self.cfg) if isinstance(self.cfg, dict) else {}
+        cfg.pop("csv_log_path", None)
+        cfg.update({
             "input_dir": self.var_input.get(),
             "output_dir": self.var_output.get(),
             "unknown_dir_name": self.var_unknown.get() or "unbekannt",
@@ -900,7 +942,7 @@ class App(tk.Tk):
                 "model": self.var_ollama_model.get(),
             },
             "dry_run": bool(self.var_dry.get()),
-        }
+        })
         fmt = self._resolve_filename_format()
         if fmt:
             cfg["output_filename_format"] = fmt
@@ -909,6 +951,8 @@ class App(tk.Tk):
         roles = self._get_roles_from_widget()
         if roles:
             cfg["roles"] = roles
+        else:
+            cfg.pop("roles", None)
         return cfg
 
     def _set_roles_text(self, roles):
@@ -1082,11 +1126,7 @@ class App(tk.Tk):
             cfg_like = self._vars_to_cfg()
             # benutze die Extraktionsfunktion aus sorter (liefert (text, method))
             text, _method = sorter.extract_text_from_pdf(
-                path,
-                use_ocr=cfg_like.get("use_ocr", True),
-                poppler_path=cfg_like.get("poppler_path"),
-                tesseract_cmd=cfg_like.get("tesseract_cmd"),
-                tesseract_lang=cfg_like.get("tesseract_lang", "deu+eng"),
+                path, cache=_text_cache_for(cfg_like), **_extraction_kwargs(cfg_like)
             )
         except Exception as e:
             text = f"[Fehler bei Vorschau] {e}"
@@ -1111,12 +1151,20 @@ class App(tk.Tk):
         try:
             with open(self.var_patterns_path.get(), "r", encoding="utf-8") as fh:
                 pats = yaml.safe_load(fh) or {}
+            if sorter is not None and hasattr(sorter, "CompiledPatterns"):
+                pats = sorter.CompiledPatterns(pats)
             self.loaded_patterns = pats
             invn = len(pats.get("invoice_number_patterns", []))
             datn = len(pats.get("date_patterns", []))
             supp = len(pats.get("supplier_hints", {}) or {})
-            self.rx_info.set(f"Geladen – Rechnungsnr: {invn}, Datumsregex: {datn}, Lieferanten: {supp}")
+            errors = list(getattr(pats, "errors", []) or [])
+            info = f"Geladen – Rechnungsnr: {invn}, Datumsregex: {datn}, Lieferanten: {supp}"
+            if errors:
+                info += f", ungültig: {len(errors)}"
+            self.rx_info.set(info)
             self._log("INFO", "Regex-Patterns für Tester geladen.\\n")
+            for error in errors:
+                self._log("WARN", f"Ungültiges Muster: {error}\n")
         except Exception as e:
             messagebox.showerror("Fehler", f"Konnte patterns.yaml nicht laden: {e}")
     def _run_regex_test(self):
@@ -1133,9 +1181,13 @@ class App(tk.Tk):
                 return
         try:
             pats = self.loaded_patterns
-            inv = sorter.extract_invoice_no(sample, pats.get("invoice_number_patterns", []))
-            dt_iso = sorter.extract_date(sample, pats.get("date_patterns", []))  # ISO-String oder None
-            sup = sorter.detect_supplier(sample, pats.get("supplier_hints", {}))
+            inv_rx = getattr(pats, "invoice_number", None) or pats.get("invoice_number_patterns", [])
+            date_rx = getattr(pats, "date", None) or pats.get("date_patterns", [])
+            inv = sorter.extract_invoice_no(sample, inv_rx)
+            dt_iso = sorter.extract_date(sample, date_rx)  # ISO-String oder None
+            sup = sorter.detect_supplier(
+                sample, getattr(pats, "supplier_matcher", None) or pats.get("supplier_hints", {})
+            )
             res = []
             res.append(f"Rechnungsnummer: {inv}")
             res.append(f"Datum: {dt_iso if dt_iso else None}")
@@ -1154,34 +1206,31 @@ class App(tk.Tk):
         def add(k, v):
             lines.append(f"{k}: {v}")
         def try_import(mod, pipname=None):
-            try:
-                m = __import__(mod)
-                ver = getattr(m, "__version__", None)
-                return True, ver
-            except Exception as e:
-                return False, str(e)
+            # ohne das Modul auszuführen: Fundort + Version aus den Paket-Metadaten
+            if not _module_available(mod):
+                return False, "nicht installiert"
+            return True, _dist_version(pipname or mod)
         add("Python", sys.version.split()[0])
         add("Interpreter", sys.executable)
         # Module prüfen
-        mods = [
-            ("yaml", "pyyaml"),
-            ("fitz", "pymupdf"),
-            ("PyPDF2", "PyPDF2"),
-            ("pdf2image", "pdf2image"),
-            ("pytesseract", "pytesseract"),
-            ("PIL", "pillow"),
-        ]
+        mods = [("yaml", "pyyaml"), *OPTIONAL_MODULES]
         missing = []
         lines.append("")
         lines.append("Python-Module:")
         for mod, pipname in mods:
             ok, info = try_import(mod, pipname)
             if ok:
-                ver = info or "(ohne __version__)"
+                ver = info or "(Version unbekannt)"
                 lines.append(f"  - {pipname or mod:12s}  OK  {ver}")
             else:
                 lines.append(f"  - {pipname or mod:12s}  FEHLT  ({info})")
                 missing.append(pipname or mod)
+        for mod, pipname in ACCELERATOR_MODULES:
+            ok, info = try_import(mod, pipname)
+            if ok:
+                lines.append(f"  - {pipname:12s}  OK  {info or '(Version unbekannt)'}")
+            else:
+                lines.append(f"  - {pipname:12s}  --  (optional, OCR über pytesseract)")
         # Tesseract
         lines.append("")
         lines.append("Tesseract:")
@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 import argparse
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
 import shutil
+import signal
+import struct
 import sys
+import threading
 import time
+from concurrent.futures import BrokenExecutor, Future
 from pathlib import Path
-from typing import Iterable, Optional, Union
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 try:
     import sorter
@@ -15,15 +24,221 @@ except Exception as e:
     print(f"[Hotfolder] sorter.py konnte nicht importiert werden: {e}", file=sys.stderr)
     sorter = None
 
+import timings
+from journal import ANALYZED, Journal
 
-def is_locked(path: Path) -> bool:
+if TYPE_CHECKING:  # Prozess-Pool, HTTP-Server und Profiler erst bei Bedarf laden
+    from concurrent.futures import ProcessPoolExecutor
+
+    from metrics import Metrics
+
+
+def _is_pdf(path: Path) -> bool:
+    return path.suffix.lower() == ".pdf"
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
     try:
-        s1 = path.stat().st_size
-        time.sleep(0.15)
-        s2 = path.stat().st_size
-        return s1 != s2
-    except Exception:
-        return True
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class Debouncer:
+    """Gibt Dateien frei, deren Größe/mtime sich ``delay`` Sekunden nicht geändert hat.
+
+    Statt je Datei 0,15 s zu schlafen, bekommt jede Datei eine Frist; geprüft
+    wird erst, wenn sie abgelaufen ist.
+    Neue Ereignisse zu einer Datei setzen die Frist neu.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._pending: Dict[Path, Tuple[float, float, Optional[Tuple[int, int]]]] = {}
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, path: Path, delay: float) -> None:
+        self._pending[path] = (self._clock() + delay, delay, _signature(path))
+
+    def discard(self, path: Path) -> None:
+        self._pending.pop(path, None)
+
+    def next_timeout(self) -> Optional[float]:
+        if not self._pending:
+            return None
+        due = min(entry[0] for entry in self._pending.values())
+        return max(0.0, due - self._clock())
+
+    def pop_ready(self) -> List[Path]:
+        now = self._clock()
+        ready: List[Path] = []
+        for path, (due, delay, sig) in list(self._pending.items()):
+            if due > now:
+                continue
+            current = _signature(path)
+            if current is None:
+                del self._pending[path]  # verschwunden (umbenannt/gelöscht)
+            elif current != sig:
+                self._pending[path] = (now + delay, delay, current)
+            else:
+                del self._pending[path]
+                ready.append(path)
+        return sorted(ready)
+
+
+# inotify(7): Ereignismasken und Flags aus <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Minimaler inotify-Zugriff per ctypes (nur Linux, keine Zusatzpakete)."""
+
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+
+    def __init__(self, directory: Path) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify ist nur unter Linux verfügbar")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), self.mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, f"inotify_add_watch({directory}): {os.strerror(err)}")
+        self.directory = directory
+
+    def read(self, timeout: Optional[float]) -> List[Tuple[str, int]]:
+        """Wartet bis ``timeout`` (None = unbegrenzt) und liefert ``(name, maske)``."""
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events: List[Tuple[str, int]] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].split(b"\0", 1)[0]
+            offset += length
+            events.append((os.fsdecode(name), mask))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+def _scan(inbox: Path, debouncer: Debouncer, delay: float) -> None:
+    try:
+        entries = list(inbox.iterdir())
+    except OSError as exc:
+        print(f"[Hotfolder] Inbox nicht lesbar: {exc}", file=sys.stderr)
+        return
+    for path in entries:
+        if _is_pdf(path) and path not in debouncer and path.is_file():
+            debouncer.touch(path, delay)
+
+
+def watch(
+    inbox: Path,
+    handle: Callable[[Path], None],
+    *,
+    mode: str = "auto",
+    interval: float = 2.0,
+    debounce: float = 0.05,
+    settle: float = 1.0,
+    stop_fn: Optional[Callable[[], bool]] = None,
+    skip: Optional[Callable[[Path], bool]] = None,
+) -> str:
+    """Ruft ``handle(pdf)`` für jede fertig geschriebene PDF in ``inbox`` auf.
+
+    ``mode="inotify"`` reagiert auf ``IN_CLOSE_WRITE``/``IN_MOVED_TO`` (Freigabe
+    nach ``debounce`` Sekunden ohne Änderung); Dateien, die nur angelegt oder
+    beschrieben werden, gelten nach ``settle`` ruhigen Sekunden als fertig.
+    ``mode="poll"`` listet die Inbox alle ``interval`` Sekunden; mit inotify
+    geschieht das zusätzlich als Sicherheitsnetz (Netzlaufwerke melden
+    fremde Schreibzugriffe nicht). Gelistete Dateien werden wie angelegte
+    erst nach ``settle`` Sekunden freigegeben. ``auto`` nimmt inotify, falls
+    verfügbar. Liefert den tatsächlich genutzten Modus,
+    sobald ``stop_fn`` wahr wird. ``skip(pdf)`` filtert Dateien, die bereits
+    in Arbeit sind.
+    """
+
+    watcher: Optional[InotifyWatcher] = None
+    if mode in ("auto", "inotify"):
+        try:
+            watcher = InotifyWatcher(inbox)
+        except (OSError, AttributeError) as exc:
+            if mode == "inotify":
+                raise
+            print(f"[Hotfolder] inotify nicht verfügbar ({exc}) – nutze Polling.", file=sys.stderr)
+    used = "inotify" if watcher is not None else "poll"
+    print(f"[Hotfolder] Überwache {inbox} per {used}.")
+    stop_check = 0.5 if stop_fn else None
+    debouncer = Debouncer()
+    # Funde eines Listings haben kein Schließen-Ereignis gesehen: wie
+    # angelegte Dateien erst nach ``settle`` ruhigen Sekunden freigeben
+    _scan(inbox, debouncer, settle)  # bereits vorhandene Dateien
+    next_poll = time.monotonic() + interval
+    try:
+        while not (stop_fn and stop_fn()):
+            for pdf in debouncer.pop_ready():
+                if skip is not None and skip(pdf):
+                    continue
+                try:
+                    handle(pdf)
+                except Exception as exc:
+                    print(f"[Hotfolder] Laufzeitfehler: {pdf.name}: {exc}", file=sys.stderr)
+            now = time.monotonic()
+            if now >= next_poll:
+                # auch mit inotify: Schreiber auf CIFS/NFS-Freigaben lösen keine Ereignisse aus
+                _scan(inbox, debouncer, settle)
+                next_poll = now + interval
+            wait = next_poll - time.monotonic()
+            pending = debouncer.next_timeout()
+            if pending is not None:
+                wait = min(wait, pending)
+            if stop_check is not None:
+                wait = min(wait, stop_check)
+            wait = max(0.0, wait)
+            if watcher is None:
+                time.sleep(wait)
+                continue
+            for name, mask in watcher.read(wait):
+                if mask & IN_Q_OVERFLOW:
+                    _scan(inbox, debouncer, settle)
+                    continue
+                path = inbox / name
+                if not name or not _is_pdf(path):
+                    continue
+                # fertig geschrieben/hineinverschoben: kurz entprellen;
+                # angelegt/geändert: warten, bis die Datei zur Ruhe kommt
+                debouncer.touch(path, debounce if mask & (IN_CLOSE_WRITE | IN_MOVED_TO) else settle)
+    finally:
+        if watcher is not None:
+            watcher.close()
+    return used
 
 
 def _load_unknown_dir_name(cfg_path: str) -> str:
@@ -53,6 +268,73 @@ def _load_unknown_dir_name(cfg_path: str) -> str:
     return default
 
 
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Settings:
+    """Geparste Konfiguration und kompilierte Muster für den Dauerbetrieb.
+
+    Beide Dateien werden einmal gelesen; :meth:`refresh` lädt sie nur neu,
+    wenn sich mtime oder Größe geändert haben, und tauscht den Stand in einem
+    Schritt aus. Ein fehlerhafter Stand wird gemeldet, der vorherige bleibt
+    aktiv.
+    """
+
+    def __init__(
+        self, cfg_path: str, patterns_path: str, overrides: Optional[Mapping[str, object]] = None
+    ) -> None:
+        self.cfg_path = cfg_path
+        self.patterns_path = patterns_path
+        self.overrides = dict(overrides or {})
+        self.error: Optional[str] = None
+        self._stamp: Optional[Tuple[object, object]] = None
+        self._snapshot: Optional[Tuple[Dict[str, object], object]] = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Lädt bei geänderten Dateien neu; ``True``, wenn ein neuer Stand aktiv ist."""
+
+        stamp = (_file_stamp(self.cfg_path), _file_stamp(self.patterns_path))
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            cfg = sorter.load_config(self.cfg_path)
+            pats = sorter.compile_patterns(self.patterns_path)
+        except Exception as exc:
+            self.error = str(exc)
+            keep = "vorheriger Stand bleibt aktiv" if self._snapshot else "keine gültige Konfiguration"
+            print(f"[Hotfolder] Konfiguration/Muster fehlerhaft ({keep}): {exc}", file=sys.stderr)
+            return False
+        cfg.update(self.overrides)  # Kommandozeile schlägt config.yaml
+        if str(cfg.get("duplicate_action") or "").strip().lower() == "skip":
+            # liegen gelassene Duplikate würden der Eingang nie leeren
+            cfg["duplicate_action"] = "move"
+        reloaded = self._snapshot is not None
+        self._snapshot = (cfg, pats)
+        self.error = None
+        if reloaded:
+            print(f"[Hotfolder] Konfiguration/Muster neu geladen: {self.cfg_path}, {self.patterns_path}")
+        return True
+
+    def current(self) -> Tuple[Dict[str, object], object]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError(f"Konfiguration/Muster nicht geladen: {self.error}")
+        return snapshot
+
+    @property
+    def unknown_dir_name(self) -> str:
+        snapshot = self._snapshot
+        value = snapshot[0].get("unknown_dir_name") if snapshot else None
+        return str(value).strip() if isinstance(value, str) and value.strip() else "unbekannt"
+
+
 def _possible_path_values(result: object) -> Iterable[Union[str, Path]]:
     if isinstance(result, (str, Path)):
         yield result
@@ -122,12 +404,44 @@ def _extract_status_hint(result: object) -> str:
     return _clean(result) or ""
 
 
-def _move_to(pdf: Path, target_dir: Path, label: str, reason: Optional[str] = None) -> None:
+# Ergebnis einer Ablage: ("moved", Zielpfad) oder ("failed", Fehlertext)
+Outcome = Tuple[str, Optional[str]]
+
+# Aktiv nur mit --metrics-port; zählt Ablagen für /metrics
+_METRICS: Optional[Metrics] = None
+
+
+def _observe(pdf: Path, status: str, method: Optional[str] = None) -> None:
+    if _METRICS is not None:
+        _METRICS.done(pdf, status, method)
+
+
+def _move_to(pdf: Path, target_dir: Path, label: str, reason: Optional[str] = None) -> Path:
     target = target_dir / pdf.name
     target.parent.mkdir(parents=True, exist_ok=True)
     shutil.move(str(pdf), str(target))
     suffix = f" ({reason})" if reason else ""
     print(f"[Hotfolder] {label}: {pdf.name} -> {target}{suffix}")
+    return target
+
+
+def _move_failed(
+    pdf: Path, out_err: Path, exc: BaseException, cfg: Optional[Mapping[str, object]] = None
+) -> Outcome:
+    target = out_err / pdf.name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        shutil.move(str(pdf), str(target))
+    except Exception:
+        pass
+    print(f"[Hotfolder] FEHLER: {pdf.name}: {exc}", file=sys.stderr)
+    if cfg is not None and sorter and hasattr(sorter, "record_result"):
+        sorter.record_result(
+            cfg,
+            {"source": str(pdf), "destination": str(target), "status": "fail", "error": str(exc)},
+        )
+    _observe(pdf, "fail")
+    return "failed", str(exc)
 
 
 def process_one(
@@ -137,28 +451,302 @@ def process_one(
     out_ok: Path,
     out_err: Path,
     out_unknown: Path,
-) -> None:
+    settings: Optional[Settings] = None,
+    analysis: Optional[Mapping[str, object]] = None,
+    snapshot: Optional[Tuple[Dict[str, object], object]] = None,
+) -> Outcome:
+    """Verarbeitet eine PDF; mit ``analysis`` (aus einem Worker) nur noch die Ablage."""
+
     try:
         if sorter and hasattr(sorter, "process_pdf"):
-            res = sorter.process_pdf(
-                str(pdf), config_path=cfg_path, patterns_path=patterns_path, simulate=False
-            )
+            if snapshot is None and settings is not None:
+                snapshot = settings.current()
+            if snapshot is not None:
+                cfg, pats = snapshot
+                res = sorter.process_pdf(
+                    str(pdf), config=cfg, patterns=pats, simulate=False, analysis=analysis
+                )
+            else:
+                res = sorter.process_pdf(
+                    str(pdf), config_path=cfg_path, patterns_path=patterns_path, simulate=False
+                )
+            method = res.get("text_method") if isinstance(res, dict) else getattr(res, "text_method", None)
+            _observe(pdf, _extract_status_hint(res) or "unknown", method)
             target = _resolve_target_path(res)
             if target is not None:
                 print(f"[Hotfolder] OK: {pdf.name} -> {target}")
-                return
+                return "moved", str(target)
             reason = _extract_status_hint(res) or "kein Zielpfad"
-            _move_to(pdf, out_unknown, "UNKNOWN", reason)
-        else:
-            _move_to(pdf, out_unknown, "UNKNOWN", "sorter.process_pdf nicht verfügbar")
+            return "moved", str(_move_to(pdf, out_unknown, "UNKNOWN", reason))
+        _observe(pdf, "unknown")
+        return "moved", str(_move_to(pdf, out_unknown, "UNKNOWN", "sorter.process_pdf nicht verfügbar"))
     except Exception as e:
-        target = out_err / pdf.name
-        target.parent.mkdir(parents=True, exist_ok=True)
+        return _move_failed(pdf, out_err, e, snapshot[0] if snapshot is not None else None)
+
+
+def _is_duplicate(
+    pdf: Path, snapshot: Tuple[Dict[str, object], object], content_hash: Optional[str] = None
+) -> bool:
+    """Exaktes Duplikat laut Ergebnis-Datenbank? Dann ist keine Analyse nötig."""
+
+    if not (sorter and hasattr(sorter, "find_duplicate")):
+        return False
+    return sorter.find_duplicate(pdf, snapshot[0], content_hash=content_hash) is not None
+
+
+def _claim(journal: Journal, pdf: Path) -> Tuple[Optional[str], Optional[Mapping[str, object]]]:
+    """Trägt ``pdf`` als ``claimed`` ein; liefert Hash und ggf. gespeicherte Analyse."""
+
+    try:
+        content_hash = sorter.compute_content_hash(pdf)
+    except OSError as exc:
+        print(f"[Hotfolder] Journal: {pdf.name} nicht lesbar: {exc}", file=sys.stderr)
+        return None, None
+    entry = journal.latest(content_hash)
+    if entry is not None and entry.state == ANALYZED and entry.analysis is not None:
+        print(f"[Hotfolder] Fortsetzen: {pdf.name} (Analyse aus dem Journal)")
+        return content_hash, entry.analysis
+    journal.claim(content_hash, pdf)
+    return content_hash, None
+
+
+def _record(journal: Optional[Journal], content_hash: Optional[str], pdf: Path, outcome: Outcome) -> None:
+    if journal is None or content_hash is None:
+        return
+    state, detail = outcome
+    if state == "moved":
+        journal.moved(content_hash, pdf, detail)
+    else:
+        journal.failed(content_hash, pdf, detail or "")
+
+
+def process_journaled(
+    pdf: Path,
+    journal: Journal,
+    snapshot: Tuple[Dict[str, object], object],
+    *,
+    cfg_path: str,
+    patterns_path: str,
+    out_ok: Path,
+    out_err: Path,
+    out_unknown: Path,
+) -> Outcome:
+    """Wie :func:`process_one`, schreibt aber jeden Zwischenstand ins Journal."""
+
+    content_hash, analysis = _claim(journal, pdf)
+    if analysis is None and _is_duplicate(pdf, snapshot, content_hash):
+        outcome = process_one(
+            pdf, cfg_path, patterns_path, out_ok, out_err, out_unknown, snapshot=snapshot
+        )
+        _record(journal, content_hash, pdf, outcome)
+        return outcome
+    if analysis is None:
         try:
-            shutil.move(str(pdf), str(target))
-        except Exception:
-            pass
-        print(f"[Hotfolder] FEHLER: {pdf.name}: {e}", file=sys.stderr)
+            analysis = sorter.analyze_pdf(str(pdf), config=snapshot[0], patterns=snapshot[1])
+        except Exception as exc:
+            outcome = _move_failed(pdf, out_err, exc, snapshot[0])
+            _record(journal, content_hash, pdf, outcome)
+            return outcome
+        if content_hash is not None:
+            journal.analyzed(content_hash, pdf, analysis)
+    outcome = process_one(
+        pdf, cfg_path, patterns_path, out_ok, out_err, out_unknown, analysis=analysis, snapshot=snapshot
+    )
+    _record(journal, content_hash, pdf, outcome)
+    return outcome
+
+
+def _init_pool_worker(cfg: Mapping[str, object], pats: object) -> None:
+    # Stoppen steuert allein der Hauptprozess (Drain bei SIGTERM); Worker
+    # beenden ihren laufenden Auftrag, statt mittendrin abzubrechen.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    sorter._init_worker(cfg, pats)
+
+
+class WorkerPool:
+    """Begrenzte Auftragsschlange vor einem Prozess-Pool.
+
+    Die Analyse (Textextraktion/OCR) läuft in ``jobs`` Worker-Prozessen;
+    Zielname und Verschieben erledigt ein eigener Ablage-Thread nacheinander,
+    damit sich parallele Ablagen nicht gegenseitig überschreiben. Fertige
+    Analysen landen dazu in einer Warteschlange – ein langsames Netzlaufwerk
+    hält so nicht das Abholen der Worker-Ergebnisse auf. Höchstens
+    ``jobs + queue_size`` Dateien sind gleichzeitig angenommen –
+    :meth:`submit` blockiert darüber (Gegendruck auf den Watcher). Bereits
+    angenommene Dateien werden kein zweites Mal eingereiht.
+    """
+
+    def __init__(
+        self,
+        jobs: int,
+        queue_size: int,
+        *,
+        cfg_path: str,
+        patterns_path: str,
+        out_ok: Path,
+        out_err: Path,
+        journal: Optional[Journal] = None,
+    ) -> None:
+        self.jobs = max(1, jobs)
+        self.journal = journal
+        self.capacity = self.jobs + max(0, queue_size)
+        self._paths = (cfg_path, patterns_path, out_ok, out_err)
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)  # eine angenommene Datei ist abgelegt
+        self._place_lock = threading.Lock()
+        self._finished: "queue.Queue[Optional[tuple]]" = queue.Queue()  # fertige Analysen für die Ablage
+        self._placer: Optional[threading.Thread] = None
+        self._claimed: Dict[Path, Future] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._snapshot: Optional[Tuple[Dict[str, object], object]] = None
+        self._retired: List[ProcessPoolExecutor] = []
+        self._measure = False  # stage_timings, mit dem der Pool gestartet wurde
+
+    def __contains__(self, pdf: Path) -> bool:
+        with self._lock:
+            return pdf in self._claimed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._claimed)
+
+    def _executor_for(self, snapshot: Tuple[Dict[str, object], object]) -> ProcessPoolExecutor:
+        measure = timings.enabled(snapshot[0])
+        if self._executor is not None and self._snapshot is snapshot and self._measure == measure:
+            return self._executor
+        if self._executor is not None:
+            # neuer Konfigurationsstand: laufende Aufträge beenden lassen
+            self._executor.shutdown(wait=False)
+            self._retired.append(self._executor)
+        cfg = dict(snapshot[0])
+        cfg["jobs"] = self.jobs  # OCR-Threads je Worker passend aufteilen
+        cfg["stage_timings"] = measure
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=_init_pool_worker, initargs=(cfg, snapshot[1])
+        )
+        self._snapshot = snapshot
+        self._measure = measure
+        return self._executor
+
+    def submit(
+        self,
+        pdf: Path,
+        out_unknown: Path,
+        snapshot: Tuple[Dict[str, object], object],
+        stop_fn: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """Reiht ``pdf`` ein; wartet, solange die Schlange voll ist.
+
+        Liefert ``False``, wenn die Datei schon angenommen ist oder während
+        des Wartens ``stop_fn`` wahr wird (die Datei bleibt dann im Eingang).
+        """
+
+        with self._lock:
+            while True:
+                if stop_fn and stop_fn():
+                    return False
+                if pdf in self._claimed:
+                    return False
+                if len(self._claimed) < self.capacity:
+                    break
+                self._released.wait(timeout=0.5)
+        content_hash: Optional[str] = None
+        analysis: Optional[Mapping[str, object]] = None
+        if self.journal is not None:
+            content_hash, analysis = _claim(self.journal, pdf)
+        # bereits analysiert (Neustart nach Absturz) oder exaktes Duplikat:
+        # ohne Worker direkt ablegen
+        if analysis is not None or _is_duplicate(pdf, snapshot, content_hash):
+            cfg_path, patterns_path, out_ok, out_err = self._paths
+            with self._place_lock:
+                outcome = process_one(
+                    pdf, cfg_path, patterns_path, out_ok, out_err, out_unknown,
+                    analysis=analysis, snapshot=snapshot,
+                )
+                _record(self.journal, content_hash, pdf, outcome)
+            return True
+        try:
+            future = self._executor_for(snapshot).submit(sorter._analyze_job, str(pdf))
+        except BrokenExecutor:
+            self._executor = None
+            future = self._executor_for(snapshot).submit(sorter._analyze_job, str(pdf))
+        with self._lock:
+            self._claimed[pdf] = future
+            if self._placer is None:
+                self._placer = threading.Thread(target=self._place_loop, name="hotfolder-ablage", daemon=True)
+                self._placer.start()
+        # Der Callback läuft im Verwaltungs-Thread des Pools: nur einreihen
+        future.add_done_callback(lambda fut: self._finished.put((pdf, out_unknown, snapshot, content_hash, fut)))
+        return True
+
+    def _place_loop(self) -> None:
+        while True:
+            item = self._finished.get()
+            try:
+                if item is None:
+                    return
+                self._finish(*item)
+            except Exception as exc:  # der Ablage-Thread darf nicht sterben
+                print(f"[Hotfolder] Ablage fehlgeschlagen: {exc}", file=sys.stderr)
+            finally:
+                self._finished.task_done()
+
+    def _finish(
+        self,
+        pdf: Path,
+        out_unknown: Path,
+        snapshot: Tuple[Dict[str, object], object],
+        content_hash: Optional[str],
+        future: Future,
+    ) -> None:
+        cfg_path, patterns_path, out_ok, out_err = self._paths
+        try:
+            with self._place_lock:
+                try:
+                    analysis = future.result()
+                except BaseException as exc:
+                    if isinstance(exc, BrokenExecutor):
+                        exc = RuntimeError(f"Worker-Prozess abgebrochen ({exc})")
+                    outcome = _move_failed(pdf, out_err, exc, snapshot[0])
+                else:
+                    if self.journal is not None and content_hash is not None and not analysis.get("duplicate_only"):
+                        self.journal.analyzed(content_hash, pdf, analysis)
+                    outcome = process_one(
+                        pdf, cfg_path, patterns_path, out_ok, out_err, out_unknown,
+                        analysis=analysis, snapshot=snapshot,
+                    )
+                _record(self.journal, content_hash, pdf, outcome)
+        finally:
+            with self._lock:
+                if self._claimed.get(pdf) is future:
+                    del self._claimed[pdf]
+                self._released.notify_all()
+
+    def warm_up(self, snapshot: Tuple[Dict[str, object], object]) -> int:
+        """Startet alle Worker vorab (mit ``warmup`` laden sie Bibliotheken/Tesseract)."""
+
+        executor = self._executor_for(snapshot)
+        # Aufträge direkt nacheinander: kein Worker ist frei, jeder startet neu
+        futures = [executor.submit(os.getpid) for _ in range(self.jobs)]
+        return len({future.result() for future in futures})
+
+    def drain(self) -> None:
+        """Nimmt nichts mehr an und wartet, bis alle angenommenen Dateien abgelegt sind."""
+
+        executors = self._retired + ([self._executor] if self._executor is not None else [])
+        for executor in executors:
+            executor.shutdown(wait=True)
+        self._executor = None
+        self._retired = []
+        # alle Callbacks sind gelaufen: Ablage-Thread die Schlange abarbeiten lassen
+        with self._lock:
+            placer, self._placer = self._placer, None
+        if placer is not None:
+            self._finished.put(None)
+            placer.join()
 
 
 def main():
@@ -168,38 +756,209 @@ def main():
     ap.add_argument("--err", dest="err", required=True, help="Fehlerordner")
     ap.add_argument("--config", dest="config", default="config.yaml")
     ap.add_argument("--patterns", dest="patterns", default="patterns.yaml")
-    ap.add_argument("--interval", type=float, default=2.0)
+    ap.add_argument("--interval", type=float, default=2.0, help="Polling-Intervall (Sekunden)")
+    ap.add_argument(
+        "--watch",
+        choices=("auto", "inotify", "poll"),
+        default="auto",
+        help="Ereignisquelle: inotify (Linux) oder Polling; auto = inotify, falls verfügbar",
+    )
+    ap.add_argument(
+        "--debounce",
+        type=float,
+        default=0.05,
+        help="Ruhezeit nach Schließen/Verschieben einer Datei (Sekunden)",
+    )
+    ap.add_argument(
+        "--settle",
+        type=float,
+        default=1.0,
+        help="Ruhezeit für Dateien ohne Schließen-Ereignis (Sekunden)",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Analyse-Prozesse (Standard: jobs aus der Konfiguration, 0 = alle Kerne, 1 = seriell)",
+    )
+    ap.add_argument(
+        "--journal",
+        default="logs/hotfolder_journal.sqlite",
+        help="Journal-Datenbank für Neustart nach Absturz (leer = aus)",
+    )
+    ap.add_argument(
+        "--queue-size",
+        type=int,
+        default=None,
+        help="Wartende Dateien zusätzlich zu den laufenden (Standard: Anzahl Prozesse)",
+    )
+    ap.add_argument(
+        "--metrics-port",
+        type=int,
+        default=0,
+        help="Prometheus-Endpunkt /metrics auf diesem Port (0 = aus)",
+    )
+    ap.add_argument(
+        "--metrics-host",
+        default="127.0.0.1",
+        help="Adresse für den Metrik-Endpunkt (0.0.0.0 = alle Schnittstellen)",
+    )
+    ap.add_argument(
+        "--warmup",
+        action="store_true",
+        help="PDF/OCR-Bibliotheken und Tesseract vor dem ersten Dokument laden (auch in den Workern)",
+    )
+    ap.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="cProfile/tracemalloc je Dokument nach DIR schreiben, beim Beenden Top-N-Bericht",
+    )
+    ap.add_argument(
+        "--profile-sample",
+        type=float,
+        default=0.05,
+        help="Anteil der profilierten Dokumente (Standard 0.05 = jedes zwanzigste)",
+    )
+    ap.add_argument("--profile-top", type=int, default=30, help="Zeilen im Top-N-Bericht")
     args = ap.parse_args()
 
+    overrides: Dict[str, object] = {}
+    if args.profile:
+        overrides.update(profile_dir=args.profile, profile_sample=args.profile_sample)
+    if args.warmup:
+        overrides["warmup"] = True
+    started = time.time()
+
     inbox = Path(args.inbox)
     out_ok = Path(args.done)
     out_err = Path(args.err)
-    unknown_dir_name = _load_unknown_dir_name(args.config)
+    settings = Settings(args.config, args.patterns, overrides) if sorter else None
+    unknown_dir_name = settings.unknown_dir_name if settings else _load_unknown_dir_name(args.config)
     out_unknown = out_ok / unknown_dir_name
     inbox.mkdir(parents=True, exist_ok=True)
     out_ok.mkdir(parents=True, exist_ok=True)
     out_err.mkdir(parents=True, exist_ok=True)
     out_unknown.mkdir(parents=True, exist_ok=True)
 
+    journal: Optional[Journal] = None
+    if args.journal and settings is not None:
+        journal = Journal(args.journal)
+        stats = journal.reconcile()
+        if any(stats.values()):
+            print(
+                f"[Hotfolder] Journal abgeglichen: {stats['resume']} fortsetzen (ohne OCR), "
+                f"{stats['reanalyze']} neu analysieren, {stats['moved']} bereits abgelegt, "
+                f"{stats['failed']} verloren"
+            )
+
+    jobs = 1  # ohne gültige Konfiguration seriell; Dateien landen dann im Fehlerordner
+    if settings is not None and settings.error is None and hasattr(sorter, "_analyze_job"):
+        configured = args.jobs if args.jobs is not None else settings.current()[0].get("jobs", 1)
+        jobs = sorter._resolve_jobs(configured)
+    pool: Optional[WorkerPool] = None
+    if jobs > 1:
+        pool = WorkerPool(
+            jobs,
+            args.queue_size if args.queue_size is not None else jobs,
+            cfg_path=args.config,
+            patterns_path=args.patterns,
+            out_ok=out_ok,
+            out_err=out_err,
+            journal=journal,
+        )
+
+    global _METRICS
+    metrics_server = None
+    # vor dem Aufwärmen: der Stufenzeit-Hook bestimmt stage_timings der Worker
+    if args.metrics_port:
+        from metrics import Metrics, serve as serve_metrics
+
+        _METRICS = Metrics(inbox=inbox, in_flight=(lambda: len(pool)) if pool is not None else None)
+        timings.add_hook(_METRICS.observe_stages)
+        metrics_server = serve_metrics(_METRICS, args.metrics_host, args.metrics_port)
+        print(f"[Hotfolder] Metriken: http://{args.metrics_host}:{args.metrics_port}/metrics")
+
+    if settings is not None and settings.error is None and (args.warmup or settings.current()[0].get("warmup")):
+        started_warmup = time.perf_counter()
+        if pool is not None:
+            workers = pool.warm_up(settings.current())
+            detail = f"{workers} Worker"
+        else:
+            report = sorter.warm_up(settings.current()[0])
+            missing = [name for name, ms in report["modules"].items() if ms is None]
+            detail = f"Tesseract {report.get('tesseract_ms', '–')} ms"
+            if missing:
+                detail += f", nicht installiert: {', '.join(missing)}"
+        print(f"[Hotfolder] Aufgewärmt in {time.perf_counter() - started_warmup:.1f}s ({detail})")
+
     print(
-        f"[Hotfolder] Starte. Inbox={inbox} OK={out_ok} UNKNOWN={out_unknown} ERR={out_err} Interval={args.interval}s"
+        f"[Hotfolder] Starte. Inbox={inbox} OK={out_ok} UNKNOWN={out_unknown} ERR={out_err} "
+        f"Modus={args.watch} Interval={args.interval}s Prozesse={jobs}"
     )
-    try:
-        while True:
+
+    stop = threading.Event()
+
+    def _on_sigterm(signum, frame) -> None:
+        print("[Hotfolder] SIGTERM – nehme nichts mehr an, arbeite Angenommenes ab …")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+    def _handle(pdf: Path) -> None:
+        if _METRICS is not None:
+            _METRICS.arrived(pdf)
+        unknown = out_unknown
+        snapshot = None
+        if settings is not None:
+            settings.refresh()
+            unknown = out_ok / settings.unknown_dir_name
             try:
-                files = sorted(p for p in inbox.glob("*.pdf"))
-                for pdf in files:
-                    if is_locked(pdf):
-                        continue
-                    process_one(pdf, args.config, args.patterns, out_ok, out_err, out_unknown)
-                time.sleep(args.interval)
-            except KeyboardInterrupt:
-                print("[Hotfolder] Stop (KeyboardInterrupt)")
-                break
-            except Exception as e:
-                print(f"[Hotfolder] Laufzeitfehler: {e}", file=sys.stderr)
-                time.sleep(args.interval)
+                snapshot = settings.current()
+            except RuntimeError:
+                snapshot = None  # ohne gültige Konfiguration: process_one -> Fehlerordner
+        if snapshot is not None and pool is not None:
+            pool.submit(pdf, unknown, snapshot, stop_fn=stop.is_set)
+        elif snapshot is not None and journal is not None:
+            process_journaled(
+                pdf,
+                journal,
+                snapshot,
+                cfg_path=args.config,
+                patterns_path=args.patterns,
+                out_ok=out_ok,
+                out_err=out_err,
+                out_unknown=unknown,
+            )
+        else:
+            process_one(pdf, args.config, args.patterns, out_ok, out_err, unknown, settings=settings)
+
+    try:
+        watch(
+            inbox,
+            _handle,
+            mode=args.watch,
+            interval=args.interval,
+            debounce=args.debounce,
+            settle=args.settle,
+            stop_fn=stop.is_set,
+            skip=(lambda pdf: pdf in pool) if pool is not None else None,
+        )
+    except KeyboardInterrupt:
+        print("[Hotfolder] Stop (KeyboardInterrupt)")
     finally:
+        if pool is not None:
+            pool.drain()
+        if journal is not None:
+            journal.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+            timings.remove_hook(_METRICS.observe_stages)
+        if args.profile:
+            import profiling
+
+            report_path = profiling.write_report(args.profile, since=started, top=args.profile_top)
+            if report_path is not None:
+                print(f"[Hotfolder] Profilbericht: {report_path}")
         print("[Hotfolder] Ende")
 
 
@@ -0,0 +1,185 @@
+"""Absturzsicheres Journal für den Hotfolder.
+
+Jede Zustandsänderung einer Datei (``claimed`` → ``analyzed`` → ``moved``
+bzw. ``failed``) wird als neue Zeile angehängt, adressiert über den
+Inhalts-Hash der PDF. SQLite im WAL-Modus mit ``synchronous=FULL`` sorgt
+dafür, dass ein bestätigter Eintrag einen Absturz übersteht. Nach einem
+Neustart gleicht :meth:`Journal.reconcile` offene Einträge mit dem
+Dateisystem ab; bereits analysierte Dokumente werden ohne erneute OCR
+abgelegt.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Union
+
+PathLike = Union[str, os.PathLike]
+
+CLAIMED = "claimed"
+ANALYZED = "analyzed"
+MOVED = "moved"
+FAILED = "failed"
+OPEN_STATES = (CLAIMED, ANALYZED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    source TEXT,
+    target TEXT,
+    analysis TEXT,
+    error TEXT,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_hash ON events(content_hash, id);
+"""
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """Letzter bekannter Zustand eines Dokuments."""
+
+    content_hash: str
+    state: str
+    source: Optional[str]
+    target: Optional[str]
+    analysis: Optional[Dict[str, object]]
+    error: Optional[str]
+    ts: float
+
+
+class Journal:
+    """Append-only-Protokoll (SQLite, WAL) der Hotfolder-Zustände je Inhalts-Hash."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _append(
+        self,
+        content_hash: str,
+        state: str,
+        *,
+        source: Optional[PathLike] = None,
+        target: Optional[PathLike] = None,
+        analysis: Optional[Mapping[str, object]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        blob = json.dumps(dict(analysis), default=str) if analysis is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO events (content_hash, state, source, target, analysis, error, ts)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    content_hash,
+                    state,
+                    str(source) if source is not None else None,
+                    str(target) if target is not None else None,
+                    blob,
+                    error,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def claim(self, content_hash: str, source: PathLike) -> None:
+        self._append(content_hash, CLAIMED, source=source)
+
+    def analyzed(self, content_hash: str, source: PathLike, analysis: Mapping[str, object]) -> None:
+        self._append(content_hash, ANALYZED, source=source, analysis=analysis)
+
+    def moved(self, content_hash: str, source: PathLike, target: Optional[PathLike]) -> None:
+        self._append(content_hash, MOVED, source=source, target=target)
+
+    def failed(self, content_hash: str, source: PathLike, error: str, target: Optional[PathLike] = None) -> None:
+        self._append(content_hash, FAILED, source=source, target=target, error=error)
+
+    @staticmethod
+    def _entry(row: tuple) -> JournalEntry:
+        content_hash, state, source, target, analysis, error, ts = row
+        return JournalEntry(
+            content_hash=str(content_hash),
+            state=str(state),
+            source=source,
+            target=target,
+            analysis=json.loads(analysis) if analysis else None,
+            error=error,
+            ts=float(ts),
+        )
+
+    def latest(self, content_hash: str) -> Optional[JournalEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, state, source, target, analysis, error, ts FROM events"
+                " WHERE content_hash = ? ORDER BY id DESC LIMIT 1",
+                (content_hash,),
+            ).fetchone()
+        return self._entry(row) if row else None
+
+    def open_entries(self) -> List[JournalEntry]:
+        """Dokumente, deren letzter Zustand ``claimed`` oder ``analyzed`` ist."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT e.content_hash, e.state, e.source, e.target, e.analysis, e.error, e.ts"
+                " FROM events e JOIN ("
+                "   SELECT content_hash, MAX(id) AS id FROM events GROUP BY content_hash"
+                " ) last ON last.id = e.id"
+                " WHERE e.state IN (?, ?) ORDER BY e.id",
+                OPEN_STATES,
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def reconcile(self) -> Dict[str, int]:
+        """Gleicht offene Einträge mit dem Dateisystem ab (nach einem Neustart).
+
+        Liegt die Quelle noch im Eingang, bleibt der Eintrag offen – die Datei
+        wird erneut aufgegriffen, analysierte ohne neue OCR. Fehlt sie, war
+        die Ablage bei ``analyzed`` schon erfolgt (Absturz vor dem Eintrag);
+        bei ``claimed`` gilt sie als verloren und wird als ``failed`` markiert.
+        """
+
+        stats = {"resume": 0, "reanalyze": 0, "moved": 0, "failed": 0}
+        for entry in self.open_entries():
+            source = entry.source or ""
+            if source and Path(source).exists():
+                stats["resume" if entry.state == ANALYZED else "reanalyze"] += 1
+            elif entry.state == ANALYZED:
+                self.moved(entry.content_hash, source, None)
+                stats["moved"] += 1
+            else:
+                self.failed(entry.content_hash, source, "Quelle nach Neustart nicht mehr vorhanden")
+                stats["failed"] += 1
+        return stats
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = [
+    "ANALYZED",
+    "CLAIMED",
+    "FAILED",
+    "MOVED",
+    "Journal",
+    "JournalEntry",
+]
@@ -0,0 +1,197 @@
+"""Gepufferter CSV-Log, geschrieben von einem Hintergrund-Thread.
+
+Der Aufrufer legt Zeilen nur in eine begrenzte Queue; ein eigener Thread
+schreibt sie und ruft ``flush`` erst nach ``flush_rows`` Zeilen oder
+``flush_seconds`` Sekunden auf – auf einer Netzwerkfreigabe spart das einen
+synchronen Schreibvorgang je Dokument. :meth:`CsvLogSink.close` (auch beim
+Verlassen des ``with``-Blocks durch eine Ausnahme) schreibt alle noch
+wartenden Zeilen. Mit ``max_bytes`` wird die Datei nach Größe rotiert
+(``processed.csv`` → ``processed.1.csv`` …); eine vorhandene Datei mit
+abweichendem Kopf wird ebenso beiseitegelegt, statt neue Spalten an alte
+Zeilen zu hängen.
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import io
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+PathLike = Union[str, os.PathLike]
+
+DEFAULT_FLUSH_ROWS = 50
+DEFAULT_FLUSH_SECONDS = 2.0
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_BACKUPS = 5
+
+_STOP = object()
+
+
+def _header_line(columns: Sequence[str]) -> str:
+    buf = io.StringIO()
+    csv.writer(buf, delimiter=";").writerow(columns)
+    return buf.getvalue().rstrip("\r\n")
+
+
+def _read_header(path: Path) -> Optional[str]:
+    try:
+        with path.open("r", encoding="utf-8", newline="") as handle:
+            return handle.readline().rstrip("\r\n")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+class CsvLogSink:
+    """Schreibt CSV-Zeilen (``;``-getrennt) gepuffert in einem eigenen Thread."""
+
+    def __init__(
+        self,
+        path: PathLike,
+        columns: Sequence[str],
+        *,
+        flush_rows: int = DEFAULT_FLUSH_ROWS,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        max_bytes: int = 0,
+        backups: int = DEFAULT_BACKUPS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.columns: List[str] = list(columns)
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_seconds = max(0.0, float(flush_seconds))
+        self.max_bytes = max(0, int(max_bytes))
+        self.backups = max(1, int(backups))
+        self.error: Optional[BaseException] = None
+        self.rows_written = 0
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._closed = False
+        self._close_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size > 0:
+            if _read_header(self.path) != _header_line(self.columns):
+                self._rotate()
+        self._file = self._open()
+        self._writer = csv.writer(self._file, delimiter=";")
+
+        self._thread = threading.Thread(target=self._run, name="csv-log-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -- Aufruferseite ---------------------------------------------------
+
+    def write(self, row: Sequence[object]) -> None:
+        """Reiht eine Zeile ein; blockiert nur, wenn die Queue voll ist.
+
+        Kürzere Zeilen werden mit leeren Feldern auf die Spaltenzahl aufgefüllt.
+        """
+
+        if self._closed:
+            raise RuntimeError(f"CSV-Log {self.path} ist bereits geschlossen")
+        values = list(row)
+        if len(values) < len(self.columns):
+            values.extend([""] * (len(self.columns) - len(values)))
+        self._queue.put(values)
+
+    def close(self) -> None:
+        """Schreibt alle wartenden Zeilen, flusht und beendet den Thread."""
+
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self) -> "CsvLogSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # -- Schreib-Thread --------------------------------------------------
+
+    def _open(self):
+        handle = self.path.open("a", encoding="utf-8", newline="")
+        if handle.tell() == 0:
+            csv.writer(handle, delimiter=";").writerow(self.columns)
+            handle.flush()
+        return handle
+
+    def _backup_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{index}{self.path.suffix}")
+
+    def _rotate(self) -> None:
+        oldest = self._backup_path(self.backups)
+        if oldest.exists():
+            oldest.unlink()
+        for index in range(self.backups - 1, 0, -1):
+            src = self._backup_path(index)
+            if src.exists():
+                os.replace(src, self._backup_path(index + 1))
+        os.replace(self.path, self._backup_path(1))
+
+    def _write_row(self, row: List[object]) -> None:
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._file.close()
+            self._rotate()
+            self._file = self._open()
+            self._writer = csv.writer(self._file, delimiter=";")
+        self._writer.writerow(row)
+        self.rows_written += 1
+
+    def _run(self) -> None:
+        pending = 0
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if item is not None and self.error is None:
+                    try:
+                        self._write_row(item)  # type: ignore[arg-type]
+                    except Exception as exc:
+                        self._fail(exc)
+                    pending += 1
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_seconds
+                if pending and (pending >= self.flush_rows or time.monotonic() >= deadline):
+                    self._flush()
+                    pending = 0
+                    deadline = None
+        finally:
+            self._flush()
+            try:
+                self._file.close()
+            except Exception:
+                pass
+
+    def _flush(self) -> None:
+        if self.error is not None:
+            return
+        try:
+            self._file.flush()
+        except Exception as exc:
+            self._fail(exc)
+
+    def _fail(self, exc: BaseException) -> None:
+        # Ein defekter Log soll die Verarbeitung nicht anhalten; weitere
+        # Zeilen werden verworfen, der Fehler bleibt in ``error`` sichtbar.
+        self.error = exc
+        print(f"[CSV-Log] Schreiben nach {self.path} fehlgeschlagen: {exc}", file=sys.stderr)
+
+
+__all__ = ["CsvLogSink"]
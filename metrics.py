@@ -0,0 +1,216 @@
+"""Prometheus-Metriken für den Hotfolder (nur Standardbibliothek).
+
+:class:`Metrics` zählt Dokumente je Status und Textmethode, führt
+Histogramme für die Stufenzeiten (aus :mod:`timings`) und die Latenz vom
+Eintreffen bis zur Ablage und fragt Stauwerte (Dateien im Eingang, in
+Arbeit) erst beim Abruf ab. :func:`serve` stellt ``/metrics`` im
+Textformat 0.0.4 per ``http.server`` in einem Daemon-Thread bereit.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Sekunden; grob genug für Regex-Stufen bis hin zu mehrseitiger OCR
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+_MAX_ARRIVALS = 10000
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+        self.total += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        sep = "," if labels else ""
+        out = [
+            f'{name}_bucket{{{labels}{sep}le="{_fmt(bound)}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        out.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        out.append(f"{name}_sum{suffix} {_fmt(self.total)}")
+        out.append(f"{name}_count{suffix} {self.count}")
+        return out
+
+
+class Metrics:
+    """Sammelt Hotfolder-Kennzahlen; alle Methoden sind threadsicher."""
+
+    def __init__(
+        self,
+        *,
+        inbox: Optional[Path] = None,
+        in_flight: Optional[Callable[[], int]] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.inbox = inbox
+        self.in_flight = in_flight
+        self.buckets = tuple(buckets)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._documents: Dict[str, int] = {}
+        self._methods: Dict[str, int] = {}
+        self._stages: Dict[str, _Histogram] = {}
+        self._latency = _Histogram(self.buckets)
+        self._arrivals: Dict[str, float] = {}
+        self._last_success = 0.0
+        self._started = clock()
+
+    def arrived(self, pdf: Path) -> None:
+        """Merkt den Eingang (Zeitpunkt des Hineinlegens laut Dateisystem) vor."""
+
+        key = str(pdf)
+        try:
+            st = os.stat(pdf)
+            stamp = max(st.st_mtime, st.st_ctime)
+        except OSError:
+            stamp = self._clock()
+        with self._lock:
+            if len(self._arrivals) >= _MAX_ARRIVALS:  # verschwundene Dateien nicht ewig merken
+                self._arrivals.pop(next(iter(self._arrivals)))
+            self._arrivals.setdefault(key, min(stamp, self._clock()))
+
+    def done(self, pdf: Path, status: str, method: Optional[str] = None) -> None:
+        """Verbucht ein abgelegtes (oder fehlgeschlagenes) Dokument."""
+
+        now = self._clock()
+        with self._lock:
+            status = status or "unknown"
+            self._documents[status] = self._documents.get(status, 0) + 1
+            if method:
+                self._methods[method] = self._methods.get(method, 0) + 1
+            arrival = self._arrivals.pop(str(pdf), None)
+            if arrival is not None:
+                self._latency.observe(max(0.0, now - arrival))
+            if status != "fail":
+                self._last_success = now
+
+    def observe_stages(self, source: str, timings_ms: Mapping[str, float]) -> None:
+        """Hook für :func:`timings.add_hook` – füllt die Stufen-Histogramme."""
+
+        with self._lock:
+            for stage, value in timings_ms.items():
+                histogram = self._stages.get(stage)
+                if histogram is None:
+                    histogram = self._stages[stage] = _Histogram(self.buckets)
+                histogram.observe(float(value) / 1000)
+
+    def _backlog(self) -> int:
+        if self.inbox is None:
+            return 0
+        try:
+            with os.scandir(self.inbox) as entries:
+                return sum(
+                    1 for entry in entries if entry.name.lower().endswith(".pdf") and entry.is_file()
+                )
+        except OSError:
+            return 0
+
+    def render(self) -> str:
+        """Alle Metriken im Prometheus-Textformat."""
+
+        backlog = self._backlog()
+        in_flight = self.in_flight() if self.in_flight is not None else 0
+        with self._lock:
+            lines = [
+                "# HELP hotfolder_documents_total Abgelegte Dokumente je Status.",
+                "# TYPE hotfolder_documents_total counter",
+            ]
+            for status in sorted(set(self._documents) | {"ok", "needs_review", "fail"}):
+                lines.append(
+                    f'hotfolder_documents_total{{status="{_escape(status)}"}} {self._documents.get(status, 0)}'
+                )
+            lines += [
+                "# HELP hotfolder_documents_by_method_total Dokumente je Textquelle (text, ocr, text+ocr …).",
+                "# TYPE hotfolder_documents_by_method_total counter",
+            ]
+            for method in sorted(self._methods):
+                lines.append(
+                    f'hotfolder_documents_by_method_total{{method="{_escape(method)}"}} {self._methods[method]}'
+                )
+            lines += [
+                "# HELP hotfolder_stage_duration_seconds Dauer je Verarbeitungsstufe und Dokument.",
+                "# TYPE hotfolder_stage_duration_seconds histogram",
+            ]
+            for stage in sorted(self._stages):
+                lines += self._stages[stage].lines("hotfolder_stage_duration_seconds", f'stage="{_escape(stage)}"')
+            lines += [
+                "# HELP hotfolder_document_latency_seconds Zeit vom Eintreffen im Eingang bis zur Ablage.",
+                "# TYPE hotfolder_document_latency_seconds histogram",
+            ]
+            lines += self._latency.lines("hotfolder_document_latency_seconds", "")
+            lines += [
+                "# HELP hotfolder_inbox_backlog PDFs, die aktuell im Eingang liegen.",
+                "# TYPE hotfolder_inbox_backlog gauge",
+                f"hotfolder_inbox_backlog {backlog}",
+                "# HELP hotfolder_in_flight Angenommene, noch nicht abgelegte Dokumente.",
+                "# TYPE hotfolder_in_flight gauge",
+                f"hotfolder_in_flight {in_flight}",
+                "# HELP hotfolder_last_success_timestamp_seconds Unix-Zeit der letzten erfolgreichen Ablage (0 = nie).",
+                "# TYPE hotfolder_last_success_timestamp_seconds gauge",
+                f"hotfolder_last_success_timestamp_seconds {_fmt(self._last_success)}",
+                "# HELP hotfolder_start_timestamp_seconds Unix-Zeit des Starts.",
+                "# TYPE hotfolder_start_timestamp_seconds gauge",
+                f"hotfolder_start_timestamp_seconds {_fmt(self._started)}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def serve(metrics: Metrics, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+    """Startet den HTTP-Endpunkt ``/metrics`` in einem Daemon-Thread."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server-API
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            return  # kein Zugriffslog auf stdout
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+__all__ = ["DEFAULT_BUCKETS", "Metrics", "serve"]
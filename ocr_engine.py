@@ -0,0 +1,253 @@
+"""OCR-Backends: pytesseract (je Seite ein Prozess) oder tesserocr (im Prozess).
+
+``pytesseract`` startet für jede Seite ein ``tesseract``-Programm, schreibt
+das Bild in eine temporäre Datei und lädt die Sprachmodelle neu. Mit
+``tesserocr`` bleibt die Engine samt ``deu+eng``-Modellen im Prozess
+geladen: :class:`TesserocrEngine` hält je Sprache einen kleinen Vorrat an
+``PyTessBaseAPI``-Instanzen, die über Seiten, Dokumente und OCR-Threads
+hinweg wiederverwendet werden (eine Instanz ist nicht threadsicher, darum
+nie zwei Threads auf derselben).
+
+``ocr_backend`` in ``config.yaml``: ``auto`` (tesserocr, falls installiert
+und startfähig, sonst pytesseract), ``tesserocr`` oder ``pytesseract``. :func:`use` wählt
+das Backend je Dokument, :func:`current` liefert es an die OCR-Funktionen.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+BACKENDS = ("auto", "tesserocr", "pytesseract")
+
+_PSM_AUTO = 3  # Tesseract-Standard (tesserocr.PSM.AUTO)
+
+
+def data_to_text(data: Mapping[str, Sequence[object]]) -> Tuple[str, float]:
+    """Text aus ``image_to_data`` (Zeilen/Absätze wie ``image_to_string``) und Konfidenz.
+
+    Die Konfidenz ist das nach Wortlänge gewichtete Mittel (0–100); ohne
+    erkannte Wörter 0, damit die Seite in der nächsten Stufe gelesen wird.
+    """
+
+    lines: List[str] = []
+    words: List[str] = []
+    current: Optional[Tuple[object, object, object]] = None
+    weighted = 0.0
+    weight = 0
+    for idx, raw in enumerate(data.get("text", ())):
+        word = str(raw or "").strip()
+        if not word:
+            continue
+        line = (data["block_num"][idx], data["par_num"][idx], data["line_num"][idx])
+        if line != current:
+            if words:
+                lines.append(" ".join(words))
+            if current is not None and line[:2] != current[:2]:
+                lines.append("")  # neuer Absatz
+            words = []
+            current = line
+        words.append(word)
+        try:
+            conf = float(data["conf"][idx])  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            continue
+        if conf >= 0:
+            weighted += conf * len(word)
+            weight += len(word)
+    if words:
+        lines.append(" ".join(words))
+    return "\n".join(lines), (weighted / weight if weight else 0.0)
+
+
+class PytesseractEngine:
+    """Bisheriger Weg: ein ``tesseract``-Aufruf je Bild."""
+
+    name = "pytesseract"
+
+    def read(
+        self, image: object, lang: str, *, psm: Optional[int] = None, with_confidence: bool = False
+    ) -> Tuple[str, Optional[float]]:
+        import pytesseract  # type: ignore
+
+        config = f"--psm {psm}" if psm is not None else ""
+        if not with_confidence:
+            return pytesseract.image_to_string(image, lang=lang, config=config) or "", None
+        data = pytesseract.image_to_data(image, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+        return data_to_text(data)
+
+    def close(self) -> None:
+        return None
+
+
+class _AutoEngine:
+    """``ocr_backend: auto``: tesserocr, bis eine Engine nicht startet – dann pytesseract.
+
+    Typisch, wenn nur ``tesseract_cmd`` gesetzt ist und tesserocr die
+    Sprachdaten (``tessdata``/``TESSDATA_PREFIX``) nicht findet; ohne den
+    Wechsel kämen alle OCR-Seiten still leer zurück.
+    """
+
+    def __init__(self, preferred: "TesserocrEngine", fallback: PytesseractEngine) -> None:
+        self._preferred = preferred
+        self._fallback = fallback
+        self._failed = False
+
+    @property
+    def name(self) -> str:
+        return self._fallback.name if self._failed else self._preferred.name
+
+    def read(
+        self, image: object, lang: str, *, psm: Optional[int] = None, with_confidence: bool = False
+    ) -> Tuple[str, Optional[float]]:
+        if not self._failed:
+            try:
+                api = self._preferred._acquire(lang)
+            except Exception as exc:
+                if not self._failed:
+                    self._failed = True
+                    print(f"[OCR] tesserocr startet nicht ({exc}) – nutze pytesseract", file=sys.stderr)
+            else:
+                self._preferred._release(lang, api)
+                return self._preferred.read(image, lang, psm=psm, with_confidence=with_confidence)
+        return self._fallback.read(image, lang, psm=psm, with_confidence=with_confidence)
+
+    def close(self) -> None:
+        self._preferred.close()
+
+
+class TesserocrEngine:
+    """Hält ``PyTessBaseAPI``-Instanzen je Sprache geladen und verleiht sie."""
+
+    name = "tesserocr"
+
+    def __init__(self, tessdata: Optional[str] = None, api_factory: Optional[Callable[[str], object]] = None) -> None:
+        self.tessdata = tessdata
+        self._factory = api_factory or self._create
+        self._idle: Dict[str, List[object]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _create(self, lang: str) -> object:
+        import tesserocr  # type: ignore
+
+        kwargs: Dict[str, object] = {"lang": lang}
+        if self.tessdata:
+            kwargs["path"] = self.tessdata
+        return tesserocr.PyTessBaseAPI(**kwargs)
+
+    def _acquire(self, lang: str) -> object:
+        with self._lock:
+            idle = self._idle.get(lang)
+            if idle:
+                return idle.pop()
+        api = self._factory(lang)  # Modelle laden dauert – außerhalb des Locks
+        with self._lock:
+            self.created += 1
+        return api
+
+    def _release(self, lang: str, api: object) -> None:
+        with self._lock:
+            self._idle.setdefault(lang, []).append(api)
+
+    def read(
+        self, image: object, lang: str, *, psm: Optional[int] = None, with_confidence: bool = False
+    ) -> Tuple[str, Optional[float]]:
+        api = self._acquire(lang)
+        try:
+            api.SetPageSegMode(psm if psm is not None else _PSM_AUTO)  # type: ignore[attr-defined]
+            api.SetImage(image)  # type: ignore[attr-defined]
+            text = api.GetUTF8Text() or ""  # type: ignore[attr-defined]
+            confidence = float(api.MeanTextConf()) if with_confidence else None  # type: ignore[attr-defined]
+            return text, confidence
+        finally:
+            self._release(lang, api)
+
+    def close(self) -> None:
+        with self._lock:
+            apis = [api for idle in self._idle.values() for api in idle]
+            self._idle = {}
+        for api in apis:
+            try:
+                api.End()  # type: ignore[attr-defined]
+            except Exception:
+                pass
+
+
+def tesserocr_available() -> bool:
+    try:
+        return find_spec("tesserocr") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _tessdata_for(cfg: Mapping[str, object]) -> Optional[str]:
+    """``tessdata_path`` oder ``tessdata`` neben ``tesseract_cmd`` (Windows-Installation)."""
+
+    explicit = str(cfg.get("tessdata_path") or "").strip()
+    if explicit:
+        return explicit
+    cmd = str(cfg.get("tesseract_cmd") or "").strip()
+    if cmd:
+        candidate = Path(cmd).expanduser().parent / "tessdata"
+        if candidate.is_dir():
+            return str(candidate)
+    return None
+
+
+_ENGINES: Dict[Tuple[int, str, Optional[str]], object] = {}
+_CURRENT: Optional[object] = None
+_WARNED = False
+
+
+def get_engine(backend: str = "auto", tessdata: Optional[str] = None):
+    """Engine für ``backend`` (je Prozess geteilt); fehlt tesserocr, dann pytesseract."""
+
+    global _WARNED
+    backend = str(backend or "auto").strip().lower()
+    if backend not in BACKENDS:
+        backend = "auto"
+    if backend in ("auto", "tesserocr") and not tesserocr_available():
+        if backend == "tesserocr" and not _WARNED:
+            print("[OCR] tesserocr nicht installiert – nutze pytesseract", file=sys.stderr)
+            _WARNED = True
+        backend = "pytesseract"
+    key = (os.getpid(), backend, tessdata if backend != "pytesseract" else None)
+    engine = _ENGINES.get(key)
+    if engine is None:
+        if backend == "pytesseract":
+            engine = PytesseractEngine()
+        elif backend == "tesserocr":
+            engine = TesserocrEngine(tessdata)
+        else:
+            engine = _AutoEngine(TesserocrEngine(tessdata), get_engine("pytesseract"))
+        _ENGINES[key] = engine
+    return engine
+
+
+def use(cfg: Mapping[str, object]):
+    """Wählt das Backend gemäß ``ocr_backend``/``tessdata_path`` für die folgenden Seiten."""
+
+    global _CURRENT
+    _CURRENT = get_engine(str(cfg.get("ocr_backend") or "auto"), _tessdata_for(cfg))
+    return _CURRENT
+
+
+def current():
+    return _CURRENT if _CURRENT is not None else get_engine("auto")
+
+
+__all__ = [
+    "BACKENDS",
+    "PytesseractEngine",
+    "TesserocrEngine",
+    "current",
+    "data_to_text",
+    "get_engine",
+    "tesserocr_available",
+    "use",
+]
@@ -0,0 +1,232 @@
+"""Profilierung einzelner Dokumente mit cProfile und tracemalloc.
+
+:class:`DocumentProfiler` misst je ausgewähltem Dokument (``sample_rate``,
+z. B. ``0.05`` = jedes zwanzigste) die Funktionszeiten per cProfile und
+optional den Speicher-Spitzenwert per tracemalloc. Je Dokument entstehen
+im Zielordner ``<stamp>_<stem>.prof`` (für ``pstats``/snakeviz) und
+``<stamp>_<stem>.mem.txt``; ``profiles.jsonl`` führt Buch über alle Läufe,
+auch aus mehreren Prozessen. :func:`write_report` fasst sie zu einer
+Top‑N‑Liste der heißesten Funktionen zusammen.
+
+Aufruf für einen Bericht über einen vorhandenen Ordner:
+``python profiling.py logs/profile [--top 30] [--since 2024-05-01T08:00]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+PathLike = Union[str, os.PathLike]
+
+INDEX_NAME = "profiles.jsonl"
+
+_ACTIVE = threading.Lock()  # je Prozess nur ein aktiver cProfile-Lauf
+
+
+class DocumentProfiler:
+    """Profiliert jedes n-te Dokument und legt die Rohdaten in ``directory`` ab."""
+
+    def __init__(
+        self,
+        directory: PathLike,
+        *,
+        sample_rate: float = 1.0,
+        memory: bool = True,
+        memory_top: int = 15,
+    ) -> None:
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self.memory = memory
+        self.memory_top = memory_top
+        self._credit = 1.0 - self.sample_rate  # erstes Dokument immer messen
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _due(self) -> bool:
+        with self._lock:
+            self._credit += self.sample_rate
+            if self.sample_rate <= 0 or self._credit < 1.0 - 1e-9:
+                return False
+            self._credit -= 1.0
+            self._seq += 1
+            return True
+
+    @contextmanager
+    def document(self, source: PathLike) -> Iterator[bool]:
+        """Misst den umschlossenen Block, falls das Dokument zur Stichprobe gehört."""
+
+        if not self._due():
+            yield False
+            return
+        if not _ACTIVE.acquire(blocking=False):
+            yield False  # anderes Dokument wird gerade gemessen
+            return
+        own_trace = False
+        if self.memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start(10)
+                own_trace = True
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                yield True
+            finally:
+                profile.disable()
+                wall_ms = (time.perf_counter() - start) * 1000
+                peak = tracemalloc.get_traced_memory()[1] if self.memory else None
+                snapshot = tracemalloc.take_snapshot() if self.memory else None
+                if own_trace:
+                    tracemalloc.stop()
+                self._write(Path(source), profile, wall_ms, peak, snapshot)
+        finally:
+            _ACTIVE.release()
+
+    def _write(
+        self,
+        source: Path,
+        profile: cProfile.Profile,
+        wall_ms: float,
+        peak: Optional[int],
+        snapshot: Optional[tracemalloc.Snapshot],
+    ) -> None:
+        stem = re.sub(r"[^\w.-]+", "_", source.stem)[:60] or "dokument"
+        name = f"{datetime.now():%Y%m%d-%H%M%S}_{os.getpid()}_{self._seq}_{stem}"
+        try:
+            prof_path = self.directory / f"{name}.prof"
+            profile.dump_stats(str(prof_path))
+            entry: Dict[str, object] = {
+                "ts": time.time(),
+                "source": str(source),
+                "profile": prof_path.name,
+                "wall_ms": round(wall_ms, 3),
+            }
+            if snapshot is not None:
+                mem_path = self.directory / f"{name}.mem.txt"
+                lines = [f"# {source}", f"peak_kib: {peak / 1024:.1f}" if peak is not None else ""]
+                for stat in snapshot.statistics("lineno")[: self.memory_top]:
+                    lines.append(str(stat))
+                mem_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+                entry["memory"] = mem_path.name
+                entry["peak_kib"] = round((peak or 0) / 1024, 1)
+            # eine kurze Zeile je Dokument; O_APPEND hält parallele Prozesse auseinander
+            with (self.directory / INDEX_NAME).open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as exc:
+            print(f"[Profil] Schreiben fehlgeschlagen ({source.name}): {exc}", file=sys.stderr)
+
+
+_PROFILERS: Dict[Tuple[int, str], DocumentProfiler] = {}
+
+
+def get_profiler(cfg: Mapping[str, object]) -> Optional[DocumentProfiler]:
+    """Profiler gemäß ``profile_dir``/``profile_sample`` (je Prozess geteilt)."""
+
+    raw = str(cfg.get("profile_dir") or "").strip()
+    if not raw:
+        return None
+    key = (os.getpid(), str(Path(raw).expanduser()))
+    profiler = _PROFILERS.get(key)
+    if profiler is None:
+        try:
+            rate = float(cfg.get("profile_sample", 1.0))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            rate = 1.0
+        profiler = DocumentProfiler(key[1], sample_rate=rate, memory=bool(cfg.get("profile_memory", True)))
+        _PROFILERS[key] = profiler
+    return profiler
+
+
+def _entries(directory: Path, since: Optional[float]) -> List[Dict[str, object]]:
+    index = directory / INDEX_NAME
+    if not index.exists():
+        return []
+    entries = []
+    for line in index.read_text(encoding="utf-8").splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # abgebrochene Zeile nach Absturz
+        if since is None or float(entry.get("ts", 0)) >= since:
+            entries.append(entry)
+    return entries
+
+
+def report(directory: PathLike, *, since: Optional[float] = None, top: int = 30) -> Optional[str]:
+    """Top‑N‑Funktionen und Speicherspitzen über alle Profile seit ``since``."""
+
+    directory = Path(directory).expanduser()
+    entries = [e for e in _entries(directory, since) if (directory / str(e["profile"])).exists()]
+    if not entries:
+        return None
+    stats = pstats.Stats(*(str(directory / str(e["profile"])) for e in entries), stream=io.StringIO())
+    stats.files = []  # keine Liste aller Eingabedateien im Kopf
+
+    out = io.StringIO()
+    stats.stream = out
+    total_ms = sum(float(e.get("wall_ms", 0)) for e in entries)
+    out.write(
+        f"Profilbericht {datetime.now().isoformat(timespec='seconds')}: {len(entries)} Dokumente, "
+        f"{total_ms / 1000:.2f} s gemessen, Ø {total_ms / len(entries):.1f} ms\n\n"
+    )
+    out.write(f"== Top {top} nach kumulierter Zeit ==\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    out.write(f"\n== Top {top} nach Eigenzeit ==\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    peaks = sorted((e for e in entries if "peak_kib" in e), key=lambda e: -float(e["peak_kib"]))
+    if peaks:
+        out.write("\n== Speicher-Spitzen (tracemalloc) ==\n")
+        for entry in peaks[:top]:
+            out.write(f"{float(entry['peak_kib']):>12.1f} KiB  {entry['source']}  ({entry.get('memory')})\n")
+    return out.getvalue()
+
+
+def write_report(directory: PathLike, *, since: Optional[float] = None, top: int = 30) -> Optional[Path]:
+    """Schreibt :func:`report` nach ``report_<stamp>.txt``; ``None`` ohne Profile."""
+
+    text = report(directory, since=since, top=top)
+    if text is None:
+        return None
+    path = Path(directory).expanduser() / f"report_{datetime.now():%Y%m%d-%H%M%S}.txt"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Fasst Dokument-Profile zu einem Top-N-Bericht zusammen.")
+    ap.add_argument("directory", type=Path)
+    ap.add_argument("--top", type=int, default=30)
+    ap.add_argument("--since", help="nur Profile ab diesem Zeitpunkt (ISO, z. B. 2024-05-01T08:00)")
+    args = ap.parse_args(argv)
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    text = report(args.directory, since=since, top=args.top)
+    if text is None:
+        print(f"Keine Profile in {args.directory}", file=sys.stderr)
+        return 1
+    print(text)
+    return 0
+
+
+__all__ = ["DocumentProfiler", "INDEX_NAME", "get_profiler", "main", "report", "write_report"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""Indizierte Ergebnis-Datenbank (SQLite) für sortierte Rechnungen.
+
+``process_pdf`` trägt jedes abgelegte Dokument ein, ``process_all`` und der
+Hotfolder zusätzlich Fehlschläge. Indizes auf Inhalts-Hash,
+(Lieferant, Rechnungsnummer), Rechnungsdatum und Status machen Fragen wie
+„Haben wir Rechnung 2024/123456 von CT-Bauprofi schon?“ zu einer
+Index-Abfrage statt eines Durchlaufs durch ``processed.csv``. Die CSV bleibt
+als Export erhalten (:meth:`ResultStore.export_csv`); alte CSV-Logs beider
+Kopf-Varianten lassen sich mit :meth:`ResultStore.import_csv` übernehmen.
+
+Abfrage auf der Konsole::
+
+    python results.py logs/results.sqlite --supplier CT-Bauprofi --invoice-no 2024/123456
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+PathLike = Union[str, os.PathLike]
+
+# Spalten der Tabelle in Export-Reihenfolge (wie der CSV-Log, plus Hash)
+COLUMNS: List[str] = [
+    "timestamp",
+    "source",
+    "destination",
+    "invoice_no",
+    "supplier",
+    "invoice_date",
+    "status",
+    "total_gross",
+    "total_net",
+    "tax_amount",
+    "content_hash",
+    "simulate",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    source TEXT,
+    destination TEXT,
+    invoice_no TEXT,
+    supplier TEXT,
+    invoice_date TEXT,
+    status TEXT,
+    total_gross TEXT,
+    total_net TEXT,
+    tax_amount TEXT,
+    content_hash TEXT,
+    simulate INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_results_hash ON results(content_hash);
+CREATE INDEX IF NOT EXISTS idx_results_invoice ON results(supplier COLLATE NOCASE, invoice_no COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_results_date ON results(invoice_date);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results(status);
+"""
+
+# Ältester Log-Kopf (kommagetrennt) → heutige Spaltennamen
+_LEGACY_COLUMNS = {
+    "source_file": "source",
+    "target_file": "destination",
+    "date": "invoice_date",
+}
+
+
+def _text(value: object) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _row_from_result(result: Mapping[str, object], timestamp: Optional[str]) -> Dict[str, object]:
+    return {
+        "timestamp": timestamp or datetime.now().isoformat(timespec="seconds"),
+        "source": _text(result.get("source")),
+        "destination": _text(result.get("destination") or result.get("target_path")),
+        "invoice_no": _text(result.get("invoice_no")),
+        "supplier": _text(result.get("supplier")),
+        "invoice_date": _text(result.get("invoice_date")),
+        "status": _text(result.get("validation_status") or result.get("status")),
+        "total_gross": _text(result.get("total_gross")),
+        "total_net": _text(result.get("total_net")),
+        "tax_amount": _text(result.get("tax_amount")),
+        "content_hash": _text(result.get("content_hash")),
+        "simulate": 1 if result.get("simulate") else 0,
+    }
+
+
+class ResultStore:
+    """SQLite-Datenbank (WAL) mit einer Zeile je verarbeitetem Dokument."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _insert(self, rows: Iterable[Mapping[str, object]]) -> int:
+        sql = f"INSERT INTO results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+        with self._lock:
+            cursor = self._conn.executemany(sql, ([row[col] for col in COLUMNS] for row in rows))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def record(self, result: Mapping[str, object], *, timestamp: Optional[str] = None) -> None:
+        """Trägt ein Ergebnis von ``process_pdf`` (oder einen Fehlschlag) ein."""
+
+        self._insert([_row_from_result(result, timestamp)])
+
+    def find(
+        self,
+        *,
+        supplier: Optional[str] = None,
+        invoice_no: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        include_simulated: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, object]]:
+        """Sucht Einträge; Lieferant und Nummer ohne Beachtung der Groß-/Kleinschreibung."""
+
+        clauses: List[str] = []
+        params: List[object] = []
+        if supplier is not None:
+            clauses.append("supplier = ? COLLATE NOCASE")
+            params.append(supplier)
+        if invoice_no is not None:
+            clauses.append("invoice_no = ? COLLATE NOCASE")
+            params.append(invoice_no)
+        if content_hash is not None:
+            clauses.append("content_hash = ?")
+            params.append(content_hash)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if date_from is not None:
+            clauses.append("invoice_date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("invoice_date <= ?")
+            params.append(date_to)
+        if not include_simulated:
+            clauses.append("simulate = 0")
+        sql = f"SELECT {', '.join(COLUMNS)} FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def original(
+        self,
+        *,
+        content_hash: Optional[str] = None,
+        supplier: Optional[str] = None,
+        invoice_no: Optional[str] = None,
+    ) -> Optional[Dict[str, object]]:
+        """Erste echte Ablage (kein Trockenlauf, Fehlschlag oder Duplikat) zu Hash bzw. Rechnung."""
+
+        if content_hash is not None:
+            where, params = "content_hash = ?", [content_hash]
+        elif supplier and invoice_no:
+            where = "supplier = ? COLLATE NOCASE AND invoice_no = ? COLLATE NOCASE"
+            params = [supplier, invoice_no]
+        else:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM results WHERE {where}"
+                " AND simulate = 0 AND status IN ('ok', 'needs_review') ORDER BY id LIMIT 1",
+                params,
+            ).fetchone()
+        return dict(row) if row else None
+
+    def export_csv(self, path: PathLike) -> int:
+        """Schreibt alle Einträge (älteste zuerst) als ``;``-getrennte CSV."""
+
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM results ORDER BY id").fetchall()
+        target = Path(path).expanduser()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle, delimiter=";")
+            writer.writerow(COLUMNS)
+            writer.writerows(tuple(row) for row in rows)
+        return len(rows)
+
+    def import_csv(self, path: PathLike) -> int:
+        """Übernimmt einen alten CSV-Log (``;``- oder ältere ``,``-Variante).
+
+        Eine Datei kann beide Varianten mischen; Kopfzeilen mitten in der
+        Datei schalten das Spaltenschema um.
+        """
+
+        rows: List[Dict[str, object]] = []
+        # Je Trennzeichen ein eigener Kopf; ``;``-Zeilen ohne Kopf folgen COLUMNS
+        headers: Dict[str, List[str]] = {";": COLUMNS, ",": []}
+        with Path(path).expanduser().open("r", encoding="utf-8", newline="") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                delimiter = ";" if ";" in line else ","
+                values = next(csv.reader([line], delimiter=delimiter))
+                if values and values[0] == "timestamp":
+                    headers[delimiter] = [_LEGACY_COLUMNS.get(name, name) for name in values]
+                    continue
+                header = headers[delimiter]
+                if not header:
+                    continue
+                record = dict(zip(header, values))
+                if record.get("method") == "dry":
+                    record["simulate"] = True
+                rows.append(_row_from_result(record, _text(record.get("timestamp"))))
+        return self._insert(rows) if rows else 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Abfrage der Ergebnis-Datenbank")
+    ap.add_argument("db", help="Pfad zur Datenbank (result_db_path)")
+    ap.add_argument("--supplier", help="Lieferant (Ordnername)")
+    ap.add_argument("--invoice-no", help="Rechnungsnummer")
+    ap.add_argument("--hash", dest="content_hash", help="Inhalts-Hash (SHA-256)")
+    ap.add_argument("--status", help="ok, needs_review oder fail")
+    ap.add_argument("--from", dest="date_from", help="Rechnungsdatum ab (JJJJ-MM-TT)")
+    ap.add_argument("--to", dest="date_to", help="Rechnungsdatum bis (JJJJ-MM-TT)")
+    ap.add_argument("--no-simulated", action="store_true", help="Trockenläufe ausblenden")
+    ap.add_argument("--limit", type=int, default=50, help="Maximale Trefferzahl (0 = alle)")
+    ap.add_argument("--export", metavar="CSV", help="Alle Einträge als CSV exportieren")
+    ap.add_argument("--import-csv", metavar="CSV", help="Alten CSV-Log übernehmen")
+    args = ap.parse_args(argv)
+
+    store = ResultStore(args.db)
+    try:
+        if args.import_csv:
+            print(f"{store.import_csv(args.import_csv)} Zeile(n) aus {args.import_csv} übernommen.")
+        if args.export:
+            print(f"{store.export_csv(args.export)} Zeile(n) nach {args.export} exportiert.")
+        if args.import_csv or args.export:
+            return 0
+        rows = store.find(
+            supplier=args.supplier,
+            invoice_no=args.invoice_no,
+            content_hash=args.content_hash,
+            status=args.status,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            include_simulated=not args.no_simulated,
+            limit=args.limit or None,
+        )
+        writer = csv.writer(sys.stdout, delimiter=";")
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow([row[col] for col in COLUMNS])
+        return 0 if rows else 1
+    finally:
+        store.close()
+
+
+__all__ = ["COLUMNS", "ResultStore"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
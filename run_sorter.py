@@ -1,10 +1,42 @@
-import sys
+import argparse
+
 import sorter
 
 def main():
-    cfg_path = sys.argv[1] if len(sys.argv) > 1 else "config.yaml"
-    pat_path = sys.argv[2] if len(sys.argv) > 2 else "patterns.yaml"
-    sorter.process_all(cfg_path, pat_path)
+    ap = argparse.ArgumentParser(description="Sortiert alle PDFs aus input_dir.")
+    ap.add_argument("config", nargs="?", default="config.yaml")
+    ap.add_argument("patterns", nargs="?", default="patterns.yaml")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Anzahl paralleler Analyse-Prozesse (0 = alle Kerne, Standard: jobs aus config.yaml)",
+    )
+    ap.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="cProfile/tracemalloc je Dokument nach DIR schreiben, am Ende Top-N-Bericht",
+    )
+    ap.add_argument(
+        "--profile-sample",
+        type=float,
+        default=1.0,
+        help="Anteil der profilierten Dokumente (z. B. 0.05 = jedes zwanzigste)",
+    )
+    ap.add_argument("--profile-top", type=int, default=30, help="Zeilen im Top-N-Bericht")
+    ap.add_argument("--profile-no-memory", action="store_true", help="ohne tracemalloc (weniger Overhead)")
+    args = ap.parse_args()
+    if not args.profile:
+        sorter.process_all(args.config, args.patterns, jobs=args.jobs)
+        return
+    cfg = sorter.load_config(args.config)
+    cfg.update(
+        profile_dir=args.profile,
+        profile_sample=args.profile_sample,
+        profile_top=args.profile_top,
+        profile_memory=not args.profile_no_memory,
+    )
+    sorter.process_all(config=cfg, patterns_path=args.patterns, jobs=args.jobs)
 
 if __name__ == "__main__":
     main()
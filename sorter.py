@@ -1,47 +1,156 @@
 from __future__ import annotations
 
-import csv
+import contextvars
+import errno
+import hashlib
 import os
 import re
 import shutil
-from dataclasses import dataclass
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+try:  # Python >= 3.11
+    from re import _parser as _sre_parse
+except ImportError:  # pragma: no cover - ältere Interpreter
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
 
 try:
     import yaml  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     yaml = None  # type: ignore
 
+import ocr_engine
+from log_sink import CsvLogSink
+from results import ResultStore
+from text_cache import TextCache, make_key as _make_cache_key
+from timings import (
+    STAGES as TIMING_STAGES,
+    collect as _collect_timings,
+    emit as _emit_timings,
+    enabled as _timings_enabled,
+    stage as _stage,
+)
+
 PathLike = Union[str, os.PathLike[str]]
 
-DEFAULT_CONFIG: Dict[str, Union[str, bool]] = {
+DEFAULT_CONFIG: Dict[str, Union[str, bool, int]] = {
     "input_dir": "inbox",
     "output_dir": "processed",
     "unknown_dir_name": "unbekannt",
     "tesseract_cmd": "",
     "poppler_path": "",
     "tesseract_lang": "deu+eng",
+    "ocr_backend": "auto",
+    "tessdata_path": "",
     "use_ocr": True,
     "dry_run": False,
     "csv_log_path": "",
+    "csv_flush_rows": 50,
+    "csv_flush_seconds": 2,
+    "csv_max_mb": 0,
+    "result_db_path": "",
+    "duplicate_action": "off",
+    "duplicates_dir_name": "duplicates",
+    "flag_semantic_duplicates": False,
+    "stage_timings": False,
+    "profile_dir": "",
+    "profile_sample": 1.0,
+    "profile_memory": True,
+    "profile_top": 30,
+    "warmup": False,
     "output_filename_format": "{date}_{supplier}_{invoice_no}.pdf",
+    "jobs": 1,
+    "text_cache_path": "",
+    "text_cache_max_mb": 512,
+    "ocr_workers": 0,
+    "ocr_pages": "first:5",
+    "ocr_min_page_chars": 20,
+    "ocr_dpi": [200, 300],
+    "ocr_min_confidence": 70,
+    "ocr_zone_first": False,
+    "ocr_zones": {"header": [0.0, 0.0, 1.0, 0.15], "address": [0.0, 0.15, 1.0, 0.4]},
+    "ocr_zone_psm": 6,
+    "incremental_extraction": False,
+    "extraction_max_pages": 0,
+    "extraction_max_chars": 0,
 }
 
+_OCR_DPI = 300
+# Auflösungsstufen: erst grob lesen, nur unsichere Seiten feiner rendern
+_OCR_DPI_LADDER: Tuple[int, ...] = (200, 300)
+_OCR_MIN_CONFIDENCE = 70.0
+_OCR_MAX_PAGES = 5
+_OCR_PAGE_POLICY = "first:5"
+_OCR_MIN_PAGE_CHARS = 20
+# darunter gilt das ganze Dokument als textlos: alle ausgewählten Seiten per OCR
+_MIN_TEXT_LENGTH = 50
+# Zeichen der Vorseite, die bei der seitenweisen Feldsuche mitgeprüft werden
+_PAGE_OVERLAP_CHARS = 200
+
+# Wie oft (Sekunden) process_all beim Warten auf Worker stop_fn abfragt.
+_STOP_POLL_INTERVAL = 0.2
+
 DEFAULT_PATTERNS: Dict[str, object] = {
     "invoice_number_patterns": [],
     "date_patterns": [],
+    "total_gross_patterns": [],
+    "total_net_patterns": [],
+    "tax_amount_patterns": [],
     "supplier_hints": {},
+    # Lieferant -> eigene OCR-Zonen (aus patterns/suppliers/*.yaml, Schlüssel ocr_zones)
+    "supplier_ocr_zones": {},
 }
 
+# Spalten des CSV-Logs von process_all (Beträge normalisiert, z. B. "1234.56";
+# Stufenzeiten in ms, leer ohne ``stage_timings``)
+CSV_COLUMNS: List[str] = [
+    "timestamp",
+    "source",
+    "destination",
+    "invoice_no",
+    "supplier",
+    "invoice_date",
+    "status",
+    "total_gross",
+    "total_net",
+    "tax_amount",
+] + [f"time_{name}_ms" for name in TIMING_STAGES]
+
 
 @dataclass
 class ExtractionResult:
     text: str
     method: str
     page_count: int
+    # Text je Seite (falls die Quelle seitenweise liest) und ob die Seite
+    # Bilder enthält – leer, wenn unbekannt.
+    pages: List[str] = field(default_factory=list)
+    page_has_images: List[bool] = field(default_factory=list)
+    # Seite -> DPI, mit der die OCR-Seite gelesen wurde
+    ocr_dpi: Dict[int, int] = field(default_factory=dict)
 
 
 def _read_yaml(path: PathLike) -> Dict[str, object]:
@@ -72,12 +181,34 @@ def load_config(config_like: Union[None, PathLike, Mapping[str, object]]) -> Dic
             continue
         cfg[key] = value
     # Strings bereinigen
-    for key in ("tesseract_cmd", "poppler_path", "unknown_dir_name", "csv_log_path", "output_filename_format"):
+    for key in (
+        "tesseract_cmd",
+        "tessdata_path",
+        "ocr_backend",
+        "poppler_path",
+        "unknown_dir_name",
+        "csv_log_path",
+        "output_filename_format",
+        "text_cache_path",
+        "result_db_path",
+        "duplicate_action",
+        "duplicates_dir_name",
+        "profile_dir",
+    ):
         if key in cfg and isinstance(cfg[key], str):
             cfg[key] = cfg[key].strip()
+    # Seitenauswahl früh prüfen, statt jede Datei einzeln scheitern zu lassen
+    _select_pages(cfg.get("ocr_pages"), 1)
     return cfg
 
 
+def _int_setting(cfg: Mapping[str, object], key: str, default: int) -> int:
+    try:
+        return int(cfg.get(key, default))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return default
+
+
 def load_patterns(patterns_like: Union[None, PathLike, Mapping[str, object]]) -> Dict[str, object]:
     pats: Dict[str, object] = dict(DEFAULT_PATTERNS)
     if patterns_like is None:
@@ -93,9 +224,202 @@ def load_patterns(patterns_like: Union[None, PathLike, Mapping[str, object]]) ->
         if value is None:
             continue
         pats[key] = value
+    if isinstance(patterns_like, (str, os.PathLike)):
+        zones = _load_supplier_zones(_supplier_dir(Path(patterns_like), data.get("supplier_dir")))
+        if zones:
+            pats["supplier_ocr_zones"] = {**zones, **dict(pats.get("supplier_ocr_zones") or {})}  # type: ignore[arg-type]
     return pats
 
 
+def _supplier_dir(patterns_path: Path, configured: object) -> Path:
+    """Ordner der Lieferantendateien zur Musterdatei ``patterns_path``.
+
+    ``supplier_dir`` (relativ zur Musterdatei) hat Vorrang; sonst ``suppliers``
+    daneben oder – für die ``patterns.yaml`` im Projektordner, die Startskripte,
+    Dockerfile und GUI übergeben – ``patterns/suppliers``.
+    """
+
+    base = patterns_path.parent
+    if configured:
+        return base / str(configured)
+    for candidate in (base / "suppliers", base / "patterns" / "suppliers"):
+        if candidate.is_dir():
+            return candidate
+    return base / "suppliers"
+
+
+# nur ein echter Schlüssel auf oberster Ebene, kein auskommentiertes Beispiel
+_ZONES_KEY_RE = re.compile(r"(?m)^ocr_zones\s*:")
+
+
+def _load_supplier_zones(directory: Path) -> Dict[str, object]:
+    """Liest ``ocr_zones`` aus den Lieferantendateien (``<lieferant>.yaml``).
+
+    Der Lieferantenname kommt aus ``supplier:``, sonst aus der Whitelist der
+    Datei, sonst aus dem Dateinamen (``Deutsche_Bahn`` -> ``Deutsche Bahn``).
+    """
+
+    zones: Dict[str, object] = {}
+    if not directory.is_dir():
+        return zones
+    for path in sorted(directory.glob("*.yaml")):
+        try:
+            if not _ZONES_KEY_RE.search(path.read_text(encoding="utf-8")):
+                continue  # die meisten Dateien haben keine Zonen – YAML nicht parsen
+            data = _read_yaml(path)
+        except Exception as exc:
+            print(f"[Sorter] Lieferantendatei ignoriert – {path.name}: {exc}", file=sys.stderr)
+            continue
+        if not isinstance(data.get("ocr_zones"), Mapping):
+            continue
+        names: List[str] = []
+        if data.get("supplier"):
+            names = [str(data["supplier"])]
+        else:
+            whitelist = (data.get("whitelist") or {}).get("invoice_numbers") or {}  # type: ignore[union-attr]
+            names = [str(name) for name in whitelist] if isinstance(whitelist, Mapping) else []
+        for name in names or [path.stem.replace("_", " ")]:
+            zones[name] = data["ocr_zones"]
+    return zones
+
+
+class CompiledPatterns(Mapping):
+    """Einmal kompilierter Mustersatz aus :func:`load_patterns`.
+
+    Verhält sich lesend wie das zugrundeliegende Mapping (``pats.get(...)``
+    funktioniert weiter), hält aber die Regexe vorkompiliert. Ungültige
+    Muster werden beim Aufbau in ``errors`` gesammelt statt bei jedem
+    Dokument stillschweigend übersprungen.
+    """
+
+    def __init__(self, data: Mapping[str, object]) -> None:
+        self._data: Dict[str, object] = dict(data)
+        self.errors: List[str] = []
+        self._compiled: Dict[str, List[Pattern[str]]] = {}
+        self.invoice_number: List[Pattern[str]] = self._compile_list("invoice_number_patterns")
+        self.date: List[Pattern[str]] = self._compile_list("date_patterns")
+        self.total_gross: List[Pattern[str]] = self._compile_list("total_gross_patterns")
+        self.total_net: List[Pattern[str]] = self._compile_list("total_net_patterns")
+        self.tax_amount: List[Pattern[str]] = self._compile_list("tax_amount_patterns")
+        self.fields = FieldExtractor(
+            {name: self._compiled[key] for name, key in FIELD_PATTERN_KEYS.items()}
+        )
+        hints = self._data.get("supplier_hints") or {}
+        self.supplier_hints: Dict[str, List[str]] = {
+            str(name): [str(k) for k in (keywords or []) if k]
+            for name, keywords in (hints.items() if isinstance(hints, Mapping) else [])
+        }
+        self.supplier_matcher = SupplierMatcher(
+            self.supplier_hints,
+            word_boundary=bool(self._data.get("supplier_word_boundary", False)),
+        )
+        zones = self._data.get("supplier_ocr_zones") or {}
+        self.supplier_zones: Dict[str, object] = {
+            str(name).casefold(): spec for name, spec in (zones.items() if isinstance(zones, Mapping) else [])
+        }
+
+    def _compile_list(self, key: str) -> List[Pattern[str]]:
+        compiled: List[Pattern[str]] = []
+        for pattern in self._data.get(key) or []:
+            try:
+                compiled.append(re.compile(str(pattern), re.IGNORECASE))
+            except re.error as exc:
+                self.errors.append(f"{key}: {pattern!r} ({exc})")
+        self._compiled[key] = compiled
+        return compiled
+
+    def __getitem__(self, key: str) -> object:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledPatterns(invoice_number={len(self.invoice_number)}, date={len(self.date)}, "
+            f"amounts={len(self.total_gross) + len(self.total_net) + len(self.tax_amount)}, "
+            f"suppliers={len(self.supplier_hints)}, errors={len(self.errors)})"
+        )
+
+
+def compile_patterns(patterns_like: Union[None, PathLike, Mapping[str, object]]) -> CompiledPatterns:
+    """Lädt und kompiliert Muster; bereits kompilierte werden durchgereicht."""
+
+    if isinstance(patterns_like, CompiledPatterns):
+        return patterns_like
+    compiled = CompiledPatterns(load_patterns(patterns_like))
+    for error in compiled.errors:
+        print(f"[Sorter] Ungültiges Muster ignoriert – {error}", file=sys.stderr)
+    return compiled
+
+
+def compute_content_hash(pdf_path: PathLike) -> str:
+    """SHA-256 über den Dateiinhalt (blockweise gelesen)."""
+
+    digest = hashlib.sha256()
+    with open(Path(pdf_path), "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_TEXT_CACHES: Dict[Tuple[int, str], TextCache] = {}
+
+
+def get_text_cache(cfg: Mapping[str, object]) -> Optional[TextCache]:
+    """Liefert den Text-Cache gemäß ``text_cache_path`` (je Prozess geteilt)."""
+
+    raw = str(cfg.get("text_cache_path") or "").strip()
+    if not raw:
+        return None
+    path = str(Path(raw).expanduser())
+    # Verbindungen nicht über fork() hinweg teilen (Prozess-Pool in process_all)
+    key = (os.getpid(), path)
+    cache = _TEXT_CACHES.get(key)
+    if cache is None:
+        try:
+            max_mb = float(cfg.get("text_cache_max_mb") or 0)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            max_mb = float(DEFAULT_CONFIG["text_cache_max_mb"])  # type: ignore[arg-type]
+        cache = TextCache(path, max_bytes=int(max_mb * 1024 * 1024))
+        _TEXT_CACHES[key] = cache
+    return cache
+
+
+_RESULT_STORES: Dict[Tuple[int, str], ResultStore] = {}
+
+
+def get_result_store(cfg: Mapping[str, object]) -> Optional[ResultStore]:
+    """Liefert die Ergebnis-Datenbank gemäß ``result_db_path`` (je Prozess geteilt)."""
+
+    raw = str(cfg.get("result_db_path") or "").strip()
+    if not raw:
+        return None
+    key = (os.getpid(), str(Path(raw).expanduser()))
+    store = _RESULT_STORES.get(key)
+    if store is None:
+        store = ResultStore(key[1])
+        _RESULT_STORES[key] = store
+    return store
+
+
+def record_result(cfg: Mapping[str, object], result: Mapping[str, object]) -> None:
+    """Trägt ``result`` in die Ergebnis-Datenbank ein, falls konfiguriert.
+
+    Ein Datenbankfehler wird gemeldet, hält die Ablage aber nicht auf.
+    """
+
+    try:
+        store = get_result_store(cfg)
+        if store is not None:
+            store.record(result)
+    except Exception as exc:
+        print(f"[Sorter] Ergebnis-Datenbank nicht beschreibbar: {exc}", file=sys.stderr)
+
+
 def _sanitize_component(value: Optional[str]) -> str:
     if not value:
         return ""
@@ -120,97 +444,801 @@ def _ensure_filename(name: str) -> str:
     return name or "document.pdf"
 
 
-def _unique_path(directory: Path, filename: str) -> Path:
-    candidate = directory / filename
-    if not candidate.exists():
-        return candidate
-    stem, ext = os.path.splitext(filename)
-    counter = 1
-    while True:
-        alt = directory / f"{stem}_{counter}{ext or '.pdf'}"
-        if not alt.exists():
-            return alt
-        counter += 1
+# Endung der Reservierungs-Platzhalter: erkennbar, kein Dokument mit 0 Byte
+_PLACEHOLDER_SUFFIX = ".sorter-reserved"
+# ältere Platzhalter stammen von einem abgebrochenen Lauf (Reservieren dauert ms)
+_PLACEHOLDER_MAX_AGE = 300.0
+
+
+class _DirectoryIndex:
+    """Dateinamen eines Zielordners – einmal gelistet, danach im Speicher geführt.
+
+    Statt je Kandidat ``exists()`` abzufragen (auf Netzlaufwerken je ein
+    Roundtrip), wird der Ordner einmal gelesen und nur neu gelistet, wenn sich
+    seine mtime von außen geändert hat. Einen Namen reserviert :meth:`reserve`
+    über einen Platzhalter ``<name>.sorter-reserved`` (``O_CREAT | O_EXCL``);
+    belegt ein anderer Prozess den Namen zwischenzeitlich, geht es mit dem
+    nächsten Zähler weiter. Platzhalter, die ein Absturz hinterlassen hat,
+    werden beim Listing des Ordners entfernt.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._names: Set[str] = set()
+        # (stem, ext) -> nächster zu prüfender Zähler
+        self._next: Dict[Tuple[str, str], int] = {}
+        self._mtime: Optional[int] = None
+        self._load()
+
+    def _dir_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self) -> None:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        names = [name for name in names if not self._drop_stale(name)]
+        # casefold: auch auf SMB/Windows-Freigaben kollisionsfrei
+        self._names = {name.casefold() for name in names}
+        self._next.clear()
+        self._mtime = self._dir_mtime()
+
+    def _drop_stale(self, name: str) -> bool:
+        if not name.endswith(_PLACEHOLDER_SUFFIX):
+            return False
+        path = self.directory / name
+        try:
+            if time.time() - path.stat().st_mtime < _PLACEHOLDER_MAX_AGE:
+                return False  # Reservierung eines laufenden Prozesses
+            path.unlink()
+        except OSError:
+            return False
+        return True
+
+    def _refresh(self) -> None:
+        if self._dir_mtime() != self._mtime:
+            self._load()
+
+    def _candidates(self, filename: str) -> Iterator[Tuple[str, Optional[Tuple[str, str]], int]]:
+        yield filename, None, 0
+        stem, ext = os.path.splitext(filename)
+        key = (stem.casefold(), ext.casefold())
+        counter = self._next.get(key, 1)
+        while True:
+            yield f"{stem}_{counter}{ext or '.pdf'}", key, counter
+            counter += 1
+
+    def _taken(self, name: str) -> bool:
+        folded = name.casefold()
+        return folded in self._names or (folded + _PLACEHOLDER_SUFFIX) in self._names
+
+    def peek(self, filename: str) -> Path:
+        """Nächster freier Name, ohne ihn zu belegen (Dry-Run)."""
+
+        with self._lock:
+            self._refresh()
+            for name, _key, _counter in self._candidates(filename):
+                if not self._taken(name):
+                    return self.directory / name
+        raise AssertionError("unerreichbar")  # pragma: no cover
+
+    def reserve(self, filename: str) -> Path:
+        """Belegt atomar einen freien Namen; :meth:`placed`/:meth:`release` geben ihn frei."""
+
+        with self._lock:
+            self._refresh()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for name, key, counter in self._candidates(filename):
+                if self._taken(name):
+                    continue
+                folded = name.casefold()
+                path = self.directory / name
+                marker = _placeholder(path)
+                try:
+                    fd = os.open(str(marker), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                except FileExistsError:
+                    self._names.add(folded + _PLACEHOLDER_SUFFIX)  # von außen reserviert
+                    continue
+                os.close(fd)
+                # Wer vor uns reserviert hat, hat vor dem Löschen seines
+                # Platzhalters abgelegt – ein Blick genügt.
+                if os.path.lexists(path):
+                    self._unlink(marker)
+                    self._names.add(folded)
+                    continue
+                self._names.add(folded)
+                if key is not None:
+                    self._next[key] = counter + 1
+                self._mtime = self._dir_mtime()  # eigene Änderung, kein Neulisten
+                return path
+        raise AssertionError("unerreichbar")  # pragma: no cover
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def placed(self, path: Path) -> None:
+        """Nach dem Verschieben nach ``path``: Platzhalter weg, kein Neulisten."""
+
+        with self._lock:
+            self._unlink(_placeholder(path))
+            self._mtime = self._dir_mtime()
+
+    def release(self, path: Path) -> None:
+        """Gibt einen reservierten Namen wieder frei (Verschieben fehlgeschlagen)."""
+
+        with self._lock:
+            self._unlink(_placeholder(path))
+            if not os.path.lexists(path):
+                self._names.discard(path.name.casefold())
+                self._next.clear()
+            self._mtime = self._dir_mtime()
+
+
+def _placeholder(path: Path) -> Path:
+    return path.with_name(path.name + _PLACEHOLDER_SUFFIX)
+
+
+_DIR_INDEXES: Dict[Tuple[int, str], _DirectoryIndex] = {}
+_DIR_INDEXES_LOCK = threading.Lock()
+
+
+def _directory_index(directory: Path) -> _DirectoryIndex:
+    # je Prozess eigene Indizes (Locks überleben fork() nicht sinnvoll)
+    key = (os.getpid(), os.path.abspath(str(directory)))
+    with _DIR_INDEXES_LOCK:
+        index = _DIR_INDEXES.get(key)
+        if index is None:
+            index = _DIR_INDEXES[key] = _DirectoryIndex(Path(directory))
+    return index
+
+
+def _unique_path(directory: Path, filename: str, *, reserve: bool = False) -> Path:
+    """Freier Zielname in ``directory``; mit ``reserve`` atomar belegt."""
+
+    index = _directory_index(directory)
+    return index.reserve(filename) if reserve else index.peek(filename)
+
+
+def _move_onto(source: Path, target: Path) -> None:
+    """Verschiebt ``source`` auf den reservierten Platzhalter ``target``."""
+
+    try:
+        os.replace(str(source), str(target))
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        # anderes Dateisystem (z. B. NAS): kopieren, dann Quelle entfernen
+        shutil.copy2(str(source), str(target))
+        os.unlink(str(source))
+
+
+def _iter_pymupdf_pages(pdf_path: Path) -> Iterator[Tuple[int, int, str, bool]]:
+    """Liest die Textebene seitenweise: ``(seite, seitenzahl, text, hat_bilder)``."""
+
+    import fitz  # type: ignore
+
+    with _stage("open"):
+        doc = fitz.open(str(pdf_path))  # type: ignore[attr-defined]
+    with doc:
+        page_count = doc.page_count
+        for index, page in enumerate(doc, start=1):  # type: ignore[assignment]
+            with _stage("text_layer"):
+                try:
+                    has_images = bool(page.get_images(full=False))
+                except Exception:
+                    has_images = True
+                text = page.get_text("text") or ""
+            yield index, page_count, text, has_images
+
+
+def _iter_pypdf2_pages(pdf_path: Path) -> Iterator[Tuple[int, int, str, Optional[bool]]]:
+    from PyPDF2 import PdfReader  # type: ignore
+
+    with _stage("pypdf2"):
+        reader = PdfReader(str(pdf_path))
+        page_count = len(reader.pages)
+    for index, page in enumerate(reader.pages, start=1):
+        with _stage("pypdf2"):
+            try:
+                text = page.extract_text() or ""
+            except Exception:
+                text = ""
+        yield index, page_count, text, None
 
 
 def _extract_with_pymupdf(pdf_path: Path) -> ExtractionResult:
     try:
-        import fitz  # type: ignore
+        import fitz  # type: ignore  # noqa: F401
     except Exception:  # pragma: no cover - optional dependency
         return ExtractionResult(text="", method="unavailable", page_count=0)
     text_parts: List[str] = []
+    has_images: List[bool] = []
     page_count = 0
     try:
-        with fitz.open(str(pdf_path)) as doc:  # type: ignore[attr-defined]
-            page_count = doc.page_count
-            for page in doc:  # type: ignore[assignment]
-                text_parts.append(page.get_text("text") or "")
+        for _index, page_count, page_text, page_images in _iter_pymupdf_pages(pdf_path):
+            text_parts.append(page_text)
+            has_images.append(page_images)
     except Exception:
         return ExtractionResult(text="", method="error", page_count=page_count)
     text = "\n".join(text_parts)
-    return ExtractionResult(text=text, method="text", page_count=page_count)
+    return ExtractionResult(
+        text=text,
+        method="text",
+        page_count=page_count,
+        pages=text_parts,
+        page_has_images=has_images,
+    )
 
 
 def _extract_with_pypdf2(pdf_path: Path) -> ExtractionResult:
     try:
-        from PyPDF2 import PdfReader  # type: ignore
+        from PyPDF2 import PdfReader  # type: ignore  # noqa: F401
     except Exception:  # pragma: no cover - optional dependency
         return ExtractionResult(text="", method="unavailable", page_count=0)
     text_parts: List[str] = []
     try:
-        reader = PdfReader(str(pdf_path))
-        page_count = len(reader.pages)
-        for page in reader.pages:
-            try:
-                text_parts.append(page.extract_text() or "")
-            except Exception:
-                text_parts.append("")
+        for _index, _count, page_text, _images in _iter_pypdf2_pages(pdf_path):
+            text_parts.append(page_text)
     except Exception:
         return ExtractionResult(text="", method="error", page_count=0)
     text = "\n".join(text_parts)
-    return ExtractionResult(text=text, method="text", page_count=len(text_parts))
+    return ExtractionResult(text=text, method="text", page_count=len(text_parts), pages=text_parts)
 
 
-def _extract_with_ocr(
+def _pdf_page_count(pdf_path: Path, poppler_path: Optional[str]) -> int:
+    try:
+        import fitz  # type: ignore
+
+        with _stage("open"), fitz.open(str(pdf_path)) as doc:  # type: ignore[attr-defined]
+            return int(doc.page_count)
+    except Exception:
+        pass
+    try:
+        from pdf2image import pdfinfo_from_path  # type: ignore
+
+        info = pdfinfo_from_path(str(pdf_path), poppler_path=poppler_path or None)
+        return int(info.get("Pages") or 0)
+    except Exception:
+        return 0
+
+
+def _resolve_ocr_workers(cfg: Mapping[str, object]) -> int:
+    """``ocr_workers`` aus der Konfiguration; 0 = Kerne geteilt durch ``jobs``."""
+
+    try:
+        workers = int(cfg.get("ocr_workers") or 0)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        workers = 0
+    if workers > 0:
+        return workers
+    return max(1, (os.cpu_count() or 1) // _resolve_jobs(cfg.get("jobs", 1)))
+
+
+def _resolve_ocr_dpi(cfg: Mapping[str, object]) -> Tuple[Tuple[int, ...], float]:
+    """``ocr_dpi`` (Zahl oder Liste, aufsteigend) und ``ocr_min_confidence`` (0–100)."""
+
+    raw = cfg.get("ocr_dpi", _OCR_DPI_LADDER)
+    if isinstance(raw, str):
+        raw = [part for part in re.split(r"[\s,;]+", raw) if part]
+    elif not isinstance(raw, (list, tuple)):
+        raw = [raw]
+    ladder = set()
+    for value in raw:
+        try:
+            ladder.add(min(1200, max(72, int(value))))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            continue
+    try:
+        confidence = float(cfg.get("ocr_min_confidence", _OCR_MIN_CONFIDENCE))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        confidence = _OCR_MIN_CONFIDENCE
+    return tuple(sorted(ladder)) or (_OCR_DPI,), min(100.0, max(0.0, confidence))
+
+
+def _select_pages(policy: object, page_count: int) -> List[int]:
+    """Wertet die Seitenauswahl ``ocr_pages`` aus (1-basiert, aufsteigend).
+
+    Eine Zahl N wählt die ersten N Seiten. Als Text sind ``all``,
+    ``first:N``, ``last:N``, einzelne Seiten und Bereiche (``2-4``, ``3-``)
+    erlaubt, kommagetrennt kombinierbar: ``first:2,last:1``.
+    """
+
+    if policy is None or policy == "":
+        policy = _OCR_PAGE_POLICY
+    if isinstance(policy, bool):
+        raise ValueError(f"Ungültige Seitenauswahl in ocr_pages: {policy!r}")
+    if isinstance(policy, int):
+        items: List[str] = [f"first:{policy}"]
+    elif isinstance(policy, (list, tuple)):
+        items = [str(item) for item in policy]
+    else:
+        items = str(policy).split(",")
+    selected = set()
+    for raw in items:
+        item = raw.strip().lower().replace(" ", "")
+        if not item:
+            continue
+        try:
+            if item == "all":
+                selected.update(range(1, page_count + 1))
+            elif item.startswith("first:"):
+                selected.update(range(1, min(int(item[6:]), page_count) + 1))
+            elif item.startswith("last:"):
+                count = int(item[5:])
+                if count > 0:
+                    selected.update(range(max(1, page_count - count + 1), page_count + 1))
+            elif "-" in item:
+                first, last = item.split("-", 1)
+                stop = int(last) if last else page_count
+                selected.update(range(max(1, int(first)), min(stop, page_count) + 1))
+            else:
+                page_no = int(item)
+                if 1 <= page_no <= page_count:
+                    selected.add(page_no)
+        except ValueError:
+            raise ValueError(f"Ungültige Seitenauswahl in ocr_pages: {raw!r}") from None
+    return sorted(selected)
+
+
+def _looks_blank(image: object) -> bool:
+    """Grobe Leerseiten-Erkennung (z. B. gescannte Rückseiten) vor Tesseract."""
+
+    try:
+        gray = image.convert("L")  # type: ignore[attr-defined]
+        gray.thumbnail((200, 200))
+        histogram = gray.histogram()
+    except Exception:
+        return False
+    total = sum(histogram) or 1
+    return sum(histogram[:128]) / total < 0.002
+
+
+class _OcrText(str):
+    """OCR-Text einer Seite samt Auflösung und mittlerer Wort-Konfidenz."""
+
+    def __new__(cls, text: str, dpi: int, confidence: Optional[float] = None) -> "_OcrText":
+        obj = super().__new__(cls, text)
+        obj.dpi = dpi
+        obj.confidence = confidence
+        return obj
+
+
+def _render_page(pdf_path: Path, page_no: int, poppler_path: Optional[str], dpi: int) -> List[object]:
+    from pdf2image import convert_from_path  # type: ignore
+
+    with _stage("render"):
+        return convert_from_path(
+            str(pdf_path),
+            dpi=dpi,
+            poppler_path=poppler_path or None,
+            first_page=page_no,
+            last_page=page_no,
+        )
+
+
+def _read_image(image: object, lang: str, with_confidence: bool) -> Tuple[str, Optional[float]]:
+    """Tesseract auf einem Bild (Backend laut ``ocr_backend``), optional mit Konfidenz."""
+
+    with _stage("ocr"):
+        return ocr_engine.current().read(image, lang, with_confidence=with_confidence)
+
+
+def _read_zone(image: object, box: Tuple[float, float, float, float], lang: str, psm: int) -> str:
+    """Tesseract auf einem Ausschnitt (Anteile der Seite: links, oben, rechts, unten)."""
+
+    width, height = image.size  # type: ignore[attr-defined]
+    left, top, right, bottom = box
+    crop = image.crop((int(left * width), int(top * height), int(right * width), int(bottom * height)))  # type: ignore[attr-defined]
+    try:
+        with _stage("ocr"):
+            return ocr_engine.current().read(crop, lang, psm=psm)[0]
+    finally:
+        crop.close()
+
+
+def _ocr_page(
     pdf_path: Path,
+    page_no: int,
     poppler_path: Optional[str],
-    tesseract_cmd: Optional[str],
-    tesseract_lang: str,
-    max_pages: int = 5,
-) -> ExtractionResult:
+    lang: str,
+    dpi_ladder: Sequence[int] = (_OCR_DPI,),
+    min_confidence: float = 0.0,
+) -> str:
+    """Rendert genau eine Seite und liest sie per Tesseract.
+
+    Mit mehreren Stufen in ``dpi_ladder`` wird zuerst grob gerendert und
+    per ``image_to_data`` die Wort-Konfidenz gemessen; nur unter
+    ``min_confidence`` folgt die nächste (höhere) Auflösung. Die letzte
+    Stufe gilt ohne Prüfung. Der Text trägt die verwendete DPI (``.dpi``).
+    """
+
+    ladder = tuple(dpi_ladder) or (_OCR_DPI,)
+    for step, dpi in enumerate(ladder):
+        last = step == len(ladder) - 1
+        images = _render_page(pdf_path, page_no, poppler_path, dpi)
+        try:
+            if not images or _looks_blank(images[0]):
+                return ""
+            text, confidence = _read_image(images[0], lang, with_confidence=not last)
+            if last or (confidence or 0.0) >= min_confidence:
+                return _OcrText(text, dpi, confidence)
+        except Exception:
+            return ""
+        finally:
+            for image in images:
+                try:
+                    image.close()  # type: ignore[attr-defined]
+                except Exception:
+                    pass
+    return ""
+
+
+def _iter_ocr_pages(
+    pdf_path: Path,
+    pages: Sequence[int],
+    poppler_path: Optional[str],
+    lang: str,
+    workers: int,
+    dpi_ladder: Sequence[int] = (_OCR_DPI,),
+    min_confidence: float = 0.0,
+) -> Iterator[Tuple[int, Optional[str]]]:
+    """Liefert ``(seite, text)`` in Seitenreihenfolge.
+
+    Es laufen höchstens ``workers`` Seiten gleichzeitig (Rendern + OCR im
+    selben Task), damit nie mehr als ``workers`` Bitmaps im Speicher liegen.
+    ``text`` ist ``None``, wenn das Rendern der Seite fehlschlug. Wird der
+    Generator vorzeitig geschlossen, werden ausstehende Seiten verworfen.
+    """
+
+    if workers <= 1:
+        for page_no in pages:
+            try:
+                yield page_no, _ocr_page(pdf_path, page_no, poppler_path, lang, dpi_ladder, min_confidence)
+            except Exception:
+                yield page_no, None
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+    pending: Deque[Tuple[int, Future]] = deque()
+    todo = iter(pages)
     try:
-        from pdf2image import convert_from_path  # type: ignore
+        while True:
+            while len(pending) < workers:
+                page_no = next(todo, None)
+                if page_no is None:
+                    break
+                # Kontext kopieren, damit die Stufenzeiten beim Dokument landen
+                task = contextvars.copy_context().run
+                pending.append(
+                    (
+                        page_no,
+                        pool.submit(
+                            task, _ocr_page, pdf_path, page_no, poppler_path, lang, dpi_ladder, min_confidence
+                        ),
+                    )
+                )
+            if not pending:
+                return
+            page_no, future = pending.popleft()
+            try:
+                text: Optional[str] = future.result()
+            except Exception:
+                text = None
+            yield page_no, text
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _prepare_ocr(tesseract_cmd: Optional[str], workers: int) -> bool:
+    """Prüft die OCR-Abhängigkeiten und setzt den Tesseract-Pfad."""
+
+    try:
+        import pdf2image  # type: ignore  # noqa: F401
     except Exception:  # pragma: no cover - optional dependency
-        return ExtractionResult(text="", method="unavailable", page_count=0)
+        return False
     try:
         import pytesseract  # type: ignore
     except Exception:  # pragma: no cover - optional dependency
-        return ExtractionResult(text="", method="unavailable", page_count=0)
-
-    if tesseract_cmd:
+        pytesseract = None
+    if pytesseract is None and ocr_engine.current().name != "tesserocr":
+        return False
+    if tesseract_cmd and pytesseract is not None:
+        # auch bei tesserocr: ``auto`` weicht bei Startfehlern auf pytesseract aus
         try:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
         except Exception:
             pass
+    if workers > 1:
+        # Tesseract startet sonst je Prozess eigene OpenMP-Threads und die
+        # parallelen Seiten bremsen sich gegenseitig aus.
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    return True
+
+
+def _extract_with_ocr(
+    pdf_path: Path,
+    poppler_path: Optional[str],
+    tesseract_cmd: Optional[str],
+    tesseract_lang: str,
+    max_pages: int = _OCR_MAX_PAGES,
+    workers: int = 1,
+    dpi_ladder: Sequence[int] = _OCR_DPI_LADDER,
+    min_confidence: float = _OCR_MIN_CONFIDENCE,
+) -> ExtractionResult:
+    if not _prepare_ocr(tesseract_cmd, workers):
+        return ExtractionResult(text="", method="unavailable", page_count=0)
     lang = tesseract_lang or "deu+eng"
-    try:
-        images = convert_from_path(
-            str(pdf_path),
-            dpi=300,
-            poppler_path=poppler_path or None,
-            first_page=1,
-            last_page=max_pages,
-        )
-    except Exception:
+
+    page_total = _pdf_page_count(pdf_path, poppler_path)
+    if page_total <= 0:
         return ExtractionResult(text="", method="error", page_count=0)
+    pages = list(range(1, min(max_pages, page_total) + 1))
+
     text_parts: List[str] = []
-    for image in images:
+    dpi_used: Dict[int, int] = {}
+    for page_no, page_text in _iter_ocr_pages(
+        pdf_path, pages, poppler_path, lang, workers, dpi_ladder, min_confidence
+    ):
+        if page_text is not None:
+            text_parts.append(page_text)
+            if getattr(page_text, "dpi", None):
+                dpi_used[page_no] = page_text.dpi  # type: ignore[attr-defined]
+    if not text_parts:
+        return ExtractionResult(text="", method="error", page_count=0)
+    text = "\n".join(text_parts)
+    return ExtractionResult(
+        text=text, method="ocr", page_count=len(text_parts), pages=text_parts, ocr_dpi=dpi_used
+    )
+
+
+def _extract_text(
+    path: Path,
+    *,
+    use_ocr: bool,
+    poppler_path: Optional[str],
+    tesseract_cmd: Optional[str],
+    tesseract_lang: str,
+    min_text_length: int,
+    ocr_workers: int = 1,
+    ocr_pages: object = _OCR_PAGE_POLICY,
+    min_page_text_length: int = _OCR_MIN_PAGE_CHARS,
+    ocr_dpi: Sequence[int] = _OCR_DPI_LADDER,
+    ocr_min_confidence: float = _OCR_MIN_CONFIDENCE,
+) -> ExtractionResult:
+    result = _extract_with_pymupdf(path)
+    if not result.text.strip():
+        alt = _extract_with_pypdf2(path)
+        if alt.text.strip():
+            if len(result.page_has_images) == alt.page_count:
+                alt.page_has_images = result.page_has_images
+            result = alt
+
+    if not use_ocr:
+        return result
+
+    page_count = result.page_count or _pdf_page_count(path, poppler_path)
+    if page_count <= 0:
+        return result
+    pages = list(result.pages[:page_count]) + [""] * max(0, page_count - len(result.pages))
+    has_images = result.page_has_images if len(result.page_has_images) == page_count else []
+
+    # Seiten ohne brauchbare Textebene per OCR lesen; hat das ganze Dokument
+    # kaum Text, kommen alle ausgewählten Seiten in Frage.
+    whole_doc_short = len(result.text.strip()) < min_text_length
+    candidates: List[int] = []
+    for page_no in _select_pages(ocr_pages, page_count):
+        existing = pages[page_no - 1].strip()
+        if len(existing) >= min_page_text_length and not whole_doc_short:
+            continue
+        if has_images and not has_images[page_no - 1] and not existing:
+            continue  # weder Text noch Bild: leere Seite
+        candidates.append(page_no)
+    if not candidates or not _prepare_ocr(tesseract_cmd, ocr_workers):
+        return result
+
+    lang = tesseract_lang or "deu+eng"
+    ocr_used: Dict[int, int] = {}
+    for page_no, page_text in _iter_ocr_pages(
+        path, candidates, poppler_path, lang, ocr_workers, ocr_dpi, ocr_min_confidence
+    ):
+        if page_text is None:
+            continue
+        if len(page_text.strip()) > len(pages[page_no - 1].strip()):
+            pages[page_no - 1] = page_text
+            ocr_used[page_no] = getattr(page_text, "dpi", 0)
+    if not ocr_used:
+        return result
+
+    text_only = any(
+        pages[idx].strip() for idx in range(page_count) if (idx + 1) not in ocr_used
+    )
+    return ExtractionResult(
+        text="\n".join(pages),
+        method="text+ocr" if text_only else "ocr",
+        page_count=page_count,
+        pages=pages,
+        page_has_images=has_images,
+        ocr_dpi={page: dpi for page, dpi in ocr_used.items() if dpi},
+    )
+
+
+def extraction_options(cfg: Mapping[str, object]) -> Dict[str, object]:
+    """Wirksame Extraktions-Einstellungen aus ``cfg`` als Argumente für :func:`extract_text_result`.
+
+    Analyse, inkrementelles Lesen und GUI-Vorschau lesen so mit denselben
+    Werten – und treffen dieselben Cache-Einträge.
+    """
+
+    ocr_dpi, ocr_min_confidence = _resolve_ocr_dpi(cfg)
+    return {
+        "use_ocr": bool(cfg.get("use_ocr", True)),
+        "poppler_path": str(cfg.get("poppler_path") or "") or None,
+        "tesseract_cmd": str(cfg.get("tesseract_cmd") or "") or None,
+        "tesseract_lang": str(cfg.get("tesseract_lang") or "deu+eng"),
+        "ocr_workers": _resolve_ocr_workers(cfg),
+        "ocr_pages": cfg.get("ocr_pages") or _OCR_PAGE_POLICY,
+        "min_page_text_length": _int_setting(cfg, "ocr_min_page_chars", _OCR_MIN_PAGE_CHARS),
+        "ocr_dpi": ocr_dpi,
+        "ocr_min_confidence": ocr_min_confidence,
+    }
+
+
+def _cache_settings(
+    options: Mapping[str, object], *, incremental: bool = False, ocr_backend: Optional[str] = None
+) -> Dict[str, object]:
+    """Cache-Schlüsselteil aus den Extraktions-Einstellungen (siehe :func:`extraction_options`).
+
+    Alles, was den Text ändert, gehört hinein; Pfade und Worker-Zahl nicht.
+    Inkrementell gelesene Dokumente kennen keine Mindestlänge fürs ganze
+    Dokument und bekommen einen eigenen Schlüssel.
+    """
+
+    use_ocr = bool(options.get("use_ocr", True))
+    ladder = [int(dpi) for dpi in options.get("ocr_dpi") or _OCR_DPI_LADDER]  # type: ignore[union-attr]
+    settings: Dict[str, object] = {
+        "use_ocr": use_ocr,
+        "lang": options.get("tesseract_lang") or "deu+eng",
+        "dpi": ladder[0],
+        "ocr_pages": options.get("ocr_pages") or _OCR_PAGE_POLICY,
+        "min_page_text_length": int(options.get("min_page_text_length", _OCR_MIN_PAGE_CHARS)),  # type: ignore[arg-type]
+    }
+    # einstufig bleibt der Schlüssel wie bisher, damit vorhandene Einträge gelten
+    if len(ladder) > 1:
+        settings["dpi"] = ladder
+        settings["min_confidence"] = float(options.get("ocr_min_confidence", _OCR_MIN_CONFIDENCE))  # type: ignore[arg-type]
+    # OCR-Text hängt vom Backend ab; pytesseract (bisheriger Weg) ohne Eintrag
+    backend = ocr_backend or ocr_engine.current().name
+    if use_ocr and backend != "pytesseract":
+        settings["ocr_backend"] = backend
+    if incremental:
+        settings["mode"] = "incremental"
+    else:
+        settings["min_text_length"] = int(options.get("min_text_length", _MIN_TEXT_LENGTH))  # type: ignore[arg-type]
+    return settings
+
+
+def _cache_lookup(
+    cache: TextCache, path: Path, content_hash: Optional[str], settings: Mapping[str, object]
+) -> Tuple[Optional[str], Optional[Tuple[str, str, int]]]:
+    try:
+        key = _make_cache_key(content_hash or compute_content_hash(path), settings)
+        return key, cache.get(key)
+    except Exception:
+        return None, None
+
+
+def _iter_text_layer(pdf_path: Path, poppler_path: Optional[str]) -> Iterator[Tuple[int, int, str, Optional[bool]]]:
+    """Textebene seitenweise aus PyMuPDF, sonst PyPDF2, sonst leere Seiten."""
+
+    for reader in (_iter_pymupdf_pages, _iter_pypdf2_pages):
+        produced = False
         try:
-            text_parts.append(pytesseract.image_to_string(image, lang=lang) or "")
+            for item in reader(pdf_path):
+                produced = True
+                yield item
         except Exception:
-            text_parts.append("")
-    text = "\n".join(text_parts)
-    return ExtractionResult(text=text, method="ocr", page_count=len(images))
+            if produced:
+                return
+            continue
+        if produced:
+            return
+    page_count = _pdf_page_count(pdf_path, poppler_path)
+    for index in range(1, page_count + 1):
+        yield index, page_count, "", None
+
+
+def _iter_page_texts(
+    path: Path,
+    *,
+    use_ocr: bool,
+    poppler_path: Optional[str],
+    tesseract_cmd: Optional[str],
+    tesseract_lang: str,
+    ocr_workers: int = 1,
+    ocr_pages: object = _OCR_PAGE_POLICY,
+    min_page_text_length: int = _OCR_MIN_PAGE_CHARS,
+    ocr_dpi: Sequence[int] = _OCR_DPI_LADDER,
+    ocr_min_confidence: float = _OCR_MIN_CONFIDENCE,
+) -> Iterator[Tuple[int, int, str, str]]:
+    """Liefert ``(seite, seitenzahl, text, quelle)`` lazy in Seitenreihenfolge.
+
+    Seiten ohne brauchbare Textebene werden (gemäß ``ocr_pages``) per OCR
+    gelesen. Es wird höchstens ``ocr_workers`` Seiten vorausgelesen, damit
+    OCR parallel laufen kann, ein Abbruch aber kaum Arbeit verschwendet.
+    """
+
+    lang = tesseract_lang or "deu+eng"
+    ocr_ready: Optional[bool] = None
+    selected: Optional[set] = None
+    workers = max(1, ocr_workers)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr") if workers > 1 else None
+    window: Deque[Tuple[int, int, str, bool, Optional[Future]]] = deque()
+    layer = _iter_text_layer(path, poppler_path)
+
+    def _needs_ocr(page_no: int, page_count: int, text: str, has_images: Optional[bool]) -> bool:
+        nonlocal ocr_ready, selected
+        if not use_ocr or len(text.strip()) >= min_page_text_length:
+            return False
+        if has_images is False and not text.strip():
+            return False
+        if selected is None:
+            selected = set(_select_pages(ocr_pages, page_count))
+        if page_no not in selected:
+            return False
+        if ocr_ready is None:
+            ocr_ready = _prepare_ocr(tesseract_cmd, workers)
+        return bool(ocr_ready)
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(window) < workers:
+                item = next(layer, None)
+                if item is None:
+                    exhausted = True
+                    break
+                page_no, page_count, text, has_images = item
+                needs_ocr = _needs_ocr(page_no, page_count, text, has_images)
+                future: Optional[Future] = None
+                if needs_ocr and pool is not None:
+                    # Kontext kopieren, damit die Stufenzeiten beim Dokument landen
+                    task = contextvars.copy_context().run
+                    future = pool.submit(
+                        task, _ocr_page, path, page_no, poppler_path, lang, ocr_dpi, ocr_min_confidence
+                    )
+                window.append((page_no, page_count, text, needs_ocr, future))
+            if not window:
+                return
+            page_no, page_count, text, needs_ocr, future = window.popleft()
+            if not needs_ocr:
+                yield page_no, page_count, text, "text"
+                continue
+            try:
+                if future is None:
+                    ocr_text: Optional[str] = _ocr_page(
+                        path, page_no, poppler_path, lang, ocr_dpi, ocr_min_confidence
+                    )
+                else:
+                    ocr_text = future.result()
+            except Exception:
+                ocr_text = None
+            if ocr_text is not None and len(ocr_text.strip()) > len(text.strip()):
+                yield page_no, page_count, ocr_text, "ocr"
+            else:
+                yield page_no, page_count, text, "text"
+    finally:
+        layer.close()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
 
 
 def extract_text_from_pdf(
@@ -220,41 +1248,125 @@ def extract_text_from_pdf(
     poppler_path: Optional[str] = None,
     tesseract_cmd: Optional[str] = None,
     tesseract_lang: str = "deu+eng",
-    min_text_length: int = 50,
+    min_text_length: int = _MIN_TEXT_LENGTH,
+    cache: Optional[TextCache] = None,
+    content_hash: Optional[str] = None,
+    ocr_workers: int = 1,
+    ocr_pages: object = _OCR_PAGE_POLICY,
+    min_page_text_length: int = _OCR_MIN_PAGE_CHARS,
+    ocr_dpi: Sequence[int] = _OCR_DPI_LADDER,
+    ocr_min_confidence: float = _OCR_MIN_CONFIDENCE,
 ) -> Tuple[str, str]:
-    """Extrahiert Text aus einer PDF-Datei und nutzt optional OCR als Fallback."""
+    """Extrahiert Text aus einer PDF-Datei und nutzt optional OCR als Fallback.
+
+    OCR wird je Seite entschieden: Seiten aus ``ocr_pages`` mit weniger als
+    ``min_page_text_length`` Zeichen Textebene werden gelesen und in
+    Seitenreihenfolge eingefügt. Mit ``cache`` wird das Ergebnis unter
+    Inhalts-Hash + Einstellungen abgelegt.
+    """
+
+    return extract_text_result(
+        pdf_path,
+        use_ocr=use_ocr,
+        poppler_path=poppler_path,
+        tesseract_cmd=tesseract_cmd,
+        tesseract_lang=tesseract_lang,
+        min_text_length=min_text_length,
+        cache=cache,
+        content_hash=content_hash,
+        ocr_workers=ocr_workers,
+        ocr_pages=ocr_pages,
+        min_page_text_length=min_page_text_length,
+        ocr_dpi=ocr_dpi,
+        ocr_min_confidence=ocr_min_confidence,
+    )[:2]
+
+
+def extract_text_result(
+    pdf_path: PathLike,
+    *,
+    use_ocr: bool = True,
+    poppler_path: Optional[str] = None,
+    tesseract_cmd: Optional[str] = None,
+    tesseract_lang: str = "deu+eng",
+    min_text_length: int = _MIN_TEXT_LENGTH,
+    cache: Optional[TextCache] = None,
+    content_hash: Optional[str] = None,
+    ocr_workers: int = 1,
+    ocr_pages: object = _OCR_PAGE_POLICY,
+    min_page_text_length: int = _OCR_MIN_PAGE_CHARS,
+    ocr_dpi: Sequence[int] = _OCR_DPI_LADDER,
+    ocr_min_confidence: float = _OCR_MIN_CONFIDENCE,
+    details: Optional[Dict[str, object]] = None,
+) -> Tuple[str, str, int]:
+    """Wie :func:`extract_text_from_pdf`, liefert zusätzlich die Seitenzahl.
+
+    ``details`` (falls übergeben) erhält ``ocr_dpi``: Seite -> DPI der
+    OCR-Seiten dieses Laufs (leer bei Cache-Treffer oder reiner Textebene).
+    """
 
     path = Path(pdf_path)
     if not path.exists():
         raise FileNotFoundError(f"PDF nicht gefunden: {path}")
 
-    result = _extract_with_pymupdf(path)
-    text = result.text
-    method = result.method
-
-    if not text.strip():
-        alt = _extract_with_pypdf2(path)
-        if alt.text.strip():
-            text = alt.text
-            method = alt.method
-
-    if use_ocr and len(text.strip()) < min_text_length:
-        ocr_res = _extract_with_ocr(path, poppler_path, tesseract_cmd, tesseract_lang)
-        if ocr_res.text.strip():
-            text = ocr_res.text
-            method = ocr_res.method
+    key = None
+    if cache is not None:
+        settings = _cache_settings(
+            {
+                "use_ocr": use_ocr,
+                "tesseract_lang": tesseract_lang,
+                "min_text_length": min_text_length,
+                "ocr_pages": ocr_pages,
+                "min_page_text_length": min_page_text_length,
+                "ocr_dpi": ocr_dpi,
+                "ocr_min_confidence": ocr_min_confidence,
+            }
+        )
+        key, hit = _cache_lookup(cache, path, content_hash, settings)
+        if hit is not None:
+            return hit
+
+    result = _extract_text(
+        path,
+        use_ocr=use_ocr,
+        poppler_path=poppler_path,
+        tesseract_cmd=tesseract_cmd,
+        tesseract_lang=tesseract_lang,
+        min_text_length=min_text_length,
+        ocr_workers=ocr_workers,
+        ocr_pages=ocr_pages,
+        min_page_text_length=min_page_text_length,
+        ocr_dpi=ocr_dpi,
+        ocr_min_confidence=ocr_min_confidence,
+    )
+    if details is not None:
+        details["ocr_dpi"] = dict(result.ocr_dpi)
 
-    return text, method
+    # Fehler/fehlende Bibliotheken nicht festschreiben – nach einer
+    # Installation soll die Datei erneut gelesen werden.
+    if key is not None and result.method not in ("error", "unavailable"):
+        try:
+            cache.put(key, result.text, result.method, result.page_count)  # type: ignore[union-attr]
+        except Exception:
+            pass
+    return result.text, result.method, result.page_count
 
 
-def extract_invoice_no(text: str, patterns: Sequence[str]) -> Optional[str]:
-    if not text:
-        return None
+def _iter_regexes(patterns: Sequence[Union[str, Pattern[str]]]) -> Iterator[Pattern[str]]:
     for pattern in patterns:
+        if isinstance(pattern, re.Pattern):
+            yield pattern
+            continue
         try:
-            regex = re.compile(pattern, re.IGNORECASE)
+            yield re.compile(pattern, re.IGNORECASE)
         except re.error:
             continue
+
+
+def extract_invoice_no(text: str, patterns: Sequence[Union[str, Pattern[str]]]) -> Optional[str]:
+    if not text:
+        return None
+    for regex in _iter_regexes(patterns):
         match = regex.search(text)
         if match:
             groups = [g for g in match.groups() if g]
@@ -265,60 +1377,136 @@ def extract_invoice_no(text: str, patterns: Sequence[str]) -> Optional[str]:
     return None
 
 
+# Monatsnamen (deutsch/englisch, inkl. üblicher Abkürzungen) für "3. März 2024"
+_MONTH_NAMES: Dict[str, int] = {}
+for _month, _names in enumerate(
+    (
+        "januar jan january jänner jän",
+        "februar feb february",
+        "märz mär mrz maerz march mar",
+        "april apr",
+        "mai may",
+        "juni jun june",
+        "juli jul july",
+        "august aug",
+        "september sep sept",
+        "oktober okt october oct",
+        "november nov",
+        "dezember dez december dec",
+    ),
+    start=1,
+):
+    for _name in _names.split():
+        _MONTH_NAMES[_name] = _month
+del _month, _names, _name
+
+# Ein Durchlauf über den bereinigten Kandidaten: drei Zahlen mit Trennern,
+# reine Ziffernfolge oder Tag + Monatsname + Jahr
+_DATE_TOKENS = re.compile(
+    r"(?P<a>\d+)(?P<s1>[./-])(?P<b>\d+)(?P<s2>[./-])(?P<c>\d+)"
+    r"|(?P<digits>\d+)"
+    r"|(?P<day>\d{1,2})\.?-?(?P<month>[^\W\d_]+)\.?-?(?P<year>\d{4}|\d{2})"
+)
+# kompakte Formen wie strptime("%Y%m%d") bzw. ("%d%m%Y") sie zerlegt
+_COMPACT_YMD = re.compile(r"(\d{4})(1[0-2]|0[1-9]|[1-9])(3[01]|[12]\d|0[1-9]|[1-9])")
+_COMPACT_DMY = re.compile(r"(3[01]|[12]\d|0[1-9]|[1-9])(1[0-2]|0[1-9]|[1-9])(\d{4})")
+# Reihenfolge je Trenner wie bisher: Jahr vorn oder Tag vorn (4- bzw. 2-stelliges Jahr)
+_DATE_ORDERS: Dict[str, Tuple[str, ...]] = {
+    ".": ("dmY", "dmy", "Ymd"),
+    "-": ("Ymd", "dmY", "dmy"),
+    "/": ("Ymd", "dmY", "dmy"),
+}
+_DATE_MEMO_SIZE = 4096
+
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _is_leap(year: int) -> bool:
+    # statt calendar.isleap: calendar zieht locale nach und kostet Startzeit
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _format_date(year: int, month: int, day: int) -> Optional[str]:
+    if not 1900 <= year <= 2100 or not 1 <= month <= 12 or day < 1:
+        return None
+    if day > _DAYS_IN_MONTH[month] and not (month == 2 and day == 29 and _is_leap(year)):
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _two_digit_year(value: int) -> int:
+    # wie strptime("%y"): 69–99 -> 19xx, 00–68 -> 20xx
+    return value + (1900 if value >= 69 else 2000)
+
+
+def _date_from_parts(a: str, b: str, c: str, separator: str) -> Optional[str]:
+    for order in _DATE_ORDERS[separator]:
+        if order == "Ymd":
+            if len(a) != 4 or len(b) > 2 or len(c) > 2:
+                continue
+            year, month, day = int(a), int(b), int(c)
+        else:
+            if len(a) > 2 or len(b) > 2 or len(c) != (4 if order == "dmY" else 2):
+                continue
+            year = int(c) if order == "dmY" else _two_digit_year(int(c))
+            month, day = int(b), int(a)
+        result = _format_date(year, month, day)
+        if result:
+            return result
+    return None
+
+
+@lru_cache(maxsize=_DATE_MEMO_SIZE)
 def _normalize_date_candidate(candidate: str) -> Optional[str]:
-    candidate = candidate.strip()
+    """Normalisiert einen Datums-Treffer nach ``YYYY-MM-DD``.
+
+    Erkennt ``TT.MM.JJJJ``/``TT.MM.JJ``, ``JJJJ-MM-TT``, ``/``-Varianten,
+    kompakte Ziffernfolgen (``20240203``, ``03022024``) und Monatsnamen
+    (``3. März 2024``). Ergebnisse werden begrenzt zwischengespeichert.
+    """
+
+    candidate = "".join(candidate.replace("\\", ".").split())
     if not candidate:
         return None
-    candidate = candidate.replace("\\", ".")
-    candidate = re.sub(r"[\s]+", "", candidate)
-    formats = [
-        "%d.%m.%Y",
-        "%d.%m.%y",
-        "%Y-%m-%d",
-        "%d-%m-%Y",
-        "%d-%m-%y",
-        "%Y/%m/%d",
-        "%d/%m/%Y",
-        "%d/%m/%y",
-        "%Y.%m.%d",
-        "%Y%m%d",
-        "%d%m%Y",
-    ]
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(candidate, fmt)
-            if dt.year < 1900 or dt.year > 2100:
-                continue
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    # Heuristik: ersetze verschiedene Trenner mit '-'
-    cleaned = re.sub(r"[./]", "-", candidate)
-    parts = cleaned.split("-")
-    if len(parts) == 3:
-        a, b, c = parts
-        try:
-            if len(a) == 4:
-                dt = datetime(int(a), int(b), int(c))
-            elif len(c) == 4:
-                dt = datetime(int(c), int(b), int(a))
-            else:
-                dt = datetime(int(c), int(b), int(a))
-            if 1900 <= dt.year <= 2100:
-                return dt.strftime("%Y-%m-%d")
-        except ValueError:
+    match = _DATE_TOKENS.fullmatch(candidate)
+    if match is not None:
+        a, sep1, b, sep2, c, digits, day, month_name, year = match.groups()
+        if a is not None:
+            if sep1 == sep2:
+                result = _date_from_parts(a, b, c, sep1)
+                if result:
+                    return result
+        elif digits is not None:
+            compact = _COMPACT_YMD.fullmatch(digits)
+            if compact is not None:
+                result = _format_date(int(compact.group(1)), int(compact.group(2)), int(compact.group(3)))
+                if result:
+                    return result
+            compact = _COMPACT_DMY.fullmatch(digits)
+            if compact is not None:
+                return _format_date(int(compact.group(3)), int(compact.group(2)), int(compact.group(1)))
             return None
-    return None
+        else:
+            month = _MONTH_NAMES.get(month_name.lower())
+            if month is None:
+                return None
+            value = int(year) if len(year) == 4 else _two_digit_year(int(year))
+            return _format_date(value, month, int(day))
+    # Heuristik: beliebige Trenner, Jahr vorn (4-stellig) oder hinten
+    parts = re.split(r"[./-]", candidate)
+    if len(parts) != 3 or not all(part.isdecimal() for part in parts):
+        return None
+    a, b, c = (int(part) for part in parts)
+    if len(parts[0]) == 4:
+        return _format_date(a, b, c)
+    return _format_date(c, b, a)
 
 
-def extract_date(text: str, patterns: Sequence[str]) -> Optional[str]:
+def extract_date(text: str, patterns: Sequence[Union[str, Pattern[str]]]) -> Optional[str]:
     if not text:
         return None
-    for pattern in patterns:
-        try:
-            regex = re.compile(pattern, re.IGNORECASE)
-        except re.error:
-            continue
+    for regex in _iter_regexes(patterns):
         for match in regex.finditer(text):
             groups = [g for g in match.groups() if g]
             candidate = groups[0] if groups else match.group(0)
@@ -328,7 +1516,294 @@ def extract_date(text: str, patterns: Sequence[str]) -> Optional[str]:
     return None
 
 
-def detect_supplier(text: str, hints: Mapping[str, Sequence[str]]) -> Optional[str]:
+def _normalize_amount(candidate: str) -> Optional[str]:
+    """Normalisiert Beträge wie ``1.234,56`` oder ``1,234.56`` zu ``1234.56``."""
+
+    cleaned = re.sub(r"[^0-9.,]", "", candidate or "").strip(".,")
+    if not cleaned or not any(ch.isdigit() for ch in cleaned):
+        return None
+    last_sep = max(cleaned.rfind("."), cleaned.rfind(","))
+    if last_sep == -1:
+        integer, decimals = cleaned, ""
+    else:
+        decimals = cleaned[last_sep + 1 :]
+        integer = re.sub(r"[.,]", "", cleaned[:last_sep])
+        if len(decimals) == 3:
+            # "1.234" bzw. "1,234": Tausendertrenner, keine Nachkommastellen
+            integer, decimals = integer + decimals, ""
+    if not integer.isdigit() or (decimals and not decimals.isdigit()):
+        return None
+    cents = (decimals + "00")[:2]
+    return f"{int(integer)}.{cents}"
+
+
+def _clean_invoice_no(value: str) -> Optional[str]:
+    if not value:
+        return None
+    cleaned = re.sub(r"[^A-Z0-9\-_/]+", "", value.upper())
+    return cleaned or value.strip()
+
+
+# Ergebnisfeld -> Schlüssel der Musterliste in patterns.yaml
+FIELD_PATTERN_KEYS: Dict[str, str] = {
+    "invoice_no": "invoice_number_patterns",
+    "invoice_date": "date_patterns",
+    "total_gross": "total_gross_patterns",
+    "total_net": "total_net_patterns",
+    "tax_amount": "tax_amount_patterns",
+}
+
+_FIELD_NORMALIZERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "invoice_no": _clean_invoice_no,
+    "invoice_date": _normalize_date_candidate,
+    "total_gross": _normalize_amount,
+    "total_net": _normalize_amount,
+    "tax_amount": _normalize_amount,
+}
+
+# Zeichen, die re.IGNORECASE wie "i"/"s" behandelt, str.lower() aber nicht
+_FOLD_FIXES = {0x131: "i", 0x17F: "s"}
+
+
+def _literal_prefix(regex: Pattern[str]) -> str:
+    """Fester (kleingeschriebener) Anfang eines Musters, sonst ``""``."""
+
+    try:
+        parsed = _sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return ""
+    literal = _sre_parse.LITERAL
+    chars: List[str] = []
+    for op, arg in parsed:
+        if op is not literal:
+            break
+        chars.append(chr(arg).lower())
+    return "".join(chars)
+
+
+@dataclass(frozen=True)
+class FieldMatch:
+    """Ein normalisierter Feldwert samt Position im Text."""
+
+    value: str
+    start: int
+    end: int
+    raw: str
+    pattern_index: int
+
+
+class FieldExtractor:
+    """Liest alle Felder aus ``FIELD_PATTERN_KEYS`` mit einer Engine aus.
+
+    Je Muster wird beim Aufbau der feste Anfang (``Rechnungs``, ``MwSt`` …)
+    bestimmt. Pro Text wird einmal kleingeschrieben; Kandidaten liefert dann
+    ``str.find`` auf diesem Anker, der Regex läuft nur noch verankert an diesen
+    Stellen. Muster ohne ausreichend langen Anker (``min_anchor``) laufen
+    klassisch per ``finditer``. Die Auswahl entspricht den Einzel-Extraktoren:
+    je Feld gewinnt das erste Muster der Liste mit einem gültigen Treffer,
+    innerhalb eines Musters der früheste.
+    """
+
+    min_anchor = 3
+
+    def __init__(self, compiled: Mapping[str, Sequence[Pattern[str]]]) -> None:
+        self._fields: Dict[str, List[Tuple[Pattern[str], str]]] = {}
+        for field_name in FIELD_PATTERN_KEYS:
+            entries: List[Tuple[Pattern[str], str]] = []
+            for regex in compiled.get(field_name) or []:
+                anchor = _literal_prefix(regex) if regex.flags & re.IGNORECASE else ""
+                entries.append((regex, anchor if len(anchor) >= self.min_anchor else ""))
+            self._fields[field_name] = entries
+
+    @staticmethod
+    def _iter_matches(regex: Pattern[str], anchor: str, text: str, folded: Optional[str]):
+        if not anchor or folded is None:
+            yield from regex.finditer(text)
+            return
+        # wie finditer: Treffer desselben Musters überlappen nicht
+        last_end = 0
+        pos = folded.find(anchor)
+        while pos != -1:
+            if pos >= last_end:
+                match = regex.match(text, pos)
+                if match is not None:
+                    last_end = match.end()
+                    yield match
+            pos = folded.find(anchor, pos + 1)
+
+    @staticmethod
+    def _value_span(match: "re.Match[str]") -> Tuple[str, int, int]:
+        # wie die Einzel-Extraktoren: erste nicht-leere Gruppe, sonst Gesamttreffer
+        for group in range(1, (match.re.groups or 0) + 1):
+            value = match.group(group)
+            if value:
+                return value, match.start(group), match.end(group)
+        return match.group(0), match.start(), match.end()
+
+    def extract(self, text: str) -> Dict[str, Optional[FieldMatch]]:
+        """Liefert je Feld den gewählten :class:`FieldMatch` (oder ``None``)."""
+
+        results: Dict[str, Optional[FieldMatch]] = {name: None for name in FIELD_PATTERN_KEYS}
+        if not text:
+            return results
+        folded: Optional[str] = text.lower().translate(_FOLD_FIXES)
+        if len(folded) != len(text):  # z. B. "İ" -> "i̇": Offsets passen nicht mehr
+            folded = None
+        for field_name, entries in self._fields.items():
+            normalize = _FIELD_NORMALIZERS[field_name]
+            for index, (regex, anchor) in enumerate(entries):
+                for match in self._iter_matches(regex, anchor, text, folded):
+                    raw, start, end = self._value_span(match)
+                    value = normalize(raw)
+                    if value:
+                        results[field_name] = FieldMatch(value, start, end, raw, index)
+                        break
+                if results[field_name] is not None:
+                    break
+        return results
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SupplierMatcher:
+    """Findet Lieferanten-Schlüsselwörter in einem Durchlauf über den Text.
+
+    Ab ``automaton_threshold`` Schlüsselwörtern wird ein Aho-Corasick-Automat
+    genutzt (Aufwand linear in der Textlänge, unabhängig von der Zahl der
+    Lieferanten); kleine Listen bleiben bei der schnelleren Teilstring-Suche.
+    Die Bewertung entspricht :func:`detect_supplier`: je gefundenem
+    Schlüsselwort ein Punkt, bei Gleichstand gewinnt der erste Lieferant.
+    Mit ``word_boundary`` zählen Treffer nur als ganze Wörter (``o2`` passt
+    dann nicht mehr in ``co2``).
+    """
+
+    automaton_threshold = 64
+
+    def __init__(self, hints: Mapping[str, Sequence[str]], *, word_boundary: bool = False) -> None:
+        self.word_boundary = bool(word_boundary)
+        self.suppliers: List[str] = []
+        # je eindeutigem Schlüsselwort: Lieferanten-Indizes (mehrfach, wenn
+        # ein Lieferant das Wort doppelt listet – wie bisher zählt es doppelt)
+        self.keywords: List[str] = []
+        self._owners: List[List[int]] = []
+        index: Dict[str, int] = {}
+        for supplier, keywords in (hints or {}).items():
+            supplier_idx = len(self.suppliers)
+            self.suppliers.append(supplier)
+            for keyword in keywords or []:
+                if not keyword:
+                    continue
+                kw = str(keyword).lower()
+                kw_idx = index.get(kw)
+                if kw_idx is None:
+                    kw_idx = index[kw] = len(self.keywords)
+                    self.keywords.append(kw)
+                    self._owners.append([])
+                self._owners[kw_idx].append(supplier_idx)
+        self._use_automaton = len(self.keywords) >= self.automaton_threshold
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._out: List[List[int]] = []
+        self._boundary_rx: List[Optional[Pattern[str]]] = []
+        if self._use_automaton:
+            self._build_automaton()
+        elif self.word_boundary:
+            self._boundary_rx = [self._boundary_regex(kw) for kw in self.keywords]
+
+    @staticmethod
+    def _boundary_regex(keyword: str) -> Pattern[str]:
+        left = r"(?<!\w)" if _is_word_char(keyword[0]) else ""
+        right = r"(?!\w)" if _is_word_char(keyword[-1]) else ""
+        return re.compile(left + re.escape(keyword) + right)
+
+    def _build_automaton(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for kw_idx, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(kw_idx)
+        fail = [0] * len(goto)
+        queue: Deque[int] = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def _found_keywords(self, lower: str) -> List[int]:
+        if not self._use_automaton:
+            if self.word_boundary:
+                return [i for i, rx in enumerate(self._boundary_rx) if rx.search(lower)]
+            return [i for i, kw in enumerate(self.keywords) if kw in lower]
+
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        check_boundary = self.word_boundary
+        found = [False] * len(keywords)
+        hits: List[int] = []
+        state = 0
+        end = len(lower)
+        for pos, ch in enumerate(lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for kw_idx in out[state]:
+                if found[kw_idx]:
+                    continue
+                if check_boundary:
+                    keyword = keywords[kw_idx]
+                    start = pos - len(keyword) + 1
+                    if _is_word_char(keyword[0]) and start > 0 and _is_word_char(lower[start - 1]):
+                        continue
+                    if _is_word_char(keyword[-1]) and pos + 1 < end and _is_word_char(lower[pos + 1]):
+                        continue
+                found[kw_idx] = True
+                hits.append(kw_idx)
+        return hits
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """Punkte je Lieferant (nur Lieferanten mit mindestens einem Treffer)."""
+
+        totals = [0] * len(self.suppliers)
+        for kw_idx in self._found_keywords(text.lower()):
+            for supplier_idx in self._owners[kw_idx]:
+                totals[supplier_idx] += 1
+        return {self.suppliers[i]: score for i, score in enumerate(totals) if score}
+
+    def detect(self, text: str) -> Optional[str]:
+        if not text or not self.keywords:
+            return None
+        best_supplier = None
+        best_score = 0
+        # scores() hält die Lieferanten-Reihenfolge: bei Gleichstand bleibt der erste
+        for supplier, score in self.scores(text).items():
+            if score > best_score:
+                best_supplier = supplier
+                best_score = score
+        return best_supplier
+
+
+def detect_supplier(
+    text: str, hints: Union[Mapping[str, Sequence[str]], SupplierMatcher]
+) -> Optional[str]:
+    if isinstance(hints, SupplierMatcher):
+        return hints.detect(text)
     if not text or not hints:
         return None
     lower = text.lower()
@@ -347,25 +1822,273 @@ def detect_supplier(text: str, hints: Mapping[str, Sequence[str]]) -> Optional[s
     return best_supplier
 
 
+def _extract_incremental(
+    pdf_path: PathLike,
+    cfg: Mapping[str, object],
+    pats: CompiledPatterns,
+    content_hash: Optional[str] = None,
+    details: Optional[Dict[str, object]] = None,
+) -> Tuple[str, str, int, int, bool]:
+    """Liest Seiten lazy, bis Rechnungsnummer, Datum und Lieferant feststehen.
+
+    ``extraction_max_pages``/``extraction_max_chars`` (0 = unbegrenzt)
+    deckeln den Aufwand zusätzlich. Liefert ``(text, methode, seitenzahl,
+    gelesene_seiten, vorzeitig_beendet)``; ``details`` wie bei
+    :func:`extract_text_result`.
+    """
+
+    path = Path(pdf_path)
+    if not path.exists():
+        raise FileNotFoundError(f"PDF nicht gefunden: {path}")
+    options = extraction_options(cfg)
+
+    cache = get_text_cache(cfg)
+    key = None
+    if cache is not None:
+        key, hit = _cache_lookup(cache, path, content_hash, _cache_settings(options, incremental=True))
+        if hit is not None:
+            return hit[0], hit[1], hit[2], hit[2], False
+
+    max_pages = _int_setting(cfg, "extraction_max_pages", 0)
+    max_chars = _int_setting(cfg, "extraction_max_chars", 0)
+    hints = pats.supplier_matcher
+
+    parts: List[str] = []
+    sources = set()
+    chars = 0
+    tail = ""
+    found_invoice = found_date = found_supplier = False
+    stopped_early = False
+    total_pages = 0  # Seitenzahl laut geöffnetem Dokument
+    pages = _iter_page_texts(path, **options)  # type: ignore[arg-type]
+    dpi_used: Dict[int, int] = {}
+    try:
+        for page_no, total_pages, page_text, source in pages:
+            parts.append(page_text)
+            if source == "ocr" and getattr(page_text, "dpi", None):
+                dpi_used[page_no] = page_text.dpi  # type: ignore[attr-defined]
+            chars += len(page_text)
+            if page_text.strip():
+                sources.add(source)
+            # Nur die neue Seite (plus Ende der vorherigen, falls ein Feld über
+            # den Seitenumbruch läuft) prüfen, gefundene Felder nicht erneut.
+            chunk = tail + "\n" + page_text
+            tail = page_text[-_PAGE_OVERLAP_CHARS:]
+            with _stage("fields"):
+                if not (found_invoice and found_date):
+                    fields = pats.fields.extract(chunk)
+                    found_invoice = found_invoice or fields["invoice_no"] is not None
+                    found_date = found_date or fields["invoice_date"] is not None
+                found_supplier = found_supplier or bool(detect_supplier(chunk, hints))
+            if found_invoice and found_date and found_supplier:
+                stopped_early = True
+                break
+            if (max_pages and len(parts) >= max_pages) or (max_chars and chars >= max_chars):
+                stopped_early = True
+                break
+    finally:
+        pages.close()
+
+    if details is not None:
+        details["ocr_dpi"] = dpi_used
+    text = "\n".join(parts)
+    if sources == {"text", "ocr"}:
+        method = "text+ocr"
+    elif sources:
+        method = sources.pop()
+    else:
+        method = "text"
+    page_count = len(parts)
+    if stopped_early:
+        page_count = max(page_count, total_pages)
+    elif key is not None:
+        # Nur vollständig gelesene Dokumente cachen
+        try:
+            cache.put(key, text, method, page_count)  # type: ignore[union-attr]
+        except Exception:
+            pass
+    return text, method, page_count, len(parts), stopped_early
+
+
+def _parse_zones(raw: object, default_psm: int) -> List[Tuple[str, Tuple[float, float, float, float], int]]:
+    """``{name: [l, o, r, u]}`` oder ``{name: {box: [...], psm: N}}`` -> Zonenliste."""
+
+    zones: List[Tuple[str, Tuple[float, float, float, float], int]] = []
+    if not isinstance(raw, Mapping):
+        return zones
+    for name, spec in raw.items():
+        psm = default_psm
+        box = spec
+        if isinstance(spec, Mapping):
+            box = spec.get("box")
+            try:
+                psm = int(spec.get("psm", default_psm))  # type: ignore[arg-type]
+            except (TypeError, ValueError):
+                pass
+        try:
+            left, top, right, bottom = (min(1.0, max(0.0, float(value))) for value in box)  # type: ignore[union-attr]
+        except (TypeError, ValueError):
+            continue
+        if right > left and bottom > top:
+            zones.append((str(name), (left, top, right, bottom), psm))
+    return zones
+
+
+def _extract_zones_first(
+    pdf_path: PathLike,
+    cfg: Mapping[str, object],
+    pats: CompiledPatterns,
+    content_hash: Optional[str] = None,
+) -> Optional[Tuple[str, str, int]]:
+    """OCR nur der Kopf-/Adresszonen von Seite 1 (``ocr_zone_first``).
+
+    Reichen die Zonen für Rechnungsnummer, Datum und Lieferant, entfällt die
+    ganzseitige OCR. Fehlt noch etwas und ist der Lieferant erkannt, werden
+    dessen Zonen aus ``patterns/suppliers`` gelesen. ``None`` heißt: normal
+    weiterlesen (Textebene vorhanden, OCR nicht verfügbar, Felder fehlen).
+    """
+
+    path = Path(pdf_path)
+    poppler_path = str(cfg.get("poppler_path") or "") or None
+    layer = _iter_text_layer(path, poppler_path)
+    try:
+        first = next(layer, None)
+    finally:
+        layer.close()
+    if first is None:
+        return None
+    _page_no, page_count, layer_text, has_images = first
+    if len(layer_text.strip()) >= _int_setting(cfg, "ocr_min_page_chars", _OCR_MIN_PAGE_CHARS):
+        return None
+    if has_images is False and not layer_text.strip():
+        return None
+    default_psm = _int_setting(cfg, "ocr_zone_psm", 6)
+    zones = _parse_zones(cfg.get("ocr_zones"), default_psm)
+    if not zones or not _prepare_ocr(str(cfg.get("tesseract_cmd") or "") or None, 1):
+        return None
+
+    lang = str(cfg.get("tesseract_lang") or "deu+eng")
+    ocr_dpi, _min_confidence = _resolve_ocr_dpi(cfg)
+    cache = get_text_cache(cfg)
+    key = None
+    if cache is not None:
+        settings: Dict[str, object] = {"mode": "zones", "lang": lang, "dpi": ocr_dpi[-1], "zones": zones}
+        settings["supplier_zones"] = pats.supplier_zones
+        settings["ocr_backend"] = ocr_engine.current().name
+        key, hit = _cache_lookup(cache, path, content_hash, settings)
+        if hit is not None:
+            return hit
+
+    def _complete(text: str) -> Tuple[bool, Optional[str]]:
+        with _stage("fields"):
+            fields = pats.fields.extract(text)
+            supplier = detect_supplier(text, pats.supplier_matcher)
+        return bool(fields["invoice_no"] and fields["invoice_date"] and supplier), supplier
+
+    # kleine Ausschnitte: gleich mit der höchsten Stufe rendern
+    try:
+        images = _render_page(path, 1, poppler_path, ocr_dpi[-1])
+    except Exception:
+        return None
+    try:
+        if not images or _looks_blank(images[0]):
+            return None
+        parts = [_read_zone(images[0], box, lang, psm) for _name, box, psm in zones]
+        complete, supplier = _complete("\n".join(parts))
+        extra = pats.supplier_zones.get(supplier.casefold()) if supplier and not complete else None
+        if extra:
+            parts += [_read_zone(images[0], box, lang, psm) for _name, box, psm in _parse_zones(extra, default_psm)]
+            complete, _supplier = _complete("\n".join(parts))
+        if not complete:
+            return None
+    except Exception:
+        return None
+    finally:
+        for image in images:
+            try:
+                image.close()  # type: ignore[attr-defined]
+            except Exception:
+                pass
+
+    text = "\n".join(parts)
+    page_count = page_count or _pdf_page_count(path, poppler_path)
+    if key is not None:
+        try:
+            cache.put(key, text, "ocr-zones", page_count)  # type: ignore[union-attr]
+        except Exception:
+            pass
+    return text, "ocr-zones", page_count
+
+
 def analyze_pdf(
     pdf_path: PathLike,
     *,
     patterns_path: Optional[PathLike] = None,
     config: Optional[Mapping[str, object]] = None,
     patterns: Optional[Mapping[str, object]] = None,
+    content_hash: Optional[str] = None,
 ) -> Dict[str, object]:
+    """Extrahiert Text und Felder einer PDF.
+
+    Mit ``incremental_extraction: true`` werden Seiten nur so lange gelesen,
+    bis alle Pflichtfelder gefunden sind (siehe :func:`_extract_incremental`).
+    Ein bereits berechnetes ``content_hash`` erspart das erneute Hashen.
+    """
+
     cfg = load_config(config)
-    pats = load_patterns(patterns if patterns is not None else patterns_path)
-    text, method = extract_text_from_pdf(
-        pdf_path,
-        use_ocr=bool(cfg.get("use_ocr", True)),
-        poppler_path=str(cfg.get("poppler_path") or "") or None,
-        tesseract_cmd=str(cfg.get("tesseract_cmd") or "") or None,
-        tesseract_lang=str(cfg.get("tesseract_lang") or "deu+eng"),
-    )
-    invoice_no = extract_invoice_no(text, pats.get("invoice_number_patterns", []) or [])
-    invoice_date = extract_date(text, pats.get("date_patterns", []) or [])
-    supplier = detect_supplier(text, pats.get("supplier_hints", {}) or {})
+    pats = compile_patterns(patterns if patterns is not None else patterns_path)
+    profiler = None
+    if cfg.get("profile_dir"):
+        from profiling import get_profiler  # cProfile/tracemalloc nur bei Bedarf laden
+
+        profiler = get_profiler(cfg)
+    if profiler is not None:
+        with profiler.document(pdf_path) as sampled:
+            if sampled:
+                # cProfile sieht nur den eigenen Thread: OCR-Seiten hier seriell
+                cfg = dict(cfg, ocr_workers=1)
+            return _analyze_pdf(pdf_path, cfg, pats, content_hash)
+    return _analyze_pdf(pdf_path, cfg, pats, content_hash)
+
+
+def _analyze_pdf(
+    pdf_path: PathLike, cfg: Mapping[str, object], pats: CompiledPatterns, content_hash: Optional[str] = None
+) -> Dict[str, object]:
+    ocr_engine.use(cfg)
+    with _collect_timings(_timings_enabled(cfg)) as stage_times:
+        # Einmal hashen: dient Text-Cache und Ergebnis-Datenbank
+        if content_hash is None:
+            with _stage("hash"):
+                try:
+                    content_hash = compute_content_hash(pdf_path)
+                except OSError:
+                    content_hash = None
+        early_exit = False
+        details: Dict[str, object] = {}
+        zone_hit = None
+        if cfg.get("ocr_zone_first") and cfg.get("use_ocr", True):
+            zone_hit = _extract_zones_first(pdf_path, cfg, pats, content_hash)
+        if zone_hit is not None:
+            text, method, page_count = zone_hit
+            pages_read, early_exit = 1, page_count > 1
+        elif cfg.get("incremental_extraction"):
+            text, method, page_count, pages_read, early_exit = _extract_incremental(
+                pdf_path, cfg, pats, content_hash, details
+            )
+        else:
+            text, method, page_count = extract_text_result(
+                pdf_path,
+                cache=get_text_cache(cfg),
+                content_hash=content_hash,
+                details=details,
+                **extraction_options(cfg),  # type: ignore[arg-type]
+            )
+            pages_read = page_count
+        with _stage("fields"):
+            fields = pats.fields.extract(text)
+            supplier = detect_supplier(text, pats.supplier_matcher)
+        invoice_no = fields["invoice_no"].value if fields["invoice_no"] else None
+        invoice_date = fields["invoice_date"].value if fields["invoice_date"] else None
 
     unknown_dir_name = str(cfg.get("unknown_dir_name") or DEFAULT_CONFIG["unknown_dir_name"])
     supplier_value = supplier or unknown_dir_name
@@ -373,13 +2096,30 @@ def analyze_pdf(
     validation_status = "ok" if (invoice_no and invoice_date and supplier) else "needs_review"
     result: Dict[str, object] = {
         "source": str(pdf_path),
+        "content_hash": content_hash,
         "invoice_no": invoice_no,
         "invoice_date": invoice_date,
         "supplier": supplier_value,
+        "total_gross": fields["total_gross"].value if fields["total_gross"] else None,
+        "total_net": fields["total_net"].value if fields["total_net"] else None,
+        "tax_amount": fields["tax_amount"].value if fields["tax_amount"] else None,
+        "field_offsets": {
+            name: [match.start, match.end] for name, match in fields.items() if match is not None
+        },
         "text_method": method,
         "text_length": len(text),
+        "page_count": page_count,
+        "pages_read": pages_read,
+        "early_exit": early_exit,
         "validation_status": validation_status,
     }
+    page_dpi = details.get("ocr_dpi") or {}
+    if page_dpi:
+        # höchste benötigte Auflösung plus Aufschlüsselung je Seite (JSON-fest)
+        result["ocr_dpi"] = max(page_dpi.values())  # type: ignore[union-attr]
+        result["ocr_page_dpi"] = {str(page): dpi for page, dpi in sorted(page_dpi.items())}  # type: ignore[union-attr]
+    if stage_times is not None:
+        result["timings_ms"] = stage_times.as_dict()
     return result
 
 
@@ -391,15 +2131,28 @@ def process_pdf(
     config: Optional[Mapping[str, object]] = None,
     patterns: Optional[Mapping[str, object]] = None,
     simulate: Optional[bool] = None,
+    analysis: Optional[Mapping[str, object]] = None,
 ) -> Dict[str, object]:
+    """Analysiert eine PDF (oder übernimmt ``analysis``) und legt sie im Zielordner ab."""
+
     path = Path(pdf_path)
     if not path.exists():
         raise FileNotFoundError(f"PDF nicht gefunden: {path}")
 
     cfg = load_config(config if config is not None else config_path)
-    pats = load_patterns(patterns if patterns is not None else patterns_path)
+    effective_simulate = simulate if simulate is not None else bool(cfg.get("dry_run", False))
 
-    analysis = analyze_pdf(path, config=cfg, patterns=pats)
+    # Exakte Duplikate vor Textextraktion/OCR aussortieren
+    content_hash = analysis.get("content_hash") if analysis is not None else None
+    original = find_duplicate(path, cfg, content_hash=content_hash)  # type: ignore[arg-type]
+    if original is not None:
+        return _place_duplicate(path, cfg, original, effective_simulate)
+    if analysis is not None and analysis.get("duplicate_only"):
+        analysis = None  # Original inzwischen nicht mehr bekannt: doch analysieren
+
+    if analysis is None:
+        pats = compile_patterns(patterns if patterns is not None else patterns_path)
+        analysis = analyze_pdf(path, config=cfg, patterns=pats)
 
     unknown_dir_name = str(cfg.get("unknown_dir_name") or DEFAULT_CONFIG["unknown_dir_name"])
     output_dir = Path(str(cfg.get("output_dir") or DEFAULT_CONFIG["output_dir"]))
@@ -425,16 +2178,21 @@ def process_pdf(
         filename = str(fallback_fmt).format(**values)
     filename = _ensure_filename(filename)
 
-    target_path = _unique_path(target_dir, filename)
+    # zweite Stufe: gleiche Rechnung als andere Datei (neuer Scan, Mail-Anhang …)
+    suspect = _semantic_duplicate(cfg, supplier_value, analysis)
 
-    effective_simulate = simulate if simulate is not None else bool(cfg.get("dry_run", False))
-    moved = False
-    if not effective_simulate:
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(path), str(target_path))
-        moved = True
+    with _collect_timings(_timings_enabled(cfg)) as stage_times:
+        target_path, moved = _place(path, target_dir, filename, effective_simulate)
 
     result = dict(analysis)
+    if stage_times is not None:
+        # Analysezeiten (ggf. aus einem Worker) plus Ablage
+        result["timings_ms"] = {**dict(analysis.get("timings_ms") or {}), **stage_times.as_dict()}
+        _emit_timings(str(path), result["timings_ms"])  # type: ignore[arg-type]
+    if suspect is not None:
+        result["duplicate_of"] = suspect.get("destination")
+        if result.get("validation_status") == "ok":
+            result["validation_status"] = "needs_review"
     result.update(
         {
             "target": str(target_path),
@@ -452,9 +2210,251 @@ def process_pdf(
             "supplier": supplier_value,
         }
     )
+    record_result(cfg, result)
     return result
 
 
+def _place(path: Path, target_dir: Path, filename: str, simulate: bool) -> Tuple[Path, bool]:
+    """Wählt einen freien Zielnamen und verschiebt ``path`` dorthin (außer im Trockenlauf)."""
+
+    with _stage("move"):
+        if simulate:
+            return _unique_path(target_dir, filename), False
+        target_path = _unique_path(target_dir, filename, reserve=True)
+        try:
+            _move_onto(path, target_path)
+        except BaseException:
+            _directory_index(target_dir).release(target_path)
+            raise
+        _directory_index(target_dir).placed(target_path)
+        return target_path, True
+
+
+def _duplicate_action(cfg: Mapping[str, object]) -> str:
+    action = str(cfg.get("duplicate_action") or "off").strip().lower()
+    return action if action in ("move", "skip") else "off"
+
+
+def find_duplicate(
+    pdf_path: PathLike, cfg: Mapping[str, object], *, content_hash: Optional[str] = None
+) -> Optional[Dict[str, object]]:
+    """Sucht die Erstablage einer inhaltsgleichen PDF in der Ergebnis-Datenbank.
+
+    Nur aktiv mit ``duplicate_action`` ``move``/``skip`` und ``result_db_path``.
+    Liefert die Zeile der Erstablage oder ``None``.
+    """
+
+    if _duplicate_action(cfg) == "off":
+        return None
+    try:
+        store = get_result_store(cfg)
+    except Exception as exc:
+        print(f"[Sorter] Ergebnis-Datenbank nicht verfügbar: {exc}", file=sys.stderr)
+        return None
+    if store is None:
+        return None
+    if content_hash is None:
+        try:
+            content_hash = compute_content_hash(pdf_path)
+        except OSError:
+            return None
+    try:
+        original = store.original(content_hash=content_hash)
+    except Exception as exc:
+        print(f"[Sorter] Ergebnis-Datenbank nicht lesbar: {exc}", file=sys.stderr)
+        return None
+    if original is None:
+        return None
+    original["content_hash"] = content_hash
+    return original
+
+
+def _place_duplicate(
+    path: Path, cfg: Mapping[str, object], original: Mapping[str, object], simulate: bool
+) -> Dict[str, object]:
+    """Legt ein exaktes Duplikat in ``duplicates_dir_name`` ab oder lässt es liegen (``skip``).
+
+    Ein liegengelassenes Duplikat wird nur beim ersten Lauf eingetragen;
+    spätere Läufe liefern ``already_recorded`` und schreiben keine Zeile mehr.
+    """
+
+    target_path, moved = path, False
+    action = _duplicate_action(cfg)
+    if action == "move":
+        output_dir = Path(str(cfg.get("output_dir") or DEFAULT_CONFIG["output_dir"]))
+        dup_dir = output_dir / (
+            _sanitize_component(str(cfg.get("duplicates_dir_name") or "")) or "duplicates"
+        )
+        if not simulate:
+            dup_dir.mkdir(parents=True, exist_ok=True)
+        target_path, moved = _place(path, dup_dir, path.name, simulate)
+    result: Dict[str, object] = {
+        "source": str(path),
+        "content_hash": original.get("content_hash"),
+        "invoice_no": original.get("invoice_no"),
+        "invoice_date": original.get("invoice_date"),
+        "supplier": original.get("supplier"),
+        "total_gross": original.get("total_gross"),
+        "total_net": original.get("total_net"),
+        "tax_amount": original.get("tax_amount"),
+        "duplicate_of": original.get("destination"),
+        "text_method": "duplicate",
+        "validation_status": "duplicate",
+        "status": "duplicate",
+        "target_path": str(target_path),
+        "destination": str(target_path),
+        "simulate": simulate,
+        "moved": moved,
+        "original_filename": path.name,
+    }
+    if action == "skip" and _skip_recorded(cfg, path, original.get("content_hash")):
+        result["already_recorded"] = True
+    else:
+        record_result(cfg, result)
+    return result
+
+
+def _skip_recorded(cfg: Mapping[str, object], path: Path, content_hash: object) -> bool:
+    """Steht ``path`` schon als liegengelassenes Duplikat in der Ergebnis-Datenbank?"""
+
+    if not content_hash:
+        return False
+    try:
+        store = get_result_store(cfg)
+        if store is None:
+            return False
+        rows = store.find(content_hash=str(content_hash), status="duplicate")
+    except Exception as exc:
+        print(f"[Sorter] Ergebnis-Datenbank nicht lesbar: {exc}", file=sys.stderr)
+        return False
+    return any(row.get("source") == str(path) == row.get("destination") for row in rows)
+
+
+def _semantic_duplicate(
+    cfg: Mapping[str, object], supplier: str, analysis: Mapping[str, object]
+) -> Optional[Dict[str, object]]:
+    if not cfg.get("flag_semantic_duplicates"):
+        return None
+    invoice_no = analysis.get("invoice_no")
+    unknown = _sanitize_component(str(cfg.get("unknown_dir_name") or DEFAULT_CONFIG["unknown_dir_name"]))
+    if not invoice_no or not supplier or supplier == unknown:
+        return None
+    try:
+        store = get_result_store(cfg)
+        if store is None:
+            return None
+        return store.original(supplier=supplier, invoice_no=str(invoice_no))
+    except Exception as exc:
+        print(f"[Sorter] Ergebnis-Datenbank nicht lesbar: {exc}", file=sys.stderr)
+        return None
+
+
+def open_csv_log(path: PathLike, config: Optional[Mapping[str, object]] = None) -> CsvLogSink:
+    """Öffnet den gepufferten CSV-Log mit den ``csv_*``-Einstellungen."""
+
+    cfg = config or {}
+    try:
+        flush_seconds = float(cfg.get("csv_flush_seconds", DEFAULT_CONFIG["csv_flush_seconds"]))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        flush_seconds = float(DEFAULT_CONFIG["csv_flush_seconds"])
+    return CsvLogSink(
+        path,
+        CSV_COLUMNS,
+        flush_rows=_int_setting(cfg, "csv_flush_rows", int(DEFAULT_CONFIG["csv_flush_rows"])),
+        flush_seconds=flush_seconds,
+        max_bytes=_int_setting(cfg, "csv_max_mb", 0) * 1024 * 1024,
+    )
+
+
+def _resolve_jobs(value: object) -> int:
+    try:
+        jobs = int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+# Bibliotheken, die erst bei der ersten Extraktion geladen werden
+_HEAVY_MODULES = ("fitz", "PyPDF2", "pdf2image", "pytesseract", "tesserocr", "PIL.Image")
+
+
+def warm_up(cfg: Mapping[str, object]) -> Dict[str, object]:
+    """Lädt die PDF/OCR-Bibliotheken vorab und startet Tesseract einmal.
+
+    Für Dienste wie den Hotfolder, damit das erste Dokument nicht die
+    Importzeit und den kalten Start von Tesseract (Sprachdaten) bezahlt.
+    Mit tesserocr bleibt die dabei geladene Engine für alle Seiten im
+    Prozess. Liefert je Modul die Ladezeit in ms (``None`` = nicht
+    installiert).
+    """
+
+    import importlib
+    from time import perf_counter
+
+    loaded: Dict[str, Optional[float]] = {}
+    for name in _HEAVY_MODULES:
+        start = perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            loaded[name] = None
+            continue
+        loaded[name] = round((perf_counter() - start) * 1000, 1)
+    engine = ocr_engine.use(cfg)
+    report: Dict[str, object] = {"modules": loaded, "ocr_backend": engine.name}
+    if cfg.get("use_ocr", True) and loaded.get("PIL.Image") is not None:
+        if _prepare_ocr(str(cfg.get("tesseract_cmd") or "") or None, _resolve_ocr_workers(cfg)):
+            from PIL import Image  # type: ignore
+
+            start = perf_counter()
+            try:
+                engine.read(Image.new("L", (64, 32), 255), str(cfg.get("tesseract_lang") or "deu+eng"))
+            except Exception as exc:
+                report["tesseract_error"] = str(exc)
+            else:
+                report["tesseract_ms"] = round((perf_counter() - start) * 1000, 1)
+    return report
+
+
+_WORKER_STATE: Dict[str, object] = {}
+
+
+def _init_worker(cfg: Mapping[str, object], pats: CompiledPatterns) -> None:
+    # Konfiguration und kompilierte Muster einmal je Worker-Prozess übergeben
+    # statt mit jedem Auftrag neu zu picklen/kompilieren.
+    _WORKER_STATE["cfg"] = cfg
+    _WORKER_STATE["pats"] = pats
+    if cfg.get("warmup"):
+        warm_up(cfg)
+
+
+def _analyze_job(pdf_path: str) -> Dict[str, object]:
+    """Einstiegspunkt für Worker-Prozesse – nur Analyse, kein Verschieben.
+
+    Die Duplikatprüfung läuft hier statt im Koordinator: der Hash entsteht
+    einmal, im Worker. Bekannte Duplikate liefern nur ``content_hash`` und
+    ``duplicate_only``; :func:`process_pdf` legt sie ohne Analyse ab.
+    """
+
+    cfg: Mapping[str, object] = _WORKER_STATE["cfg"]  # type: ignore[assignment]
+    content_hash: Optional[str] = None
+    if _duplicate_action(cfg) != "off":
+        try:
+            content_hash = compute_content_hash(pdf_path)
+        except OSError:
+            content_hash = None
+        if content_hash is not None and find_duplicate(pdf_path, cfg, content_hash=content_hash) is not None:
+            return {"content_hash": content_hash, "duplicate_only": True}
+    return analyze_pdf(
+        pdf_path,
+        config=cfg,
+        patterns=_WORKER_STATE["pats"],  # type: ignore[arg-type]
+        content_hash=content_hash,
+    )
+
+
 def process_all(
     config_path: Optional[PathLike] = None,
     patterns_path: Optional[PathLike] = None,
@@ -465,9 +2465,18 @@ def process_all(
     config: Optional[Mapping[str, object]] = None,
     patterns: Optional[Mapping[str, object]] = None,
     simulate: Optional[bool] = None,
+    jobs: Optional[int] = None,
 ) -> None:
+    """Verarbeitet alle PDFs aus ``input_dir``.
+
+    Mit ``jobs`` > 1 (oder ``jobs: N`` in der Konfiguration, 0 = alle Kerne)
+    läuft ``analyze_pdf`` in einem Prozess-Pool. Zielnamen, Verschieben,
+    ``progress_fn`` und CSV-Log bleiben im aufrufenden Prozess und folgen der
+    sortierten Eingangsreihenfolge.
+    """
+
     cfg = load_config(config if config is not None else config_path)
-    pats = load_patterns(patterns if patterns is not None else patterns_path)
+    pats = compile_patterns(patterns if patterns is not None else patterns_path)
 
     input_dir = Path(str(cfg.get("input_dir") or DEFAULT_CONFIG["input_dir"]))
     output_dir = Path(str(cfg.get("output_dir") or DEFAULT_CONFIG["output_dir"]))
@@ -479,6 +2488,9 @@ def process_all(
     unknown_dir.mkdir(parents=True, exist_ok=True)
 
     effective_simulate = simulate if simulate is not None else bool(cfg.get("dry_run", False))
+    effective_jobs = _resolve_jobs(jobs if jobs is not None else cfg.get("jobs", 1))
+    # registrierte Hooks brauchen die Zeiten auch aus den Worker-Prozessen
+    cfg["stage_timings"] = _timings_enabled(cfg)
 
     files = sorted(
         p for p in input_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pdf"
@@ -486,27 +2498,56 @@ def process_all(
     total = len(files)
 
     csv_path = Path(str(log_csv_path or cfg.get("csv_log_path") or "")).expanduser()
-    csv_file = None
-    csv_writer = None
-    if csv_path and csv_path.name:
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-        csv_file = csv_path.open("a", encoding="utf-8", newline="")
-        csv_writer = csv.writer(csv_file, delimiter=";")
-        if csv_path.stat().st_size == 0:
-            csv_writer.writerow(
+    csv_sink = open_csv_log(csv_path, cfg) if csv_path.name else None
+
+    def _fail_result(pdf: Path, exc: Exception) -> Dict[str, object]:
+        target_path = unknown_dir / pdf.name
+        if not effective_simulate:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                shutil.move(str(pdf), str(target_path))
+            except Exception:
+                target_path = pdf
+        result: Dict[str, object] = {
+            "source": str(pdf),
+            "invoice_no": None,
+            "invoice_date": None,
+            "supplier": unknown_dir_name,
+            "validation_status": "fail",
+            "status": "fail",
+            "target_path": str(target_path),
+            "destination": str(target_path),
+            "error": str(exc),
+            "simulate": effective_simulate,
+        }
+        record_result(cfg, result)
+        return result
+
+    def _report(idx: int, pdf: Path, result: Mapping[str, object]) -> None:
+        if progress_fn:
+            try:
+                progress_fn(idx, total, str(pdf), SimpleNamespace(**result))
+            except Exception:
+                pass
+        if csv_sink and not result.get("already_recorded"):
+            timings_ms = result.get("timings_ms") or {}
+            csv_sink.write(
                 [
-                    "timestamp",
-                    "source",
-                    "destination",
-                    "invoice_no",
-                    "supplier",
-                    "invoice_date",
-                    "status",
+                    datetime.now().isoformat(timespec="seconds"),
+                    str(pdf),
+                    result.get("destination") or result.get("target_path"),
+                    result.get("invoice_no"),
+                    result.get("supplier"),
+                    result.get("invoice_date"),
+                    result.get("validation_status") or result.get("status"),
+                    result.get("total_gross"),
+                    result.get("total_net"),
+                    result.get("tax_amount"),
+                    *(timings_ms.get(name) for name in TIMING_STAGES),
                 ]
             )
-            csv_file.flush()
 
-    try:
+    def _run_sequential() -> None:
         for idx, pdf in enumerate(files, start=1):
             if stop_fn and stop_fn():
                 break
@@ -518,55 +2559,145 @@ def process_all(
                     simulate=effective_simulate,
                 )
             except Exception as exc:
-                target_path = unknown_dir / pdf.name
-                if not effective_simulate:
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
+                result = _fail_result(pdf, exc)
+            _report(idx, pdf, result)
+
+    def _run_parallel() -> None:
+        # Nur ein begrenztes Fenster an Aufträgen ist eingereicht, damit ein
+        # Stop nicht erst tausende bereits eingeplante Analysen abwarten muss.
+        window = effective_jobs * 2
+        todo = iter(enumerate(files, start=1))
+        pending: Deque[Tuple[int, Path, Optional[Future]]] = deque()
+        from concurrent.futures import ProcessPoolExecutor  # lädt multiprocessing erst hier
+
+        def _new_pool() -> ProcessPoolExecutor:
+            return ProcessPoolExecutor(max_workers=effective_jobs, initializer=_init_worker, initargs=(cfg, pats))
+
+        pool = _new_pool()
+        stopped = False
+        # Dateien, die bereits einmal allein in einem neuen Pool liefen
+        retried: Set[int] = set()
+
+        def _submit(pdf: Path) -> Future:
+            try:
+                return pool.submit(_analyze_job, str(pdf))
+            except BrokenExecutor as exc:
+                # Pool ist schon kaputt: der Fehler kommt beim Abholen und löst dort den Neustart aus
+                future: Future = Future()
+                future.set_exception(exc)
+                return future
+
+        def _fill() -> None:
+            nonlocal pending
+            if any(future is None for _idx, _pdf, future in pending):
+                # nach einem Pool-Neustart: verbliebene Aufträge neu einreichen
+                pending = deque(
+                    (idx, pdf, future if future is not None else _submit(pdf))
+                    for idx, pdf, future in pending
+                )
+            while len(pending) < window:
+                item = next(todo, None)
+                if item is None:
+                    return
+                idx, pdf = item
+                pending.append((idx, pdf, _submit(pdf)))
+
+        try:
+            _fill()
+            while pending:
+                idx, pdf, future = pending.popleft()
+                analysis: Optional[Dict[str, object]] = None
+                error: Optional[Exception] = None
+                while future is not None:
+                    if stop_fn and stop_fn():
+                        stopped = True
+                        break
                     try:
-                        shutil.move(str(pdf), str(target_path))
-                    except Exception:
-                        target_path = pdf
-                result = {
-                    "source": str(pdf),
-                    "invoice_no": None,
-                    "invoice_date": None,
-                    "supplier": unknown_dir_name,
-                    "validation_status": "fail",
-                    "status": "fail",
-                    "target_path": str(target_path),
-                    "destination": str(target_path),
-                    "error": str(exc),
-                }
-            if progress_fn:
+                        analysis = future.result(timeout=_STOP_POLL_INTERVAL)
+                    except FuturesTimeoutError:
+                        continue
+                    except BrokenExecutor as exc:
+                        # Ein Worker ist abgestürzt (z. B. Segfault in einer
+                        # PDF-Bibliothek) und hat alle Aufträge mitgerissen.
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = _new_pool()
+                        pending = deque((i, p, None) for i, p, _f in pending)
+                        if idx in retried:
+                            error = RuntimeError(f"Worker-Prozess abgebrochen ({exc})")
+                            break
+                        # allein wiederholen: stürzt der Pool erneut ab, war es diese Datei
+                        retried.add(idx)
+                        future = _submit(pdf)
+                        continue
+                    except Exception as exc:
+                        error = exc
+                    break
+                if stopped:
+                    for _idx, _pdf, other in [(idx, pdf, future), *pending]:
+                        if other is not None:
+                            other.cancel()
+                    break
                 try:
-                    progress_fn(idx, total, str(pdf), SimpleNamespace(**result))
-                except Exception:
-                    pass
-            if csv_writer:
-                csv_writer.writerow(
-                    [
-                        datetime.now().isoformat(timespec="seconds"),
-                        str(pdf),
-                        result.get("destination") or result.get("target_path"),
-                        result.get("invoice_no"),
-                        result.get("supplier"),
-                        result.get("invoice_date"),
-                        result.get("validation_status") or result.get("status"),
-                    ]
-                )
-                csv_file.flush()
+                    if error is not None:
+                        raise error
+                    result = process_pdf(
+                        pdf,
+                        config=cfg,
+                        patterns=pats,
+                        simulate=effective_simulate,
+                        analysis=analysis,
+                    )
+                except Exception as exc:
+                    result = _fail_result(pdf, exc)
+                _report(idx, pdf, result)
+                _fill()
+        finally:
+            pool.shutdown(wait=not stopped, cancel_futures=True)
+
+    profile_dir = str(cfg.get("profile_dir") or "")
+    profile_since = time.time()
+    try:
+        if effective_jobs > 1 and total > 1:
+            _run_parallel()
+        else:
+            _run_sequential()
     finally:
-        if csv_file:
-            csv_file.close()
+        if csv_sink:
+            csv_sink.close()
+        if profile_dir:
+            from profiling import write_report as write_profile_report
+
+            report_path = write_profile_report(
+                profile_dir, since=profile_since, top=_int_setting(cfg, "profile_top", 30)
+            )
+            if report_path is not None:
+                print(f"[Sorter] Profilbericht: {report_path}")
 
 
 __all__ = [
     "load_config",
     "load_patterns",
+    "CompiledPatterns",
+    "compile_patterns",
+    "compute_content_hash",
+    "get_text_cache",
+    "get_result_store",
+    "record_result",
+    "find_duplicate",
     "extract_text_from_pdf",
+    "extract_text_result",
+    "extraction_options",
     "extract_invoice_no",
     "extract_date",
+    "FIELD_PATTERN_KEYS",
+    "FieldMatch",
+    "FieldExtractor",
+    "CSV_COLUMNS",
+    "open_csv_log",
     "detect_supplier",
+    "SupplierMatcher",
     "analyze_pdf",
     "process_pdf",
     "process_all",
+    "warm_up",
 ]
@@ -0,0 +1,69 @@
+import random
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+
+def _strptime_cascade(candidate):
+    # bisherige Implementierung als Referenz
+    candidate = re.sub(r"\s+", "", candidate.strip().replace("\\", "."))
+    if not candidate:
+        return None
+    for fmt in (
+        "%d.%m.%Y", "%d.%m.%y", "%Y-%m-%d", "%d-%m-%Y", "%d-%m-%y", "%Y/%m/%d",
+        "%d/%m/%Y", "%d/%m/%y", "%Y.%m.%d", "%Y%m%d", "%d%m%Y",
+    ):
+        try:
+            dt = datetime.strptime(candidate, fmt)
+        except ValueError:
+            continue
+        if 1900 <= dt.year <= 2100:
+            return dt.strftime("%Y-%m-%d")
+    parts = re.sub(r"[./]", "-", candidate).split("-")
+    if len(parts) == 3:
+        a, b, c = parts
+        try:
+            dt = datetime(int(a), int(b), int(c)) if len(a) == 4 else datetime(int(c), int(b), int(a))
+        except ValueError:
+            return None
+        if 1900 <= dt.year <= 2100:
+            return dt.strftime("%Y-%m-%d")
+    return None
+
+
+def test_normalize_date_matches_strptime_cascade():
+    rng = random.Random(7)
+    candidates = ["03.02.2024", "3.2.24", "2024-02-03", "2024/2/3", "20240203", "03022024",
+                  "29.02.2023", "29.02.2024", "01.01.1800", "003.02.2024", "03.02-2024", " 3 . 2 . 2024 ",
+                  "2024\\02\\03", "", "abc", "1.1"]
+    for _ in range(5000):
+        candidates.append("".join(rng.choice("0123456789./- ") for _ in range(rng.randint(1, 11))))
+    for candidate in candidates:
+        assert sorter._normalize_date_candidate(candidate) == _strptime_cascade(candidate), candidate
+
+
+def test_normalize_date_month_names():
+    normalize = sorter._normalize_date_candidate
+    assert normalize("3. März 2024") == "2024-03-03"
+    assert normalize("03. Mrz. 2024") == "2024-03-03"
+    assert normalize("1. Dezember 23") == "2023-12-01"
+    assert normalize("12 Jan 2024") == "2024-01-12"
+    assert normalize("31. Februar 2024") is None
+    assert normalize("3. Foo 2024") is None
+
+
+def test_normalize_date_memo_is_bounded():
+    assert sorter._normalize_date_candidate.cache_info().maxsize == sorter._DATE_MEMO_SIZE
+
+
+def test_extract_date_with_month_name_pattern():
+    pats = sorter.compile_patterns(ROOT / "patterns" / "patterns.yaml")
+
+    assert sorter.extract_date("Rechnungsdatum: 3. März 2024", pats.date) == "2024-03-03"
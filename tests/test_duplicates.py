@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+TEXT = "Telekom Deutschland GmbH\nRechnungsnummer: 4711\nDatum: 03.02.2024"
+
+
+def _setup(tmp_path, monkeypatch, **cfg):
+    calls = []
+
+    def fake_extract(path, **kwargs):
+        calls.append(Path(path).name)
+        return TEXT, "text", 1
+
+    monkeypatch.setattr(sorter, "extract_text_result", fake_extract)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    config = {
+        "input_dir": str(inbox),
+        "output_dir": str(tmp_path / "out"),
+        "result_db_path": str(tmp_path / "results.sqlite"),
+        **cfg,
+    }
+    return inbox, config, calls
+
+
+def _run(config):
+    sorter.process_all(
+        config=config, patterns=sorter.compile_patterns(ROOT / "patterns" / "patterns.yaml")
+    )
+
+
+def test_exact_duplicate_is_moved_without_extraction(tmp_path, monkeypatch):
+    inbox, config, calls = _setup(tmp_path, monkeypatch, duplicate_action="move")
+    (inbox / "a.pdf").write_bytes(b"%PDF same")
+    _run(config)
+    (inbox / "b.pdf").write_bytes(b"%PDF same")
+    _run(config)
+
+    assert calls == ["a.pdf"]
+    assert (tmp_path / "out" / "duplicates" / "b.pdf").exists()
+    row = sorter.get_result_store(config).find(status="duplicate")[0]
+    assert row["source"].endswith("b.pdf") and row["invoice_no"] == "4711"
+
+
+def test_exact_duplicate_skip_leaves_file_and_off_keeps_old_behaviour(tmp_path, monkeypatch):
+    inbox, config, calls = _setup(tmp_path, monkeypatch, duplicate_action="skip")
+    (inbox / "a.pdf").write_bytes(b"%PDF same")
+    _run(config)
+    (inbox / "b.pdf").write_bytes(b"%PDF same")
+    _run(config)
+    assert calls == ["a.pdf"]
+    assert (inbox / "b.pdf").exists()
+
+    config["duplicate_action"] = "off"
+    _run(config)
+    assert calls == ["a.pdf", "b.pdf"]
+    assert not (inbox / "b.pdf").exists()
+
+
+def test_skipped_duplicate_is_recorded_once(tmp_path, monkeypatch):
+    inbox, config, calls = _setup(tmp_path, monkeypatch, duplicate_action="skip")
+    config["csv_log_path"] = str(tmp_path / "processed.csv")
+    (inbox / "a.pdf").write_bytes(b"%PDF same")
+    _run(config)
+    (inbox / "b.pdf").write_bytes(b"%PDF same")
+    for _ in range(3):
+        _run(config)
+
+    assert calls == ["a.pdf"] and (inbox / "b.pdf").exists()
+    assert len(sorter.get_result_store(config).find(status="duplicate")) == 1
+    rows = (tmp_path / "processed.csv").read_text(encoding="utf-8").splitlines()
+    assert sum("b.pdf" in row for row in rows) == 1
+
+
+def test_simulated_duplicate_move_creates_no_folder(tmp_path, monkeypatch):
+    inbox, config, calls = _setup(tmp_path, monkeypatch, duplicate_action="move")
+    (inbox / "a.pdf").write_bytes(b"%PDF same")
+    _run(config)
+    (inbox / "b.pdf").write_bytes(b"%PDF same")
+    config["dry_run"] = True
+    _run(config)
+
+    assert (inbox / "b.pdf").exists()
+    assert not (tmp_path / "out" / "duplicates").exists()
+
+
+def test_semantic_duplicate_is_flagged(tmp_path, monkeypatch):
+    inbox, config, calls = _setup(
+        tmp_path, monkeypatch, duplicate_action="move", flag_semantic_duplicates=True
+    )
+    patterns = sorter.compile_patterns(
+        {"invoice_number_patterns": [r"Rechnungsnummer:\s*(\d+)"], "date_patterns": [r"Datum:\s*([\d.]+)"],
+         "supplier_hints": {"Telekom": ["telekom"]}}
+    )
+    first = inbox / "a.pdf"
+    first.write_bytes(b"%PDF original")
+    original = sorter.process_pdf(first, config=config, patterns=patterns)
+    rescan = inbox / "scan.pdf"
+    rescan.write_bytes(b"%PDF neu gescannt")
+    result = sorter.process_pdf(rescan, config=config, patterns=patterns)
+
+    assert original["validation_status"] == "ok" and "duplicate_of" not in original
+    assert result["duplicate_of"] == original["destination"]
+    assert result["validation_status"] == "needs_review"
+    assert Path(result["destination"]).parent.name == "Telekom"
@@ -0,0 +1,94 @@
+import csv
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+SAMPLE = (
+    "Telekom Deutschland GmbH\n"
+    "Rechnungsdatum: 03.02.2024\nRechnungsnummer: 4711-0815-23\n"
+    "Nettobetrag 41,17 EUR\nMwSt 19% 7,82 EUR\nGesamtbetrag 1.048,99 EUR\n"
+)
+
+
+def _patterns():
+    return sorter.compile_patterns(ROOT / "patterns" / "patterns.yaml")
+
+
+def test_field_extractor_matches_single_extractors():
+    pats = _patterns()
+    texts = [
+        SAMPLE,
+        "Datum: 31.12.2023 Invoice No: ab-123/45",
+        "rechnungsnr 99/2024-7 ... Date: 2024-05-06",
+        "Datum: 99.99.2024 Datum: 01.02.2024",
+        "ohne Felder",
+        "",
+    ]
+    for text in texts:
+        fields = pats.fields.extract(text)
+        invoice = fields["invoice_no"].value if fields["invoice_no"] else None
+        date = fields["invoice_date"].value if fields["invoice_date"] else None
+        assert invoice == sorter.extract_invoice_no(text, pats.invoice_number)
+        assert date == sorter.extract_date(text, pats.date)
+
+
+def test_field_extractor_amounts_and_offsets():
+    fields = _patterns().fields.extract(SAMPLE)
+
+    assert fields["total_gross"].value == "1048.99"
+    assert fields["tax_amount"].value == "7.82"
+    assert fields["total_net"] is None  # "Nettobetrag" passt auf kein Netto-Muster
+    match = fields["invoice_no"]
+    assert SAMPLE[match.start : match.end] == "4711-0815-23"
+    assert match.pattern_index == 0
+
+
+def test_field_extractor_patterns_without_anchor_and_casefolding():
+    pats = sorter.compile_patterns(
+        {
+            "invoice_number_patterns": [r"(?:Nr|No)\.\s*(\d+)"],
+            "total_gross_patterns": [r"summe\s*([0-9.,]+)"],
+        }
+    )
+    fields = pats.fields.extract("SUMME 12,5\nNo. 4711")
+
+    assert fields["invoice_no"].value == "4711"
+    assert fields["total_gross"].value == "12.50"
+
+
+def test_normalize_amount():
+    assert sorter._normalize_amount("1.234,56") == "1234.56"
+    assert sorter._normalize_amount("1,234.56") == "1234.56"
+    assert sorter._normalize_amount("48,99.") == "48.99"
+    assert sorter._normalize_amount("1.234") == "1234.00"
+    assert sorter._normalize_amount(",.") is None
+
+
+def test_process_all_writes_amount_columns(tmp_path, monkeypatch):
+    input_dir = tmp_path / "inbox"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_text("dummy")
+    monkeypatch.setattr(
+        sorter, "extract_text_result", lambda *args, **kwargs: (SAMPLE, "text", 1)
+    )
+    csv_path = tmp_path / "log.csv"
+
+    sorter.process_all(
+        config={
+            "input_dir": str(input_dir),
+            "output_dir": str(tmp_path / "out"),
+            "dry_run": True,
+            "csv_log_path": str(csv_path),
+        },
+        patterns=_patterns(),
+    )
+
+    with csv_path.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle, delimiter=";"))
+    assert list(rows[0]) == sorter.CSV_COLUMNS
+    assert (rows[0]["total_gross"], rows[0]["total_net"], rows[0]["tax_amount"]) == ("1048.99", "", "7.82")
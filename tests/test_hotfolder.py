@@ -0,0 +1,280 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import wait
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import hotfolder
+
+
+def test_debouncer_waits_until_file_is_stable(tmp_path):
+    now = [0.0]
+    debouncer = hotfolder.Debouncer(clock=lambda: now[0])
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1")
+    debouncer.touch(pdf, 0.5)
+
+    assert debouncer.pop_ready() == []
+    pdf.write_bytes(b"%PDF-1.4 noch im Schreiben")
+    now[0] = 0.6
+    assert debouncer.pop_ready() == []  # geändert -> neue Frist
+    assert debouncer.next_timeout() == pytest.approx(0.5)
+    now[0] = 1.2
+    assert debouncer.pop_ready() == [pdf]
+    assert len(debouncer) == 0
+
+
+def _run_watch(inbox, mode, **kwargs):
+    handled = []
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=hotfolder.watch,
+        args=(inbox, handled.append),
+        kwargs=dict(mode=mode, stop_fn=stop.is_set, **kwargs),
+        daemon=True,
+    )
+    thread.start()
+    return handled, stop, thread
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify nur unter Linux")
+def test_watch_inotify_picks_up_closed_and_moved_files(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "vorher.pdf").write_bytes(b"%PDF")
+    handled, stop, thread = _run_watch(inbox, "inotify", debounce=0.01)
+    try:
+        assert _wait_for(lambda: len(handled) == 1)
+        start = time.monotonic()
+        (inbox / "neu.pdf").write_bytes(b"%PDF")
+        (tmp_path / "extern.pdf").write_bytes(b"%PDF")
+        (tmp_path / "extern.pdf").rename(inbox / "verschoben.PDF")
+        (inbox / "notiz.txt").write_text("x")
+        assert _wait_for(lambda: len(handled) == 3)
+        assert time.monotonic() - start < 1.0
+    finally:
+        stop.set()
+        thread.join(timeout=2)
+    assert sorted(p.name for p in handled) == ["neu.pdf", "verschoben.PDF", "vorher.pdf"]
+
+
+def test_watch_poll_fallback(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    handled, stop, thread = _run_watch(inbox, "poll", interval=0.05, debounce=0.01)
+    try:
+        (inbox / "a.pdf").write_bytes(b"%PDF")
+        assert _wait_for(lambda: [p.name for p in handled] == ["a.pdf"])
+    finally:
+        stop.set()
+        thread.join(timeout=2)
+    assert not thread.is_alive()
+
+
+def test_watch_rescans_in_inotify_mode_and_settles_listed_files(tmp_path, monkeypatch):
+    class SilentWatcher:
+        """Wie inotify auf einer Netzfreigabe: fremde Schreiber lösen nichts aus."""
+
+        def __init__(self, directory):
+            pass
+
+        def read(self, timeout):
+            time.sleep(timeout or 0)
+            return []
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(hotfolder, "InotifyWatcher", SilentWatcher)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    handled, stop, thread = _run_watch(inbox, "inotify", interval=0.05, debounce=0.01, settle=0.3)
+    try:
+        written = time.monotonic()
+        (inbox / "remote.pdf").write_bytes(b"%PDF")
+        assert _wait_for(lambda: [p.name for p in handled] == ["remote.pdf"])
+        assert time.monotonic() - written >= 0.3  # settle statt debounce
+    finally:
+        stop.set()
+        thread.join(timeout=2)
+
+
+def _write(path, text, stamp):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_settings_reload_on_change_and_keep_last_good(tmp_path, capsys):
+    cfg = tmp_path / "config.yaml"
+    pats = tmp_path / "patterns.yaml"
+    _write(cfg, "unknown_dir_name: rest\n", 1_000_000_000)
+    _write(pats, "invoice_number_patterns: ['Nr\\\\s*(\\\\d+)']\n", 1_000_000_000)
+
+    settings = hotfolder.Settings(str(cfg), str(pats))
+    first_cfg, first_pats = settings.current()
+    assert settings.unknown_dir_name == "rest"
+    assert settings.refresh() is False  # unverändert: nichts neu gelesen
+    assert settings.current()[1] is first_pats
+
+    _write(cfg, "unknown_dir_name: sonstiges\n", 2_000_000_000)
+    assert settings.refresh() is True
+    assert settings.unknown_dir_name == "sonstiges"
+    assert "neu geladen" in capsys.readouterr().out
+
+    _write(pats, "invoice_number_patterns: [unclosed\n", 3_000_000_000)
+    assert settings.refresh() is False
+    assert settings.error
+    assert "vorheriger Stand" in capsys.readouterr().err
+    assert settings.current()[0]["unknown_dir_name"] == "sonstiges"
+
+
+def test_process_one_uses_preloaded_settings(tmp_path, monkeypatch):
+    cfg = tmp_path / "config.yaml"
+    pats = tmp_path / "patterns.yaml"
+    cfg.write_text("dry_run: false\n", encoding="utf-8")
+    pats.write_text("{}\n", encoding="utf-8")
+    settings = hotfolder.Settings(str(cfg), str(pats))
+    calls = []
+
+    def fake_process_pdf(path, **kwargs):
+        calls.append(kwargs)
+        return {"target_path": str(tmp_path / "out" / "a.pdf")}
+
+    monkeypatch.setattr(hotfolder.sorter, "process_pdf", fake_process_pdf)
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF")
+    hotfolder.process_one(pdf, str(cfg), str(pats), tmp_path, tmp_path / "err", tmp_path / "u", settings=settings)
+
+    cfg_obj, pats_obj = settings.current()
+    assert calls[0]["config"] is cfg_obj
+    assert calls[0]["patterns"] is pats_obj
+    assert "config_path" not in calls[0]
+
+
+def test_worker_pool_dedupes_and_drains(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    out_ok = tmp_path / "processed"
+    cfg = hotfolder.sorter.load_config({"output_dir": str(out_ok), "use_ocr": False, "csv_log_path": ""})
+    snapshot = (cfg, hotfolder.sorter.compile_patterns({}))
+    pool = hotfolder.WorkerPool(
+        2, 2, cfg_path="", patterns_path="", out_ok=out_ok, out_err=tmp_path / "err"
+    )
+    pdfs = []
+    for name in ("a.pdf", "b.pdf", "c.pdf", "d.pdf"):
+        pdf = inbox / name
+        pdf.write_text("dummy")
+        pdfs.append(pdf)
+
+    try:
+        # Ablage anhalten, damit alle Dateien angenommen bleiben
+        with pool._place_lock:
+            for pdf in pdfs:
+                assert pool.submit(pdf, out_ok / "unbekannt", snapshot)
+            assert len(pool) == 4 == pool.capacity
+            assert all(pdf in pool for pdf in pdfs)
+            assert pool.submit(pdfs[0], out_ok / "unbekannt", snapshot) is False
+    finally:
+        pool.drain()
+
+    assert len(pool) == 0
+    assert not list(inbox.iterdir())
+    placed = sorted(p.name for p in out_ok.rglob("*.pdf"))
+    assert len(placed) == 4 and len(set(placed)) == 4
+
+
+def test_worker_pool_collects_results_while_placement_is_slow(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    out_ok = tmp_path / "processed"
+    cfg = hotfolder.sorter.load_config({"output_dir": str(out_ok), "use_ocr": False, "csv_log_path": ""})
+    snapshot = (cfg, hotfolder.sorter.compile_patterns({}))
+    pool = hotfolder.WorkerPool(
+        2, 2, cfg_path="", patterns_path="", out_ok=out_ok, out_err=tmp_path / "err"
+    )
+    try:
+        # Ablage hängt (langsames Netzlaufwerk): Ergebnisse kommen trotzdem an
+        with pool._place_lock:
+            for name in ("a.pdf", "b.pdf", "c.pdf"):
+                (inbox / name).write_text("dummy")
+                assert pool.submit(inbox / name, out_ok / "unbekannt", snapshot)
+            with pool._lock:
+                futures = list(pool._claimed.values())
+            _done, not_done = wait(futures, timeout=10)
+            assert not not_done
+            assert len(pool) == 3
+    finally:
+        pool.drain()
+
+    assert len(pool) == 0
+    assert not list(inbox.iterdir())
+
+
+def test_worker_pool_submit_refuses_after_stop(tmp_path):
+    pool = hotfolder.WorkerPool(
+        2, 0, cfg_path="", patterns_path="", out_ok=tmp_path, out_err=tmp_path / "err"
+    )
+    pdf = tmp_path / "a.pdf"
+    pdf.write_text("dummy")
+
+    assert pool.submit(pdf, tmp_path, ({}, {}), stop_fn=lambda: True) is False
+    assert pdf.exists() and len(pool) == 0
+    pool.drain()
+
+
+def test_worker_pool_restarts_workers_when_timing_hook_appears(tmp_path):
+    pool = hotfolder.WorkerPool(
+        2, 0, cfg_path="", patterns_path="", out_ok=tmp_path, out_err=tmp_path / "err"
+    )
+    snapshot = ({"stage_timings": False}, {})
+    hook = lambda source, timings_ms: None  # noqa: E731
+    try:
+        cold = pool._executor_for(snapshot)
+        assert pool._executor_for(snapshot) is cold
+        hotfolder.timings.add_hook(hook)
+        warm = pool._executor_for(snapshot)
+        assert warm is not cold and pool._measure is True
+    finally:
+        hotfolder.timings.remove_hook(hook)
+        pool.drain()
+
+
+def test_main_without_config_moves_files_to_error_folder(tmp_path):
+    inbox = tmp_path / "in"
+    inbox.mkdir()
+    (inbox / "a.pdf").write_text("dummy")
+    proc = subprocess.Popen(
+        [
+            sys.executable, str(ROOT / "hotfolder.py"), "--in", "in", "--done", "ok", "--err", "err",
+            "--config", "fehlt.yaml", "--watch", "poll", "--interval", "0.1", "--journal", "",
+        ],
+        cwd=tmp_path,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        deadline = time.monotonic() + 20
+        while not (tmp_path / "err" / "a.pdf").exists() and proc.poll() is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert proc.poll() is None, proc.stderr.read().decode()  # läuft weiter
+        assert (tmp_path / "err" / "a.pdf").exists()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
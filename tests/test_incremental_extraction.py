@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+PATTERNS = {
+    "invoice_number_patterns": [r"Rechnungsnummer\s*:?\s*([A-Z0-9\-]+)"],
+    "date_patterns": [r"Rechnungsdatum\s*:?\s*(\d{2}\.\d{2}\.\d{4})"],
+    "supplier_hints": {"Telekom": ["telekom"]},
+}
+
+
+def _fake_layer(pulled, page_count=80):
+    def fake_iter_text_layer(path, poppler_path):
+        for page_no in range(1, page_count + 1):
+            pulled.append(page_no)
+            if page_no == 1:
+                text = "Telekom Deutschland GmbH\nRechnungsnummer: RE-4711"
+            elif page_no == 2:
+                text = "Rechnungsdatum: 03.02.2024"
+            else:
+                text = f"Einzelverbindungsnachweis Zeile {page_no} " * 20
+            yield page_no, page_count, text, False
+
+    return fake_iter_text_layer
+
+
+def test_incremental_extraction_stops_after_all_fields(tmp_path, monkeypatch):
+    pdf = tmp_path / "bill.pdf"
+    pdf.write_bytes(b"%PDF-1.4 dummy")
+    pulled = []
+    monkeypatch.setattr(sorter, "_iter_text_layer", _fake_layer(pulled))
+
+    def reopen(path, poppler_path):
+        raise AssertionError("Seitenzahl kommt aus dem bereits geöffneten Dokument")
+
+    monkeypatch.setattr(sorter, "_pdf_page_count", reopen)
+
+    result = sorter.analyze_pdf(
+        pdf,
+        config={"incremental_extraction": True, "use_ocr": False},
+        patterns=PATTERNS,
+    )
+
+    assert result["invoice_no"] == "RE-4711"
+    assert result["invoice_date"] == "2024-02-03"
+    assert result["supplier"] == "Telekom"
+    assert result["early_exit"] is True
+    assert result["pages_read"] == 2
+    assert result["page_count"] == 80
+    assert len(pulled) <= 3
+
+
+def test_incremental_extraction_respects_page_budget(tmp_path, monkeypatch):
+    pdf = tmp_path / "contract.pdf"
+    pdf.write_bytes(b"%PDF-1.4 dummy")
+    pulled = []
+    monkeypatch.setattr(sorter, "_iter_text_layer", _fake_layer(pulled))
+    monkeypatch.setattr(sorter, "_pdf_page_count", lambda path, poppler_path: 80)
+
+    result = sorter.analyze_pdf(
+        pdf,
+        config={"incremental_extraction": True, "use_ocr": False, "extraction_max_pages": 1},
+        patterns={**PATTERNS, "date_patterns": []},
+    )
+
+    assert result["pages_read"] == 1
+    assert result["invoice_date"] is None
+    assert result["validation_status"] == "needs_review"
+
+
+def test_incremental_extraction_reports_parallel_ocr_timings(tmp_path, monkeypatch):
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4 dummy")
+
+    def scanned_layer(path, poppler_path):
+        for page_no in (1, 2, 3):
+            yield page_no, 3, "", True
+
+    class FakeImage:
+        def close(self):
+            pass
+
+    class FakeEngine:
+        name = "fake"
+
+        def read(self, image, lang, *, psm=None, with_confidence=False):
+            return "Rechnungsnummer: RE-4711\nRechnungsdatum: 03.02.2024", 95.0
+
+    monkeypatch.setattr(sorter, "_iter_text_layer", scanned_layer)
+    monkeypatch.setattr(sorter, "_pdf_page_count", lambda path, poppler_path: 3)
+    monkeypatch.setattr(sorter, "_prepare_ocr", lambda tesseract_cmd, workers: True)
+    monkeypatch.setattr(sorter, "_render_page", lambda *args: [FakeImage()])
+    monkeypatch.setattr(sorter, "_looks_blank", lambda image: False)
+    monkeypatch.setattr(sorter.ocr_engine, "current", lambda: FakeEngine())
+
+    result = sorter.analyze_pdf(
+        pdf,
+        config={"incremental_extraction": True, "ocr_workers": 2, "stage_timings": True},
+        patterns=PATTERNS,
+    )
+
+    assert result["invoice_no"] == "RE-4711"
+    assert result["timings_ms"].get("ocr", 0) > 0
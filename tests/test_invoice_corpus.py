@@ -0,0 +1,62 @@
+import json
+import re
+import sys
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import invoice_corpus
+import run_suite
+import sorter
+
+
+def _objects(data: bytes):
+    startxref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    count = int(re.match(rb"xref\n0 (\d+)\n", data[startxref:]).group(1))
+    entries = data[startxref:].split(b"\n")[3 : 2 + count]
+    objects = {}
+    for number, entry in enumerate(entries, start=1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(b"%d 0 obj\n" % number)
+        end = data.index(b"\nendobj\n", offset)
+        objects[number] = data[offset:end]
+    return objects
+
+
+def test_generated_pdfs_are_well_formed_and_carry_manifest_fields(tmp_path):
+    specs = invoice_corpus.generate(tmp_path, 6, pages=(1, 2), image_ratio=0.5, seed=3)
+    pats = sorter.compile_patterns(ROOT / "patterns" / "patterns.yaml")
+
+    assert {spec.image_only for spec in specs} == {True, False}
+    assert invoice_corpus.load_manifest(tmp_path) == specs
+    for spec in specs:
+        objects = _objects((tmp_path / spec.filename).read_bytes())
+        assert sum(b"/Type /Page " in body for body in objects.values()) == spec.pages
+        if spec.image_only:
+            image = next(body for body in objects.values() if b"/Subtype /Image" in body)
+            width, height = map(int, re.search(rb"/Width (\d+) /Height (\d+)", image).groups())
+            raw = image.split(b"stream\n", 1)[1].rsplit(b"\nendstream", 1)[0]
+            assert len(zlib.decompress(raw)) == width * height
+            continue
+        strings = b"".join(
+            m.group(1) + b"\n" for body in objects.values() for m in re.finditer(rb"\(((?:\\.|[^\\)])*)\) '", body)
+        )
+        fields = pats.fields.extract(strings.decode("cp1252"))
+        assert fields["invoice_no"].value == spec.invoice_no
+        assert fields["invoice_date"].value == spec.invoice_date
+        assert fields["total_gross"].value == spec.total_gross
+        assert fields["tax_amount"].value == spec.tax_amount
+
+
+def test_run_suite_writes_json_report(tmp_path, capsys):
+    out = tmp_path / "report.json"
+
+    assert run_suite.main(["--count", "3", "--repeat", "1", "--stages", "fields", "pymupdf", "--out", str(out)]) == 0
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["stages"]["fields"]["unit"] == "ms" and report["stages"]["fields"]["n"] > 0
+    assert "median" in report["stages"]["pymupdf"] or "skipped" in report["stages"]["pymupdf"]
+    assert run_suite.compare(report, report)[1].startswith("fields")
@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import hotfolder
+import journal as journal_mod
+import sorter
+
+
+def test_journal_reconcile_after_restart(tmp_path):
+    db = tmp_path / "journal.sqlite"
+    present = tmp_path / "noch_da.pdf"
+    present.write_text("dummy")
+    jr = journal_mod.Journal(db)
+    jr.claim("h-claimed-gone", tmp_path / "weg1.pdf")
+    jr.claim("h-analyzed-gone", tmp_path / "weg2.pdf")
+    jr.analyzed("h-analyzed-gone", tmp_path / "weg2.pdf", {"supplier": "IKEA"})
+    jr.claim("h-resume", present)
+    jr.analyzed("h-resume", present, {"supplier": "IKEA", "field_offsets": {"invoice_no": [1, 5]}})
+    jr.claim("h-done", tmp_path / "fertig.pdf")
+    jr.moved("h-done", tmp_path / "fertig.pdf", tmp_path / "out" / "fertig.pdf")
+    jr.close()
+
+    jr = journal_mod.Journal(db)  # "Neustart"
+    stats = jr.reconcile()
+
+    assert stats == {"resume": 1, "reanalyze": 0, "moved": 1, "failed": 1}
+    assert jr.latest("h-claimed-gone").state == journal_mod.FAILED
+    assert jr.latest("h-analyzed-gone").state == journal_mod.MOVED
+    resume = jr.latest("h-resume")
+    assert resume.state == journal_mod.ANALYZED
+    assert resume.analysis["field_offsets"] == {"invoice_no": [1, 5]}
+    assert [entry.content_hash for entry in jr.open_entries()] == ["h-resume"]
+    jr.close()
+
+
+def test_process_journaled_resumes_without_reanalysis(tmp_path, monkeypatch):
+    pdf = tmp_path / "inbox" / "a.pdf"
+    pdf.parent.mkdir()
+    pdf.write_text("dummy")
+    out_ok = tmp_path / "processed"
+    cfg = sorter.load_config({"output_dir": str(out_ok), "csv_log_path": ""})
+    snapshot = (cfg, sorter.compile_patterns({}))
+    jr = journal_mod.Journal(tmp_path / "journal.sqlite")
+    content_hash = sorter.compute_content_hash(pdf)
+    jr.claim(content_hash, pdf)
+    jr.analyzed(
+        content_hash,
+        pdf,
+        {"source": str(pdf), "invoice_no": "R-1", "invoice_date": "2024-03-01", "supplier": "IKEA",
+         "validation_status": "ok"},
+    )
+
+    def no_analysis(*args, **kwargs):
+        raise AssertionError("Analyse darf nicht erneut laufen")
+
+    monkeypatch.setattr(sorter, "analyze_pdf", no_analysis)
+    outcome = hotfolder.process_journaled(
+        pdf, jr, snapshot, cfg_path="", patterns_path="",
+        out_ok=out_ok, out_err=tmp_path / "err", out_unknown=out_ok / "unbekannt",
+    )
+
+    assert outcome[0] == "moved"
+    assert not pdf.exists()
+    assert Path(outcome[1]).parent.name == "IKEA"
+    entry = jr.latest(content_hash)
+    assert entry.state == journal_mod.MOVED and entry.target == outcome[1]
+    jr.close()
+
+
+def test_process_journaled_records_failure(tmp_path, monkeypatch):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_text("dummy")
+    jr = journal_mod.Journal(tmp_path / "journal.sqlite")
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("kaputt")
+
+    monkeypatch.setattr(sorter, "analyze_pdf", broken)
+    outcome = hotfolder.process_journaled(
+        pdf, jr, (sorter.load_config({}), sorter.compile_patterns({})), cfg_path="", patterns_path="",
+        out_ok=tmp_path / "ok", out_err=tmp_path / "err", out_unknown=tmp_path / "ok" / "u",
+    )
+
+    assert outcome == ("failed", "kaputt")
+    assert (tmp_path / "err" / "a.pdf").exists()
+    entry = jr.latest(sorter.compute_content_hash(tmp_path / "err" / "a.pdf"))
+    assert entry.state == journal_mod.FAILED and entry.error == "kaputt"
+    jr.close()
@@ -0,0 +1,69 @@
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import hotfolder
+import metrics
+
+
+def test_render_counts_status_stages_latency_and_backlog(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "wartet.pdf").write_text("x")
+    (inbox / "notiz.txt").write_text("x")
+    pdf = inbox / "a.pdf"
+    pdf.write_text("x")
+    clock = [1000.0]
+    m = metrics.Metrics(inbox=inbox, in_flight=lambda: 3, clock=lambda: clock[0])
+
+    m.arrived(pdf)
+    clock[0] += 2.0
+    m.observe_stages(str(pdf), {"ocr": 1500.0, "fields": 2.0})
+    m.done(pdf, "ok", "ocr")
+    m.done(inbox / "b.pdf", "fail")
+    text = m.render()
+
+    assert 'hotfolder_documents_total{status="ok"} 1' in text
+    assert 'hotfolder_documents_total{status="fail"} 1' in text
+    assert 'hotfolder_documents_total{status="needs_review"} 0' in text
+    assert 'hotfolder_documents_by_method_total{method="ocr"} 1' in text
+    assert 'hotfolder_stage_duration_seconds_bucket{stage="ocr",le="1"} 0' in text
+    assert 'hotfolder_stage_duration_seconds_bucket{stage="ocr",le="2.5"} 1' in text
+    assert 'hotfolder_stage_duration_seconds_count{stage="fields"} 1' in text
+    assert "hotfolder_document_latency_seconds_count 1" in text
+    assert "hotfolder_inbox_backlog 2" in text
+    assert "hotfolder_in_flight 3" in text
+    assert "hotfolder_last_success_timestamp_seconds 1002" in text
+
+
+def test_http_endpoint_serves_metrics_and_404(tmp_path):
+    m = metrics.Metrics(inbox=tmp_path)
+    server = metrics.serve(m, "127.0.0.1", 0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(base + "/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert b"# TYPE hotfolder_documents_total counter" in resp.read()
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(base + "/other", timeout=5)
+        assert err.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_hotfolder_failures_are_counted(tmp_path, monkeypatch):
+    m = metrics.Metrics()
+    monkeypatch.setattr(hotfolder, "_METRICS", m)
+    pdf = tmp_path / "kaputt.pdf"
+    pdf.write_text("x")
+
+    assert hotfolder._move_failed(pdf, tmp_path / "err", RuntimeError("defekt"))[0] == "failed"
+    assert 'hotfolder_documents_total{status="fail"} 1' in m.render()
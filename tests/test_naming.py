@@ -0,0 +1,100 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+
+def _reserve(directory):
+    return sorter._unique_path(Path(directory), "2025-01-01_unbekannt_.pdf", reserve=True).name
+
+
+def test_reserve_lists_directory_once(tmp_path, monkeypatch):
+    target = tmp_path / "Lieferant"
+    target.mkdir()
+    for idx in range(50):
+        (target / f"2025-01-01_unbekannt__{idx}.pdf").write_text("x")
+    (target / "2025-01-01_unbekannt_.pdf").write_text("x")
+    listings = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(sorter.os, "listdir", lambda p: listings.append(p) or real_listdir(p))
+
+    names = [_reserve(target) for _ in range(20)]
+
+    assert len(listings) == 1
+    assert names[0] == "2025-01-01_unbekannt__50.pdf"
+    assert len(set(names)) == 20
+    assert all((target / (name + ".sorter-reserved")).exists() for name in names)
+
+
+def test_reserve_skips_names_taken_behind_its_back(tmp_path):
+    index = sorter._directory_index(tmp_path)
+    index._dir_mtime = lambda: index._mtime  # Änderung von außen "unsichtbar"
+    (tmp_path / "a.pdf").write_text("fremd")
+
+    assert index.reserve("a.pdf").name == "a_1.pdf"
+    assert (tmp_path / "a.pdf").read_text() == "fremd"
+
+
+def test_reserve_is_unique_across_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        names = list(pool.map(_reserve, [str(tmp_path)] * 40))
+
+    assert len(set(names)) == 40
+    assert len(list(tmp_path.iterdir())) == 40
+
+
+def test_process_pdf_dry_run_does_not_reserve(tmp_path):
+    pdf = tmp_path / "in.pdf"
+    pdf.write_text("dummy")
+    analysis = {"supplier": "IKEA", "invoice_date": "2024-01-02", "invoice_no": "R1"}
+    cfg = {"output_dir": str(tmp_path / "out"), "csv_log_path": ""}
+
+    first = sorter.process_pdf(pdf, config=cfg, analysis=analysis, simulate=True)
+    second = sorter.process_pdf(pdf, config=cfg, analysis=analysis, simulate=True)
+    assert first["target_path"] == second["target_path"]
+    assert not (tmp_path / "out" / "IKEA").exists()
+
+    moved = sorter.process_pdf(pdf, config=cfg, analysis=analysis, simulate=False)
+    assert moved["target_path"] == first["target_path"]
+    assert Path(moved["target_path"]).read_text() == "dummy"
+    assert not pdf.exists()
+
+
+def test_placing_files_lists_target_directory_once(tmp_path, monkeypatch):
+    inbox = tmp_path / "in"
+    inbox.mkdir()
+    target = tmp_path / "Lieferant"
+    listings = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(sorter.os, "listdir", lambda p: listings.append(p) or real_listdir(p))
+
+    for idx in range(20):
+        source = inbox / f"scan{idx}.pdf"
+        source.write_text(f"pdf {idx}")
+        sorter._place(source, target, "2025-01-01_ACME_R1.pdf", simulate=False)
+
+    assert len(listings) == 1
+    assert len(list(target.iterdir())) == 20
+
+
+def test_stale_placeholders_are_removed_when_the_folder_is_listed(tmp_path):
+    stale = tmp_path / "2025-01-01_ACME_R1.pdf.sorter-reserved"
+    stale.touch()
+    os.utime(stale, (0, 0))
+    fresh = tmp_path / "2025-01-01_ACME_R2.pdf.sorter-reserved"
+    fresh.touch()  # anderer Prozess reserviert gerade
+    empty = tmp_path / "leer.pdf"
+    empty.touch()
+    os.utime(empty, (0, 0))
+
+    index = sorter._DirectoryIndex(tmp_path)
+
+    assert not stale.exists() and fresh.exists() and empty.exists()
+    assert index.peek("2025-01-01_ACME_R1.pdf").name == "2025-01-01_ACME_R1.pdf"
+    assert index.peek("2025-01-01_ACME_R2.pdf").name == "2025-01-01_ACME_R2_1.pdf"
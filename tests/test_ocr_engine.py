@@ -0,0 +1,116 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import ocr_engine
+
+
+class FakeApi:
+    def __init__(self, lang):
+        self.lang = lang
+        self.calls = []
+        self.ended = False
+
+    def SetPageSegMode(self, psm):
+        self.calls.append(("psm", psm))
+
+    def SetImage(self, image):
+        self.calls.append(("image", image))
+
+    def GetUTF8Text(self):
+        return f"{self.lang}:{self.calls[-1][1]}"
+
+    def MeanTextConf(self):
+        return 87
+
+    def End(self):
+        self.ended = True
+
+
+def test_tesserocr_engine_reuses_loaded_api_per_language():
+    created = []
+
+    def factory(lang):
+        api = FakeApi(lang)
+        created.append(api)
+        return api
+
+    engine = ocr_engine.TesserocrEngine(api_factory=factory)
+
+    assert engine.read("seite1", "deu") == ("deu:seite1", None)
+    assert engine.read("kopf", "deu", psm=6, with_confidence=True) == ("deu:kopf", 87.0)
+    assert engine.read("page", "eng") == ("eng:page", None)
+
+    assert [api.lang for api in created] == ["deu", "eng"]
+    assert created[0].calls[::2] == [("psm", 3), ("psm", 6)]
+
+    engine.close()
+    assert all(api.ended for api in created)
+
+
+def test_tesserocr_engine_gives_each_thread_its_own_api():
+    barrier = threading.Barrier(3)
+    in_use = set()
+    clash = []
+
+    class SlowApi(FakeApi):
+        def SetImage(self, image):
+            if id(self) in in_use:
+                clash.append(image)
+            in_use.add(id(self))
+            if image != "danach":
+                barrier.wait(timeout=5)
+            in_use.discard(id(self))
+            super().SetImage(image)
+
+    engine = ocr_engine.TesserocrEngine(api_factory=SlowApi)
+    threads = [threading.Thread(target=engine.read, args=(f"s{i}", "deu")) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert clash == []
+    assert engine.created == 3
+    engine.read("danach", "deu")
+    assert engine.created == 3
+
+
+def test_get_engine_falls_back_to_pytesseract(monkeypatch):
+    monkeypatch.setattr(ocr_engine, "_ENGINES", {})
+    monkeypatch.setattr(ocr_engine, "tesserocr_available", lambda: False)
+
+    assert ocr_engine.get_engine("tesserocr").name == "pytesseract"
+    assert ocr_engine.use({"ocr_backend": "auto"}).name == "pytesseract"
+
+    monkeypatch.setattr(ocr_engine, "tesserocr_available", lambda: True)
+    engine = ocr_engine.use({"ocr_backend": "tesserocr", "tessdata_path": "/opt/tessdata"})
+    assert (engine.name, engine.tessdata) == ("tesserocr", "/opt/tessdata")
+    assert ocr_engine.get_engine("tesserocr", "/opt/tessdata") is engine
+    assert ocr_engine.use({"ocr_backend": "auto"}).name == "tesserocr"
+    assert ocr_engine.use({"ocr_backend": "pytesseract"}).name == "pytesseract"
+    assert ocr_engine.current().name == "pytesseract"
+
+
+def test_auto_engine_switches_to_pytesseract_when_tesserocr_cannot_start(capsys):
+    class FakeFallback:
+        name = "pytesseract"
+
+        def read(self, image, lang, *, psm=None, with_confidence=False):
+            return f"pytesseract:{image}", 75.0 if with_confidence else None
+
+    def broken(lang):
+        raise RuntimeError("Failed to init API, possibly an invalid tessdata path")
+
+    preferred = ocr_engine.TesserocrEngine(api_factory=broken)
+    engine = ocr_engine._AutoEngine(preferred, FakeFallback())
+
+    assert engine.read("s1", "deu") == ("pytesseract:s1", None)
+    assert engine.read("s2", "deu", with_confidence=True) == ("pytesseract:s2", 75.0)
+    assert engine.name == "pytesseract"
+    assert preferred.created == 0
+    assert capsys.readouterr().err.count("tesserocr startet nicht") == 1
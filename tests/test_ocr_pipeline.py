@@ -0,0 +1,186 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import ocr_engine
+import sorter
+
+
+def test_iter_ocr_pages_keeps_order_and_bounds_concurrency(monkeypatch):
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def fake_ocr_page(pdf_path, page_no, poppler_path, lang, *dpi_settings):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        # spätere Seiten werden schneller fertig als frühere
+        time.sleep(0.01 * (6 - page_no))
+        with lock:
+            active -= 1
+        if page_no == 3:
+            raise RuntimeError("render failed")
+        return f"Seite {page_no}"
+
+    monkeypatch.setattr(sorter, "_ocr_page", fake_ocr_page)
+
+    pages = list(sorter._iter_ocr_pages(Path("x.pdf"), [1, 2, 3, 4, 5], None, "deu", workers=2))
+
+    assert pages == [(1, "Seite 1"), (2, "Seite 2"), (3, None), (4, "Seite 4"), (5, "Seite 5")]
+    assert peak <= 2
+
+
+def test_resolve_ocr_workers_splits_cores_between_jobs(monkeypatch):
+    monkeypatch.setattr(sorter.os, "cpu_count", lambda: 16)
+    assert sorter._resolve_ocr_workers({"ocr_workers": 3}) == 3
+    assert sorter._resolve_ocr_workers({"ocr_workers": 0, "jobs": 4}) == 4
+    assert sorter._resolve_ocr_workers({"jobs": 32}) == 1
+
+
+def test_select_pages_policies():
+    assert sorter._select_pages(5, 3) == [1, 2, 3]
+    assert sorter._select_pages("first:2,last:1", 10) == [1, 2, 10]
+    assert sorter._select_pages("2-4,9", 6) == [2, 3, 4]
+    assert sorter._select_pages("5-", 7) == [5, 6, 7]
+    assert sorter._select_pages("all", 4) == [1, 2, 3, 4]
+
+
+def test_select_pages_rejects_garbage():
+    import pytest
+
+    with pytest.raises(ValueError):
+        sorter._select_pages("erste:2", 4)
+
+
+def test_extract_text_ocrs_only_pages_without_text_layer(tmp_path, monkeypatch):
+    pdf = tmp_path / "mixed.pdf"
+    pdf.write_bytes(b"%PDF-1.4 dummy")
+    cover = "Deckblatt mit ausreichend digitalem Text " * 3
+
+    def fake_pymupdf(path):
+        pages = [cover, "", "", ""]
+        return sorter.ExtractionResult(
+            text="\n".join(pages),
+            method="text",
+            page_count=4,
+            pages=pages,
+            page_has_images=[False, True, False, True],
+        )
+
+    requested = []
+
+    def fake_iter(path, pages, poppler_path, lang, workers, *dpi_settings):
+        requested.extend(pages)
+        for page_no in pages:
+            yield page_no, f"Rechnung Seite {page_no}"
+
+    monkeypatch.setattr(sorter, "_extract_with_pymupdf", fake_pymupdf)
+    monkeypatch.setattr(sorter, "_prepare_ocr", lambda cmd, workers: True)
+    monkeypatch.setattr(sorter, "_iter_ocr_pages", fake_iter)
+
+    text, method, page_count = sorter.extract_text_result(pdf, ocr_pages="all")
+
+    # Seite 3 hat weder Text noch Bilder und wird übersprungen
+    assert requested == [2, 4]
+    assert method == "text+ocr"
+    assert page_count == 4
+    assert text.split("\n") == [cover, "Rechnung Seite 2", "", "Rechnung Seite 4"]
+
+
+def test_ocr_page_escalates_only_low_confidence_pages(monkeypatch):
+    calls = []
+
+    class FakeImage:
+        def __init__(self, dpi):
+            self.dpi = dpi
+
+        def close(self):
+            pass
+
+    def fake_read(image, lang, with_confidence):
+        calls.append((image.dpi, with_confidence))
+        if not with_confidence:
+            return f"fein {image.dpi}", None
+        return f"grob {image.dpi}", 91.0 if image.page == 1 else 40.0
+
+    def fake_render(pdf_path, page_no, poppler_path, dpi):
+        image = FakeImage(dpi)
+        image.page = page_no
+        return [image]
+
+    monkeypatch.setattr(sorter, "_render_page", fake_render)
+    monkeypatch.setattr(sorter, "_read_image", fake_read)
+    monkeypatch.setattr(sorter, "_looks_blank", lambda image: False)
+
+    clean = sorter._ocr_page(Path("x.pdf"), 1, None, "deu", (150, 200, 300), 80)
+    blurry = sorter._ocr_page(Path("x.pdf"), 2, None, "deu", (150, 200, 300), 80)
+
+    assert (clean, clean.dpi, clean.confidence) == ("grob 150", 150, 91.0)
+    assert (blurry, blurry.dpi) == ("fein 300", 300)
+    assert calls == [(150, True), (150, True), (200, True), (300, False)]
+
+
+def test_ocr_data_text_rebuilds_lines_and_weights_confidence():
+    data = {
+        "text": ["", "Rechnung", "Nr.", "4711", "", "Summe"],
+        "conf": ["-1", "90", "60", "96.5", "-1", "80"],
+        "block_num": [1, 1, 1, 1, 2, 2],
+        "par_num": [1, 1, 1, 1, 1, 1],
+        "line_num": [1, 1, 1, 2, 1, 1],
+    }
+
+    text, confidence = ocr_engine.data_to_text(data)
+
+    assert text == "Rechnung Nr.\n4711\n\nSumme"
+    assert round(confidence, 2) == round((90 * 8 + 60 * 3 + 96.5 * 4 + 80 * 5) / 20, 2)
+    assert ocr_engine.data_to_text({"text": []}) == ("", 0.0)
+
+
+def test_resolve_ocr_dpi_and_cache_key():
+    assert sorter._resolve_ocr_dpi({}) == ((200, 300), 70.0)
+    assert sorter._resolve_ocr_dpi({"ocr_dpi": "300, 150", "ocr_min_confidence": 85}) == ((150, 300), 85.0)
+    assert sorter._resolve_ocr_dpi({"ocr_dpi": 300}) == ((300,), 70.0)
+    single = sorter._cache_settings(sorter.extraction_options({"tesseract_lang": "deu", "ocr_dpi": 300}))
+    assert single["dpi"] == 300 and "min_confidence" not in single
+    ladder = sorter._cache_settings(sorter.extraction_options({"tesseract_lang": "deu"}))
+    assert ladder["dpi"] == [200, 300] and ladder["min_confidence"] == 70.0
+
+
+def test_cache_key_separates_ocr_backends():
+    options = sorter.extraction_options({"tesseract_lang": "deu", "ocr_dpi": 300})
+    pytesseract = sorter._cache_settings(options, ocr_backend="pytesseract")
+    tesserocr = sorter._cache_settings(options, ocr_backend="tesserocr")
+
+    assert "ocr_backend" not in pytesseract  # bisherige Einträge bleiben gültig
+    assert tesserocr["ocr_backend"] == "tesserocr"
+    no_ocr = sorter.extraction_options({"use_ocr": False})
+    assert "ocr_backend" not in sorter._cache_settings(no_ocr, ocr_backend="tesserocr")
+
+
+def test_cache_key_follows_the_effective_config_on_every_path(tmp_path, monkeypatch):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_text("dummy")
+    cfg = sorter.load_config({"ocr_pages": "all", "ocr_dpi": [150, 400], "text_cache_path": str(tmp_path / "c.db")})
+    keys = []
+    monkeypatch.setattr(sorter, "_cache_lookup", lambda cache, path, h, settings: keys.append(settings) or (None, None))
+    monkeypatch.setattr(sorter, "_extract_text", lambda path, **kwargs: sorter.ExtractionResult("", "text", 0))
+    def no_pages(path, **kwargs):
+        yield from ()
+
+    monkeypatch.setattr(sorter, "_iter_page_texts", no_pages)
+
+    # Analyse und GUI-Vorschau übergeben extraction_options(cfg)
+    sorter.extract_text_result(pdf, cache=sorter.get_text_cache(cfg), **sorter.extraction_options(cfg))
+    sorter._extract_incremental(pdf, cfg, sorter.compile_patterns({}))
+
+    full, incremental = keys
+    assert full["ocr_pages"] == "all" and full["dpi"] == [150, 400] and full["min_text_length"] == 50
+    assert incremental.pop("mode") == "incremental"
+    assert {k: v for k, v in full.items() if k != "min_text_length"} == incremental
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+HEADER = (0.0, 0.0, 1.0, 0.15)
+ADDRESS = (0.0, 0.15, 1.0, 0.4)
+AMAZON_BOX = (0.5, 0.4, 1.0, 0.5)
+
+
+class FakeImage:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _setup(monkeypatch, tmp_path, zone_texts, supplier_zones=None):
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4 dummy")
+    read = []
+    image = FakeImage()
+
+    def fake_read_zone(img, box, lang, psm):
+        read.append((box, psm))
+        return zone_texts.get(box, "")
+
+    monkeypatch.setattr(sorter, "_iter_text_layer", lambda path, poppler: (page for page in [(1, 3, "", True)]))
+    monkeypatch.setattr(sorter, "_prepare_ocr", lambda cmd, workers: True)
+    monkeypatch.setattr(sorter, "_render_page", lambda path, page_no, poppler, dpi: [image])
+    monkeypatch.setattr(sorter, "_looks_blank", lambda img: False)
+    monkeypatch.setattr(sorter, "_read_zone", fake_read_zone)
+    monkeypatch.setattr(
+        sorter, "extract_text_result", lambda *args, **kwargs: ("ganzseitige OCR", "ocr", 3)
+    )
+    data = sorter.load_patterns(ROOT / "patterns" / "patterns.yaml")
+    data["supplier_ocr_zones"] = supplier_zones or {}
+    cfg = {"ocr_zone_first": True, "ocr_zone_psm": 4}
+    return pdf, cfg, sorter.compile_patterns(data), read, image
+
+
+def test_header_zones_suffice_and_skip_full_page_ocr(tmp_path, monkeypatch):
+    pdf, cfg, pats, read, image = _setup(
+        monkeypatch,
+        tmp_path,
+        {HEADER: "Amazon EU S.a r.l.", ADDRESS: "Rechnungsnummer: AMZ-123456\nRechnungsdatum: 01.02.2024"},
+    )
+
+    result = sorter.analyze_pdf(pdf, config=cfg, patterns=pats)
+
+    assert result["text_method"] == "ocr-zones"
+    assert (result["invoice_no"], result["invoice_date"], result["supplier"]) == ("AMZ-123456", "2024-02-01", "Amazon")
+    assert (result["pages_read"], result["page_count"], result["early_exit"]) == (1, 3, True)
+    assert read == [(HEADER, 4), (ADDRESS, 4)]
+    assert image.closed
+
+
+def test_supplier_zones_are_read_before_falling_back(tmp_path, monkeypatch):
+    pdf, cfg, pats, read, _image = _setup(
+        monkeypatch,
+        tmp_path,
+        {HEADER: "Amazon EU", AMAZON_BOX: "Rechnungsnummer: AMZ-654321\nRechnungsdatum: 03.04.2024"},
+        supplier_zones={"Amazon": {"rechnungsblock": {"box": list(AMAZON_BOX), "psm": 6}}},
+    )
+
+    result = sorter.analyze_pdf(pdf, config=cfg, patterns=pats)
+
+    assert result["text_method"] == "ocr-zones" and result["invoice_no"] == "AMZ-654321"
+    assert read[-1] == (AMAZON_BOX, 6)
+
+    # ohne Treffer in den Zonen: normale ganzseitige Extraktion
+    pdf, cfg, pats, read, _image = _setup(monkeypatch, tmp_path, {HEADER: "Amazon EU"})
+    assert sorter.analyze_pdf(pdf, config=cfg, patterns=pats)["text_method"] == "ocr"
+
+
+def test_supplier_files_provide_zone_overrides(tmp_path, capsys):
+    suppliers = tmp_path / "suppliers"
+    suppliers.mkdir()
+    (tmp_path / "patterns.yaml").write_text("supplier_hints:\n  Deutsche Bahn: [deutsche bahn]\n", encoding="utf-8")
+    (suppliers / "Deutsche_Bahn.yaml").write_text(
+        "ocr_zones:\n  kopf: [0, 0, 0.5, 0.2]\n", encoding="utf-8"
+    )
+    (suppliers / "Amazon.yaml").write_text(
+        "ocr_zones:\n  block: {box: [0.5, 0.1, 1, 0.3], psm: 11}\n"
+        "whitelist:\n  invoice_numbers:\n    Amazon: ['^AMZ-']\n",
+        encoding="utf-8",
+    )
+    (suppliers / "Telekom.yaml").write_text("invoice_number_patterns: []\n", encoding="utf-8")
+    # nur auskommentiertes Beispiel: wird nicht geparst (YAML hier sogar ungültig)
+    (suppliers / "ACME.yaml").write_text(
+        'total_gross_patterns:\n  - "\\bBrutto\\s"\n# ocr_zones:\n#   kopf: [0, 0, 1, 0.2]\n', encoding="utf-8"
+    )
+
+    pats = sorter.compile_patterns(tmp_path / "patterns.yaml")
+
+    assert set(pats.supplier_zones) == {"deutsche bahn", "amazon"}
+    assert capsys.readouterr().err == ""
+    assert sorter._parse_zones(pats.supplier_zones["amazon"], 6) == [("block", (0.5, 0.1, 1.0, 0.3), 11)]
+    assert sorter._parse_zones({"kaputt": [0.5, 0.5, 0.2, 1], "x": "abc"}, 6) == []
+
+
+def test_root_patterns_file_loads_supplier_files_from_patterns_folder(monkeypatch):
+    seen = []
+    monkeypatch.setattr(sorter, "_load_supplier_zones", lambda directory: seen.append(directory) or {})
+
+    # so rufen Startskripte, Dockerfile und GUI den Sorter auf
+    sorter.load_patterns(ROOT / "patterns.yaml")
+    sorter.load_patterns(ROOT / "patterns" / "patterns.yaml")
+
+    assert seen == [ROOT / "patterns" / "suppliers"] * 2
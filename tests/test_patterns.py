@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+
+def test_compile_patterns_reports_invalid_patterns_once(capsys):
+    compiled = sorter.compile_patterns(
+        {
+            "invoice_number_patterns": [r"Rechnung\s*(\d+)", r"(kaputt"],
+            "date_patterns": [r"(\d{2}\.\d{2}\.\d{4})"],
+        }
+    )
+
+    assert len(compiled.invoice_number) == 1
+    assert len(compiled.errors) == 1
+    assert "kaputt" in capsys.readouterr().err
+    # bereits kompilierte Muster werden durchgereicht, ohne erneute Meldung
+    assert sorter.compile_patterns(compiled) is compiled
+    assert capsys.readouterr().err == ""
+
+
+def test_compiled_patterns_behave_like_mapping():
+    compiled = sorter.compile_patterns({"supplier_hints": {"IKEA": ["ikea"]}})
+
+    assert compiled.get("invoice_number_patterns") == []
+    assert compiled["supplier_hints"] == {"IKEA": ["ikea"]}
+    assert dict(sorter.load_patterns(compiled))["supplier_hints"] == {"IKEA": ["ikea"]}
+
+
+def test_extractors_accept_compiled_regexes():
+    compiled = sorter.compile_patterns(
+        {
+            "invoice_number_patterns": [r"Rechnungsnr\.?\s*:?\s*([A-Z0-9\-]+)"],
+            "date_patterns": [r"(\d{2}\.\d{2}\.\d{4})"],
+        }
+    )
+    text = "Rechnungsnr.: re-2024-1\nDatum 05.06.2024"
+
+    assert sorter.extract_invoice_no(text, compiled.invoice_number) == "RE-2024-1"
+    assert sorter.extract_date(text, compiled.date) == "2024-06-05"
+
+
+def _random_hints(rng, suppliers, keywords_per_supplier):
+    alphabet = "abcdeo2 -."
+    hints = {}
+    for idx in range(suppliers):
+        hints[f"Lieferant {idx}"] = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 6)))
+            for _ in range(keywords_per_supplier)
+        ]
+    return hints
+
+
+def test_supplier_automaton_matches_legacy_scoring(monkeypatch):
+    import random
+
+    rng = random.Random(7)
+    monkeypatch.setattr(sorter.SupplierMatcher, "automaton_threshold", 1)
+    for _ in range(30):
+        hints = _random_hints(rng, suppliers=12, keywords_per_supplier=3)
+        text = "".join(rng.choice("ABCDEO2 -.abcdeo\n") for _ in range(300))
+        matcher = sorter.SupplierMatcher(hints)
+        assert matcher._use_automaton
+        assert sorter.detect_supplier(text, matcher) == sorter.detect_supplier(text, hints)
+
+
+def test_supplier_word_boundary_option(monkeypatch):
+    hints = {"O2": ["o2"], "E.ON": ["e.on"]}
+    text = "CO2-Abgabe laut E.ON Rechnung"
+
+    for threshold in (1, 64):
+        monkeypatch.setattr(sorter.SupplierMatcher, "automaton_threshold", threshold)
+        loose = sorter.SupplierMatcher(hints)
+        strict = sorter.SupplierMatcher(hints, word_boundary=True)
+        assert loose.scores(text) == {"O2": 1, "E.ON": 1}
+        assert strict.scores(text) == {"E.ON": 1}
+        assert strict.detect("Ihr o2 Vertrag") == "O2"
+
+
+def test_compiled_patterns_use_word_boundary_setting():
+    compiled = sorter.compile_patterns(
+        {"supplier_hints": {"O2": ["o2"]}, "supplier_word_boundary": True}
+    )
+
+    assert sorter.detect_supplier("CO2 Ausgleich", compiled.supplier_matcher) is None
+    assert sorter.detect_supplier("O2 Germany", compiled.supplier_matcher) == "O2"
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 from types import SimpleNamespace
@@ -65,3 +66,127 @@ def test_process_all_processes_pdf_and_PDF(tmp_path, monkeypatch):
     assert [call.path for call in progress_calls] == ["doc1.pdf", "doc2.PDF"]
     assert stop_calls == len(processed_files)
     assert "ignore.txt" not in processed_files
+
+
+def test_process_all_parallel_keeps_input_order_and_naming(tmp_path):
+    input_dir = tmp_path / "inbox"
+    output_dir = tmp_path / "processed"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (input_dir / name).write_text("dummy")
+
+    progress_calls = []
+
+    def progress_fn(idx, total, path, result):
+        progress_calls.append((idx, Path(path).name, Path(result.destination).name))
+
+    sorter.process_all(
+        config={
+            "input_dir": str(input_dir),
+            "output_dir": str(output_dir),
+            "use_ocr": False,
+            "csv_log_path": "",
+        },
+        patterns={},
+        progress_fn=progress_fn,
+        jobs=2,
+    )
+
+    assert [call[:2] for call in progress_calls] == [(1, "a.pdf"), (2, "b.pdf"), (3, "c.pdf")]
+    names = [call[2] for call in progress_calls]
+    stem = names[0][: -len(".pdf")]
+    assert names == [f"{stem}.pdf", f"{stem}_1.pdf", f"{stem}_2.pdf"]
+    assert not list(input_dir.iterdir())
+
+
+def test_process_all_parallel_stop_leaves_files(tmp_path):
+    input_dir = tmp_path / "inbox"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf"):
+        (input_dir / name).write_text("dummy")
+
+    progress_calls = []
+    sorter.process_all(
+        config={
+            "input_dir": str(input_dir),
+            "output_dir": str(tmp_path / "processed"),
+            "use_ocr": False,
+            "csv_log_path": "",
+        },
+        patterns={},
+        stop_fn=lambda: True,
+        progress_fn=lambda *args: progress_calls.append(args),
+        jobs=2,
+    )
+
+    assert progress_calls == []
+    assert sorted(p.name for p in input_dir.iterdir()) == ["a.pdf", "b.pdf"]
+
+
+def test_process_all_parallel_survives_crashed_worker(tmp_path, monkeypatch):
+    input_dir = tmp_path / "inbox"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf", "d.pdf", "e.pdf"):
+        (input_dir / name).write_text(name)
+
+    real_analyze = sorter.analyze_pdf
+
+    def crashing_analyze(pdf_path, **kwargs):
+        if Path(pdf_path).name == "b.pdf":
+            os._exit(1)  # wie ein Segfault in einer PDF-Bibliothek
+        return real_analyze(pdf_path, **kwargs)
+
+    # Worker entstehen per fork und erben den Patch
+    monkeypatch.setattr(sorter, "analyze_pdf", crashing_analyze)
+
+    progress_calls = []
+    sorter.process_all(
+        config={
+            "input_dir": str(input_dir),
+            "output_dir": str(tmp_path / "processed"),
+            "use_ocr": False,
+            "csv_log_path": "",
+        },
+        patterns={},
+        progress_fn=lambda idx, total, path, result: progress_calls.append((Path(path).name, result.status)),
+        jobs=2,
+    )
+
+    assert [name for name, _status in progress_calls] == ["a.pdf", "b.pdf", "c.pdf", "d.pdf", "e.pdf"]
+    assert dict(progress_calls)["b.pdf"] == "fail"
+    assert all(status != "fail" for name, status in progress_calls if name != "b.pdf")
+    assert not list(input_dir.iterdir())
+
+
+def test_process_all_parallel_leaves_hashing_to_the_workers(tmp_path, monkeypatch):
+    input_dir = tmp_path / "inbox"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf"):
+        (input_dir / name).write_text(name)
+
+    coordinator = os.getpid()
+    hashed_here = []
+    real_hash = sorter.compute_content_hash
+
+    def counting_hash(path):
+        if os.getpid() == coordinator:
+            hashed_here.append(Path(path).name)
+        return real_hash(path)
+
+    monkeypatch.setattr(sorter, "compute_content_hash", counting_hash)
+
+    sorter.process_all(
+        config={
+            "input_dir": str(input_dir),
+            "output_dir": str(tmp_path / "processed"),
+            "use_ocr": False,
+            "csv_log_path": "",
+            "result_db_path": str(tmp_path / "results.sqlite"),
+            "duplicate_action": "move",
+        },
+        patterns={},
+        jobs=2,
+    )
+
+    assert hashed_here == []
+    assert not list(input_dir.iterdir())
@@ -0,0 +1,54 @@
+import json
+import pstats
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import profiling
+import sorter
+
+
+def test_sample_rate_picks_every_nth_document(tmp_path):
+    profiler = profiling.DocumentProfiler(tmp_path, sample_rate=0.25, memory=False)
+    picked = []
+    for idx in range(8):
+        with profiler.document(tmp_path / f"{idx}.pdf") as sampled:
+            picked.append(sampled)
+
+    assert picked == [True, False, False, False, True, False, False, False]
+    assert len(list(tmp_path.glob("*.prof"))) == 2
+    assert not list(tmp_path.glob("*.mem.txt"))
+
+
+def test_process_all_writes_profiles_and_aggregated_report(tmp_path, monkeypatch, capsys):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    for name in ("a", "b", "c"):
+        (inbox / f"{name}.pdf").write_text("dummy")
+    monkeypatch.setattr(
+        sorter,
+        "extract_text_result",
+        lambda *args, **kwargs: ("Rechnungsnummer: 4711\nRechnungsdatum: 01.02.2024", "text", 1),
+    )
+    profile_dir = tmp_path / "profile"
+    sorter.process_all(
+        config={
+            "input_dir": str(inbox),
+            "output_dir": str(tmp_path / "out"),
+            "profile_dir": str(profile_dir),
+            "profile_top": 5,
+        },
+        patterns=sorter.compile_patterns(ROOT / "patterns" / "patterns.yaml"),
+    )
+
+    entries = [json.loads(line) for line in (profile_dir / profiling.INDEX_NAME).read_text().splitlines()]
+    assert [Path(e["source"]).name for e in entries] == ["a.pdf", "b.pdf", "c.pdf"]
+    assert all(e["peak_kib"] > 0 and (profile_dir / e["memory"]).exists() for e in entries)
+    functions = {func[2] for func in pstats.Stats(str(profile_dir / entries[0]["profile"])).stats}
+    assert "_analyze_pdf" in functions
+    report = next(profile_dir.glob("report_*.txt")).read_text(encoding="utf-8")
+    assert "3 Dokumente" in report and "nach Eigenzeit" in report and "b.pdf" in report
+    assert "Profilbericht" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+import csv
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import results
+import sorter
+
+
+def test_store_find_by_invoice_hash_and_date(tmp_path):
+    store = results.ResultStore(tmp_path / "results.sqlite")
+    store.record({"source": "a.pdf", "supplier": "CT-Bauprofi", "invoice_no": "2024/123456",
+                  "invoice_date": "2024-03-01", "validation_status": "ok", "content_hash": "h1"})
+    store.record({"source": "b.pdf", "supplier": "Telekom", "invoice_no": "7",
+                  "invoice_date": "2023-12-31", "status": "needs_review", "content_hash": "h2",
+                  "simulate": True})
+
+    hit = store.find(supplier="ct-bauprofi", invoice_no="2024/123456")
+    assert [row["source"] for row in hit] == ["a.pdf"]
+    assert store.find(content_hash="h2")[0]["status"] == "needs_review"
+    assert [row["source"] for row in store.find(date_from="2024-01-01")] == ["a.pdf"]
+    assert store.find(content_hash="h2", include_simulated=False) == []
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM results WHERE supplier = ? COLLATE NOCASE"
+        " AND invoice_no = ? COLLATE NOCASE", ("x", "y")
+    ).fetchall()
+    assert "idx_results_invoice" in str([tuple(row) for row in plan])
+    store.close()
+
+
+def test_store_imports_mixed_csv_layouts_and_exports(tmp_path):
+    legacy = tmp_path / "processed.csv"
+    legacy.write_text(
+        "timestamp,source_file,target_file,invoice_no,supplier,date,method\n"
+        "2025-09-19T10:22:42,a.pdf,x.pdf,R-1,Conz,2018-10-20,dry\n"
+        "2025-09-23T11:41:11;in\\b.pdf;out\\b.pdf;;unbekannt;;ok\n"
+        "timestamp;source;destination;invoice_no;supplier;invoice_date;status;total_gross;total_net;tax_amount\n"
+        "2025-10-01T08:00:00;c.pdf;out\\c.pdf;42;Telekom;2025-09-30;ok;10.00;;1.60\n",
+        encoding="utf-8",
+    )
+    store = results.ResultStore(tmp_path / "results.sqlite")
+
+    assert store.import_csv(legacy) == 3
+    first = store.find(invoice_no="R-1")[0]
+    assert (first["destination"], first["invoice_date"], first["status"], first["simulate"]) == (
+        "x.pdf", "2018-10-20", None, 1
+    )
+    assert store.find(status="ok", limit=1)[0]["total_gross"] == "10.00"
+
+    out = tmp_path / "export.csv"
+    assert store.export_csv(out) == 3
+    with out.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle, delimiter=";"))
+    assert list(rows[0]) == results.COLUMNS
+    assert [row["source"] for row in rows] == ["a.pdf", "in\\b.pdf", "c.pdf"]
+
+
+def test_process_all_records_results(tmp_path, monkeypatch):
+    input_dir = tmp_path / "inbox"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_text("dummy")
+    monkeypatch.setattr(
+        sorter,
+        "extract_text_result",
+        lambda *args, **kwargs: ("Rechnungsnummer: 4711\nDatum: 03.02.2024", "text", 1),
+    )
+    db = tmp_path / "results.sqlite"
+
+    sorter.process_all(
+        config={"input_dir": str(input_dir), "output_dir": str(tmp_path / "out"), "result_db_path": str(db)},
+        patterns=sorter.compile_patterns(ROOT / "patterns" / "patterns.yaml"),
+    )
+
+    store = sorter.get_result_store({"result_db_path": str(db)})
+    row = store.find(invoice_no="4711")[0]
+    assert row["content_hash"] == sorter.compute_content_hash(row["destination"])
+    assert row["invoice_date"] == "2024-02-03" and row["simulate"] == 0
+    assert results.main([str(db), "--invoice-no", "4711"]) == 0
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+
+# Sekunden für "import run_sorter, hotfolder" in einem frischen Interpreter
+IMPORT_BUDGET_S = float(os.environ.get("IMPORT_BUDGET_S", "0.5"))
+
+# erst bei der ersten Verwendung laden
+LAZY_MODULES = (
+    "fitz",
+    "PyPDF2",
+    "pdf2image",
+    "pytesseract",
+    "PIL",
+    "cProfile",
+    "calendar",
+    "http.server",
+    "concurrent.futures.process",
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import run_sorter, hotfolder
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def _probe():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True, timeout=60
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_entry_points_import_within_budget_without_heavy_modules():
+    runs = [_probe() for _ in range(3)]
+
+    assert runs[0]["loaded"] == []
+    best = min(run["elapsed"] for run in runs)
+    assert best < IMPORT_BUDGET_S, f"Import dauert {best:.3f}s (Budget {IMPORT_BUDGET_S}s)"
+
+
+def test_warm_up_reports_missing_libraries_instead_of_failing():
+    report = sorter.warm_up({"use_ocr": True})
+
+    assert set(report["modules"]) == set(sorter._HEAVY_MODULES)
+    for name, ms in report["modules"].items():
+        assert ms is None or ms >= 0
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+from text_cache import TextCache, make_key
+
+
+def test_text_cache_roundtrip_and_lru_eviction(tmp_path):
+    cache = TextCache(tmp_path / "cache.sqlite", max_bytes=25)
+    cache.put("a", "x" * 10, "text", 1)
+    cache.put("b", "y" * 10, "ocr", 2)
+    assert cache.get("a") == ("x" * 10, "text", 1)  # a ist jetzt zuletzt genutzt
+    cache.put("c", "z" * 10, "text", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") == ("z" * 10, "text", 3)
+    assert cache.total_bytes() <= 25
+    cache.close()
+
+
+def test_make_key_depends_on_settings():
+    assert make_key("abc", {"lang": "deu"}) != make_key("abc", {"lang": "deu+eng"})
+    assert make_key("abc", {"dpi": 300, "lang": "deu"}) == make_key("abc", {"lang": "deu", "dpi": 300})
+
+
+def test_extract_text_from_pdf_uses_cache(tmp_path, monkeypatch):
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF-1.4 dummy")
+    calls = []
+
+    def fake_pymupdf(path):
+        calls.append(path)
+        return sorter.ExtractionResult(text="Rechnung " * 20, method="text", page_count=2)
+
+    monkeypatch.setattr(sorter, "_extract_with_pymupdf", fake_pymupdf)
+    cache = TextCache(tmp_path / "cache.sqlite")
+
+    first = sorter.extract_text_result(pdf, use_ocr=False, cache=cache)
+    second = sorter.extract_text_result(pdf, use_ocr=False, cache=cache)
+
+    assert first == second == ("Rechnung " * 20, "text", 2)
+    assert len(calls) == 1
+    cache.close()
@@ -0,0 +1,76 @@
+import contextvars
+import csv
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sorter
+import timings
+
+
+def test_stage_is_noop_without_collector_and_sums_across_threads():
+    assert timings.stage("ocr") is timings.stage("render")  # geteilter No-op
+
+    def page():
+        with timings.stage("ocr"):
+            time.sleep(0.01)
+
+    with timings.collect() as collected:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            for future in [pool.submit(contextvars.copy_context().run, page) for _ in range(3)]:
+                future.result()
+        with timings.stage("fields"):
+            pass
+
+    assert collected.counts == {"ocr": 3, "fields": 1}
+    assert collected.as_dict()["ocr"] >= 30
+    with timings.collect(False) as disabled:
+        assert disabled is None
+
+
+def _run(tmp_path, monkeypatch, **cfg):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "a.pdf").write_text("dummy")
+    monkeypatch.setattr(
+        sorter, "extract_text_result", lambda *args, **kwargs: ("Rechnungsnummer: 4711", "text", 1)
+    )
+    payloads = []
+    csv_path = tmp_path / "log.csv"
+    sorter.process_all(
+        config={"input_dir": str(inbox), "output_dir": str(tmp_path / "out"), "csv_log_path": str(csv_path), **cfg},
+        patterns=sorter.compile_patterns(ROOT / "patterns" / "patterns.yaml"),
+        progress_fn=lambda idx, total, path, data: payloads.append(data),
+    )
+    with csv_path.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle, delimiter=";"))
+    return payloads[0], rows[0]
+
+
+def test_process_all_reports_stage_timings_and_calls_hooks(tmp_path, monkeypatch):
+    seen = []
+    hook = lambda source, values: seen.append((Path(source).name, dict(values)))
+    timings.add_hook(hook)
+    try:
+        payload, row = _run(tmp_path, monkeypatch)
+    finally:
+        timings.remove_hook(hook)
+
+    assert {"hash", "fields", "move"} <= set(payload.timings_ms)
+    assert seen == [("a.pdf", payload.timings_ms)]
+    assert float(row["time_move_ms"]) >= 0 and row["time_ocr_ms"] == ""
+    assert [col for col in sorter.CSV_COLUMNS if col.startswith("time_")] == [
+        f"time_{name}_ms" for name in timings.STAGES
+    ]
+
+
+def test_stage_timings_off_by_default(tmp_path, monkeypatch):
+    payload, row = _run(tmp_path, monkeypatch)
+
+    assert not hasattr(payload, "timings_ms")
+    assert row["time_fields_ms"] == ""
@@ -0,0 +1,114 @@
+"""Persistenter Cache für extrahierten PDF-Text.
+
+Einträge werden über den Inhalts-Hash der PDF plus die Extraktions-
+Einstellungen (OCR-Sprache, DPI, Seitenauswahl …) adressiert, damit eine
+Datei nur einmal per OCR gelesen wird – egal ob in Vorschau, Dry-Run oder
+nach geänderten Mustern. Die Datenbank wird über ``max_bytes`` begrenzt;
+bei Überschreitung fliegen die am längsten nicht genutzten Einträge.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Mapping, Optional, Tuple, Union
+
+PathLike = Union[str, os.PathLike]
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    method TEXT NOT NULL,
+    page_count INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+"""
+
+
+def make_key(content_hash: str, settings: Mapping[str, object]) -> str:
+    """Bildet den Cache-Schlüssel aus Inhalts-Hash und Einstellungen."""
+
+    blob = json.dumps(dict(settings), sort_keys=True, default=str)
+    digest = hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+    return f"{content_hash}:{digest}"
+
+
+class TextCache:
+    """SQLite-Cache (WAL) für ``(text, method, page_count)`` je Schlüssel."""
+
+    def __init__(self, path: PathLike, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = Path(path).expanduser()
+        self.max_bytes = max(0, int(max_bytes))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, str, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, method, page_count FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return str(row[0]), str(row[1]), int(row[2])
+
+    def put(self, key: str, text: str, method: str, page_count: int) -> None:
+        size = len(text.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, text, method, page_count, size, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text, method, int(page_count), size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["DEFAULT_MAX_BYTES", "TextCache", "make_key"]
@@ -0,0 +1,134 @@
+"""Zeitmessung je Verarbeitungsstufe.
+
+``analyze_pdf``/``process_pdf`` öffnen mit :func:`collect` einen Sammler,
+Code in den Stufen misst sich mit ``with stage("ocr"):``. Ohne aktiven
+Sammler ist :func:`stage` ein geteilter No-op-Kontext (ein
+``ContextVar``-Zugriff). Die Summen je Stufe in Millisekunden landen als
+``timings_ms`` im Ergebnis; mit :func:`add_hook` registrierte Funktionen
+erhalten sie je Dokument, um sie an eigene Metriken weiterzureichen.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+
+# Messpunkte in Verarbeitungsreihenfolge
+STAGES = ("hash", "open", "text_layer", "pypdf2", "render", "ocr", "fields", "move")
+
+TimingHook = Callable[[str, Mapping[str, float]], None]
+
+_CURRENT: ContextVar[Optional["StageTimings"]] = ContextVar("stage_timings", default=None)
+_HOOKS: List[TimingHook] = []
+
+
+class StageTimings:
+    """Summiert Dauer (ms) und Anzahl je Stufe; threadsicher für OCR-Seiten."""
+
+    def __init__(self) -> None:
+        self.ms: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.ms[name] = self.ms.get(name, 0.0) + seconds * 1000
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: round(value, 3) for name, value in self.ms.items()}
+
+
+class _Stage:
+    __slots__ = ("_timings", "_name", "_start")
+
+    def __init__(self, timings: StageTimings, name: str) -> None:
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._timings.add(self._name, time.perf_counter() - self._start)
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str):
+    """Kontext, der die Dauer unter ``name`` im aktiven Sammler verbucht."""
+
+    timings = _CURRENT.get()
+    if timings is None:
+        return _NO_STAGE
+    return _Stage(timings, name)
+
+
+@contextmanager
+def collect(enabled: bool = True) -> Iterator[Optional[StageTimings]]:
+    """Aktiviert einen Sammler für den umschlossenen Block (``None``, wenn aus)."""
+
+    if not enabled:
+        yield None
+        return
+    timings = StageTimings()
+    token = _CURRENT.set(timings)
+    try:
+        yield timings
+    finally:
+        _CURRENT.reset(token)
+
+
+def enabled(cfg: Mapping[str, object]) -> bool:
+    """Messung aktiv per ``stage_timings`` oder weil ein Hook registriert ist."""
+
+    return bool(cfg.get("stage_timings")) or bool(_HOOKS)
+
+
+def add_hook(hook: TimingHook) -> None:
+    """Registriert ``hook(quelle, timings_ms)``; wird je Dokument im Hauptprozess gerufen."""
+
+    if hook not in _HOOKS:
+        _HOOKS.append(hook)
+
+
+def remove_hook(hook: TimingHook) -> None:
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+def emit(source: str, timings_ms: Mapping[str, float]) -> None:
+    for hook in list(_HOOKS):
+        try:
+            hook(source, timings_ms)
+        except Exception as exc:
+            print(f"[Timings] Hook-Fehler: {exc}", file=sys.stderr)
+
+
+__all__ = [
+    "STAGES",
+    "StageTimings",
+    "TimingHook",
+    "add_hook",
+    "collect",
+    "emit",
+    "enabled",
+    "remove_hook",
+    "stage",
+]